@@ -0,0 +1,54 @@
+"""
+Memory and throughput of the graph backends of `GraphBuilder`: 'networkx' and 'compact'.
+
+The memory is the size of the graph: the objects, allocated by the traversal and
+referenced by the graph.
+
+Run as ``python benchmarks/bench_backend.py`` from the repository root.
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_tree
+from pinspect.traverse import GraphBuilder, BACKENDS
+
+
+def measure(root, backend):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    builder = GraphBuilder(root, key='', max_depth=10 ** 4, backend=backend)
+    builder.traverse(root)
+    duration = time.perf_counter() - start
+    graph = builder.graph
+    # keep only the graph
+    del builder
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, memory, graph
+
+
+def main():
+    print("The graph memory in bytes per node and the traversal throughput in nodes per second.")
+    print(f"{'depth':>5} {'width':>5} {'links':>5} {'nodes':>7} {'edges':>7} "
+          + ' '.join(f"{backend + ' B/node':>16} {backend + ' nodes/s':>16}" for backend in BACKENDS))
+    for depth, width, links in [(6, 4, 0), (4, 10, 2), (2000, 1, 0)]:
+        root = make_tree(depth=depth, width=width, links=links)
+        columns = []
+        for backend in BACKENDS:
+            duration, memory, graph = measure(root, backend=backend)
+            n_nodes = graph.number_of_nodes()
+            n_edges = graph.number_of_edges()
+            columns.append(f"{memory / n_nodes:>16.0f} {n_nodes / duration:>16.0f}")
+        print(f"{depth:>5} {width:>5} {links:>5} {n_nodes:>7} {n_edges:>7} " + ' '.join(columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Graph-build time versus node count for synthetic deep and wide object trees.
+
+Compares the incremental cycle detection of `DiGraphAcyclic` against
+the previous implementation, which called `nx.has_path` per edge.
+
+Run as ``python benchmarks/bench_graph_build.py`` from the repository root.
+"""
+
+import os
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_tree
+from pinspect.traverse import DiGraphAcyclic, GraphBuilder
+
+
+class DiGraphHasPath(DiGraphAcyclic):
+    """
+    The reference implementation: a full `nx.has_path` check per edge.
+    """
+
+    def add_edge(self, u, v_obj, label=None, **attr):
+        v_of_edge = self.add_node(v_obj, level=self.nodes[u]['level'] + 1)
+        if nx.has_path(self, v_of_edge, u):
+            return False
+        nx.DiGraph.add_edge(self, u, v_of_edge, label=label, **attr)
+        return True
+
+
+class DiGraphRecorder(DiGraphAcyclic):
+    """
+    Records the sequence of `add_edge()` calls to replay it later.
+    """
+
+    def __init__(self, incoming_graph_data=None, **attr):
+        super().__init__(incoming_graph_data, **attr)
+        self.calls = []
+
+    def add_edge(self, u, v_obj, label=None, **attr):
+        self.calls.append((u, v_obj, label))
+        return super().add_edge(u, v_obj, label=label, **attr)
+
+
+def traverse(root, graph_class):
+    builder = GraphBuilder(root, key='', max_depth=sys.maxsize)
+    builder.graph = graph_class()
+    builder.graph.add_node(root, level=0)
+    start = time.perf_counter()
+    builder.traverse(root)
+    return time.perf_counter() - start, builder.graph
+
+
+def replay(root, calls, graph_class):
+    graph = graph_class()
+    graph.add_node(root, level=0)
+    start = time.perf_counter()
+    for u, v_obj, label in calls:
+        graph.add_edge(u, v_obj, label=label)
+    return time.perf_counter() - start, graph
+
+
+SHAPES = {
+    # name: list of (depth, width)
+    'deep': [(depth, 2) for depth in (6, 7, 8, 9, 10)],
+    'chain': [(depth, 1) for depth in (250, 500, 1000, 2000)],
+    'wide': [(2, width) for width in (10, 20, 30, 45)],
+}
+
+
+def main(links=2):
+    print("Graph-build time (the sequence of `add_edge()` calls of a traversal) and "
+          "the total traversal time, seconds.")
+    print(f"{'shape':>6} {'nodes':>6} {'edges':>6} {'incremental':>12} {'has_path':>12} "
+          f"{'traverse':>12} {'traverse_ref':>12}")
+    for shape, params in SHAPES.items():
+        for depth, width in params:
+            root = make_tree(depth=depth, width=width, links=links)
+            duration_traverse, graph = traverse(root, DiGraphRecorder)
+            duration_traverse_ref, _ = traverse(root, DiGraphHasPath)
+            duration, graph_replayed = replay(root, graph.calls, DiGraphAcyclic)
+            duration_ref, graph_ref = replay(root, graph.calls, DiGraphHasPath)
+            assert set(graph_replayed.edges) == set(graph_ref.edges) == set(graph.edges)
+            print(f"{shape:>6} {graph.number_of_nodes():>6} {graph.number_of_edges():>6} "
+                  f"{duration:>12.4f} {duration_ref:>12.4f} "
+                  f"{duration_traverse:>12.3f} {duration_traverse_ref:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start cost: the time to import `pinspect` and to construct a `GraphBuilder`.
+
+Each import is measured in a fresh interpreter, started in a temporary directory,
+which is also checked for the files created at import.
+
+Run as ``python benchmarks/bench_import.py`` from the repository root.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pinspect.traverse import GraphBuilder
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import(module, repeats):
+    durations = []
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT.format(module=module)], cwd=cwd, env=env,
+                                    check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    universal_newlines=True).stdout
+            durations.append(float(output))
+        created = os.listdir(cwd)
+    return statistics.median(durations), created
+
+
+def measure_construction(repeats):
+    class Inspected:
+        pass
+
+    obj = Inspected()
+    start = time.perf_counter()
+    GraphBuilder(obj, key='')
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        GraphBuilder(obj, key='')
+    return first, (time.perf_counter() - start) / repeats
+
+
+def main(repeats=10):
+    print("The median import time in a fresh interpreter, s.")
+    for module in ('networkx', 'pinspect'):
+        duration, created = measure_import(module, repeats=repeats)
+        print(f"{module:>10} {duration:.3f}  (files created in the CWD: {created})")
+    try:
+        import numpy  # noqa: F401 the numpy ignore set is used only if numpy is imported
+    except ImportError:
+        pass
+    first, other = measure_construction(repeats=100)
+    print(f"GraphBuilder construction, ms: the first {first * 1e3:.3f}, the next ones {other * 1e3:.3f}")
+
+
+if __name__ == '__main__':
+    main()
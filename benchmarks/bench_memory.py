@@ -0,0 +1,80 @@
+"""
+Peak memory of the traversal with and without `memory_bounded`.
+
+The synthetic objects produce new heavy objects (with a 1 Mb payload) on each
+method call, much like lazy loaders that read data from disk.
+
+Run as ``python benchmarks/bench_memory.py`` from the repository root.
+"""
+
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SYNTHETIC_MODULE
+from pinspect.traverse import GraphBuilder, STRATEGIES
+
+PAYLOAD_SIZE = 2 ** 20
+
+
+def make_loaders(depth, width):
+    """
+    Parameters
+    ----------
+    depth : int
+        The depth of the tree of method calls.
+    width : int
+        The number of methods of each class.
+
+    Returns
+    -------
+    root : object
+        An instance of the root class; each method returns a new instance of
+        a distinct class with a `PAYLOAD_SIZE` payload.
+    """
+    counter = itertools.count()
+
+    def make_class(level):
+        methods = {'__module__': SYNTHETIC_MODULE}
+        if level < depth:
+            for method_id in range(width):
+                child_class = make_class(level + 1)
+                methods[f"load{method_id}"] = lambda self, cls=child_class: cls()
+        methods['__init__'] = lambda self: setattr(self, 'payload', bytearray(PAYLOAD_SIZE))
+        return type(f"Loader{next(counter)}", (), methods)
+
+    return make_class(0)()
+
+
+def measure(root, strategy, memory_bounded):
+    tracemalloc.start()
+    start = time.perf_counter()
+    builder = GraphBuilder(root, key='', strategy=strategy, max_depth=100, memory_bounded=memory_bounded)
+    builder.traverse(root)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak, len(builder.graph)
+
+
+def main():
+    print("Peak memory (Mb) and the traversal time (s) of the synthetic loaders.")
+    print(f"{'strategy':>8} {'depth':>5} {'width':>5} {'nodes':>6} {'peak':>8} {'peak_bounded':>12} "
+          f"{'time':>8} {'time_bounded':>12}")
+    for depth, width in [(4, 3), (6, 2), (30, 1)]:
+        root = make_loaders(depth=depth, width=width)
+        for strategy in STRATEGIES:
+            duration, peak, n_nodes = measure(root, strategy=strategy, memory_bounded=False)
+            duration_bounded, peak_bounded, n_nodes_bounded = measure(root, strategy=strategy,
+                                                                      memory_bounded=True)
+            assert n_nodes == n_nodes_bounded
+            print(f"{strategy:>8} {depth:>5} {width:>5} {n_nodes:>6} {peak / 2 ** 20:>8.1f} "
+                  f"{peak_bounded / 2 ** 20:>12.1f} {duration:>8.3f} {duration_bounded:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+The benchmark suite of the `find()` pipeline on synthetic object graphs.
+
+Each scenario is run through the `find()` phases: 'traverse', 'strip',
+'to_string' and 'to_pyvis'. For each phase, the suite measures the wall time,
+the peak memory, allocated during the phase, and the node and edge counts of
+the resulting graph. The wall time is measured in a separate run without
+`tracemalloc`, which slows the allocations down.
+
+Run as ``python benchmarks/bench_suite.py`` from the repository root.
+Save the results with ``--output results.json`` and compare them with the
+results of another commit with ``--compare baseline.json``.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_tree, make_wide, make_shared, make_cyclic, make_slow, make_containers
+from pinspect.traverse import GraphBuilder, BACKENDS
+from pinspect.utils import to_string, to_pyvis
+
+try:
+    # imported beforehand not to measure the slow import
+    import pyvis.network
+except ImportError:
+    pyvis = None
+
+PHASES = ('traverse', 'strip', 'to_string', 'to_pyvis')
+
+# name: (generator, parameters, key)
+SCENARIOS = {
+    'wide': (make_wide, dict(width=2000), r'attr\d*0$'),
+    'deep': (make_tree, dict(depth=2000, width=1), r'child'),
+    'tree': (make_tree, dict(depth=6, width=4), r'child0'),
+    'shared': (make_shared, dict(depth=8, width=50), r'child0'),
+    'cyclic': (make_cyclic, dict(depth=5, width=4), r'child0'),
+    'slow': (make_slow, dict(n_classes=20, n_methods=5), r'Result'),
+    'containers': (make_containers, dict(size=2 * 10 ** 4), r'key'),
+}
+
+
+def run_phases(root, key, backend, trace_memory):
+    """
+    Runs the `find()` phases on the `root`.
+
+    Returns
+    -------
+    dict
+        The measurements of each phase.
+    """
+    stats = {}
+    state = {}
+
+    def traverse():
+        builder = GraphBuilder(root, key=key, max_depth=sys.maxsize, backend=backend)
+        builder.traverse(root)
+        state['builder'] = builder
+        return builder.graph
+
+    def strip():
+        state['graph'] = state['builder'].strip(with_methods=True)
+        return state['graph']
+
+    def to_string_phase():
+        source = state['builder'].graph.node_id(root)
+        if source not in state['graph']:
+            state['paths'] = 0
+            return None
+        state['paths'] = sum(1 for _ in to_string(state['graph'], source=source, prefix='root',
+                                                   dedup_suffixes=True))
+        return None
+
+    def to_pyvis_phase():
+        if pyvis is not None:
+            to_pyvis(state['graph'])
+        return None
+
+    for phase, func in zip(PHASES, (traverse, strip, to_string_phase, to_pyvis_phase)):
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        graph = func()
+        duration = time.perf_counter() - start
+        record = dict(time=duration)
+        if trace_memory:
+            record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if graph is not None:
+            record['nodes'] = graph.number_of_nodes()
+            record['edges'] = graph.number_of_edges()
+        if phase == 'to_string':
+            record['paths'] = state['paths']
+        stats[phase] = record
+    return stats
+
+
+def run_scenario(name, backend='networkx'):
+    generator, params, key = SCENARIOS[name]
+    root = generator(**params)
+    stats = run_phases(root, key=key, backend=backend, trace_memory=False)
+    memory_stats = run_phases(root, key=key, backend=backend, trace_memory=True)
+    for phase, record in stats.items():
+        record['peak_memory'] = memory_stats[phase]['peak_memory']
+    return dict(params=params, key=key, backend=backend, phases=stats)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    header = f"{'scenario':>10} {'phase':>9} {'time, s':>9} {'peak, MB':>9} {'nodes':>7} {'edges':>7} {'paths':>7}"
+    if baseline is not None:
+        header += f" {'time ratio':>10} {'memory ratio':>12}"
+    print(header)
+    for name, result in results.items():
+        for phase, record in result['phases'].items():
+            line = f"{name:>10} {phase:>9} {record['time']:>9.3f} {record['peak_memory'] / 2 ** 20:>9.2f} " \
+                   f"{record.get('nodes', ''):>7} {record.get('edges', ''):>7} {record.get('paths', ''):>7}"
+            if baseline is not None:
+                base = baseline.get(name, {}).get('phases', {}).get(phase)
+                if base is not None:
+                    time_ratio = record['time'] / max(base['time'], 1e-9)
+                    memory_ratio = record['peak_memory'] / max(base['peak_memory'], 1)
+                    line += f" {time_ratio:>10.2f} {memory_ratio:>12.2f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', help=f"the scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--backend', choices=BACKENDS, default='networkx')
+    parser.add_argument('--output', help="save the results in this JSON file")
+    parser.add_argument('--compare', help="a JSON file with the baseline results")
+    args = parser.parse_args()
+    scenarios = args.scenarios or list(SCENARIOS)
+    unknown = set(scenarios).difference(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    results = {name: run_scenario(name, backend=args.backend) for name in scenarios}
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline=baseline)
+    if args.output:
+        report = dict(commit=git_commit(), python=platform.python_version(), time=time.strftime('%Y-%m-%d %H:%M:%S'),
+                      results=results)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
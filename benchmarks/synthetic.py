@@ -0,0 +1,202 @@
+"""
+Generators of synthetic object graphs for the benchmarks.
+
+Each generated object is an instance of its own class so that `GraphBuilder`,
+which expands every class once, inspects all of them.
+"""
+
+import itertools
+import random
+import time
+
+SYNTHETIC_MODULE = 'synthetic'
+
+
+def make_tree(depth, width, links=0, seed=0, module=SYNTHETIC_MODULE):
+    """
+    Parameters
+    ----------
+    depth : int
+        The depth of the tree.
+    width : int
+        The number of children of each inner object.
+    links : int, optional
+        The number of extra references from each object to random objects,
+        created earlier. Such references make a DAG out of a tree or close cycles.
+        Default is 0.
+    seed : int, optional
+        Random seed for `links`.
+    module : str, optional
+        The module name of the generated classes.
+
+    Returns
+    -------
+    root : object
+        The root of the tree.
+    """
+    rng = random.Random(seed)
+    counter = itertools.count()
+    created = []
+
+    def make():
+        obj = type(f"Node{next(counter)}", (), {'__module__': module})()
+        created.append(obj)
+        return obj
+
+    root = make()
+    # objects are created in the depth-first order
+    stack = [(root, 0, iter(range(width)))]
+    while len(stack) > 0:
+        obj, level, child_ids = stack[-1]
+        child_id = next(child_ids, None) if level < depth else None
+        if child_id is None:
+            for link_id in range(links):
+                setattr(obj, f"link{link_id}", rng.choice(created))
+            stack.pop()
+            continue
+        child = make()
+        setattr(obj, f"child{child_id}", child)
+        stack.append((child, level + 1, iter(range(width))))
+    return root
+
+
+def count_objects(depth, width):
+    """
+    Returns
+    -------
+    int
+        The number of objects in a tree, generated by `make_tree()`.
+    """
+    if width == 1:
+        return depth + 1
+    return (width ** (depth + 1) - 1) // (width - 1)
+
+
+def _new_class(counter, prefix='Node', module=SYNTHETIC_MODULE, **members):
+    return type(f"{prefix}{next(counter)}", (), dict(members, __module__=module))
+
+
+def make_wide(width, module=SYNTHETIC_MODULE):
+    """
+    Parameters
+    ----------
+    width : int
+        The number of attributes of the root object.
+
+    Returns
+    -------
+    root : object
+        An object with `width` attributes, each of its own class.
+    """
+    counter = itertools.count()
+    root = _new_class(counter, module=module)()
+    for attr_id in range(width):
+        setattr(root, f"attr{attr_id}", _new_class(counter, module=module)())
+    return root
+
+
+def make_shared(depth, width, fan_out=3, seed=0, module=SYNTHETIC_MODULE):
+    """
+    Parameters
+    ----------
+    depth : int
+        The number of layers.
+    width : int
+        The number of objects in each layer.
+    fan_out : int, optional
+        The number of references from each object to random objects of the next
+        layer, so that most objects are shared by several parents.
+    seed : int, optional
+        Random seed.
+
+    Returns
+    -------
+    root : object
+        The root, which refers to all objects of the first layer.
+    """
+    rng = random.Random(seed)
+    counter = itertools.count()
+    root = _new_class(counter, module=module)()
+    layer = [root]
+    for _ in range(depth):
+        next_layer = [_new_class(counter, module=module)() for _ in range(width)]
+        for obj in layer:
+            children = next_layer if obj is root else rng.sample(next_layer, k=min(fan_out, width))
+            for child_id, child in enumerate(children):
+                setattr(obj, f"child{child_id}", child)
+        layer = next_layer
+    return root
+
+
+def make_cyclic(depth, width, module=SYNTHETIC_MODULE):
+    """
+    Returns
+    -------
+    root : object
+        A `make_tree()` tree, each object of which refers back to its parent
+        and to the root.
+    """
+    root = make_tree(depth=depth, width=width, module=module)
+    stack = [root]
+    while len(stack) > 0:
+        obj = stack.pop()
+        for name, child in list(vars(obj).items()):
+            if name.startswith('child'):
+                child.parent = obj
+                child.root = root
+                stack.append(child)
+    return root
+
+
+def make_slow(n_classes, n_methods, delay=1e-3, module=SYNTHETIC_MODULE):
+    """
+    Parameters
+    ----------
+    n_classes : int
+        The number of classes in a chain of method calls.
+    n_methods : int
+        The number of methods of each class.
+    delay : float, optional
+        The time, spent by each method call, in seconds.
+
+    Returns
+    -------
+    root : object
+        An object, the methods of which sleep for `delay` seconds and return an
+        instance of the next class.
+    """
+    counter = itertools.count()
+
+    def make_method(result_class):
+        def method(self):
+            time.sleep(delay)
+            return result_class()
+        return method
+
+    result_class = _new_class(counter, prefix='Result', module=module)
+    for _ in range(n_classes):
+        methods = {f"compute{method_id}": make_method(result_class) for method_id in range(n_methods)}
+        result_class = _new_class(counter, prefix='Slow', module=module, **methods)
+    return result_class()
+
+
+def make_containers(size, module=SYNTHETIC_MODULE):
+    """
+    Parameters
+    ----------
+    size : int
+        The number of elements of each container.
+
+    Returns
+    -------
+    root : object
+        An object with a large list, tuple, set and dict of ints and objects.
+    """
+    counter = itertools.count()
+    root = _new_class(counter, module=module)()
+    root.ints = list(range(size))
+    root.objects = [_new_class(counter, module=module)() for _ in range(size)]
+    root.pairs = tuple((i, str(i)) for i in range(size))
+    root.unique = set(range(size))
+    root.mapping = {f"key{i}": _new_class(counter, module=module)() for i in range(size)}
+    return root
@@ -1,2 +1,9 @@
-from pinspect.traverse import find
+from pinspect.cache import GraphCache
+from pinspect.execution import SerialExecutor, PoolExecutor, SandboxExecutor, AsyncExecutor
+from pinspect.inspector import Inspector
+from pinspect.logger import init_logger, TraceWriter
+from pinspect.profiling import Profiler
+from pinspect.sampling import ContainerSampler
+from pinspect.session import InspectionSession
+from pinspect.traverse import find, iter_find
 from pinspect.utils import to_pyvis, to_string
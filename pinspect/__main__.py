@@ -0,0 +1,5 @@
+import sys
+
+from pinspect.cli import main
+
+sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Persistent on-disk cache of the graphs, built by `GraphBuilder`.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import time
+from pathlib import Path
+
+import networkx as nx
+
+from pinspect.utils import get_module_version
+
+
+class GraphCache:
+    def __init__(self, directory=None, max_size=256 * 2 ** 20, max_age=None):
+        """
+        Stores unstripped graphs on disk so that the next `find()` calls on the same
+        kind of object, possibly with a different `key`, only strip the cached graph
+        instead of executing the methods again.
+
+        A graph is keyed by the root object type, its module root and the module
+        version, and the `GraphBuilder` settings, except the `key`, unless the
+        traversal depends on it (`strategy='best'` or `static='prune'`). The graphs
+        of the traversals, stopped by the `max_time` budget, are not stored: they
+        depend on the timing.
+
+        Parameters
+        ----------
+        directory : str or Path, optional
+            The cache directory.
+            Default is None (`~/.cache/pinspect`).
+        max_size : int, optional
+            The max total size of the cached graphs in bytes. The least recently used
+            graphs are evicted first.
+            Default is 256 Mb.
+        max_age : float, optional
+            The max age of a cached graph in seconds, since it has been stored.
+            Default is None (no limit).
+        """
+        if directory is None:
+            directory = Path.home() / ".cache" / "pinspect"
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    @staticmethod
+    def _type_name(obj_type):
+        type_name = f"{obj_type.__module__}.{obj_type.__qualname__}"
+        return re.sub(r"[^\w.]", '_', type_name)
+
+    def cache_key(self, builder):
+        """
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder.
+
+        Returns
+        -------
+        str
+            The file name of the `builder` graph in the cache directory.
+        """
+        ignore = builder.ignore_attribute
+        settings = (
+            builder.module,
+            get_module_version(builder.module),
+            ignore.ignore.pattern,
+            sorted(self._type_name(ignored_class) for ignored_class in ignore.obj_class),
+            builder.max_depth,
+            builder.strategy,
+            builder.max_nodes,
+            builder.max_time,
+            builder.max_calls,
+            builder.memory_bounded,
+            repr(builder.sampler),
+            builder.static_settings(),
+            # the order of exploring the objects, and so the budget cut-offs, depend on the key
+            builder.key.pattern if builder.strategy == 'best' else None,
+        )
+        digest = hashlib.sha1(repr(settings).encode()).hexdigest()
+        return f"{self._type_name(builder.obj.__class__)}-{digest}.pickle"
+
+    def load(self, builder):
+        """
+        Loads the cached graph of the `builder` object in `builder.graph`.
+
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder, which has not traversed the object yet.
+
+        Returns
+        -------
+        bool
+            Whether the graph has been found in the cache.
+        """
+        path = self.directory / self.cache_key(builder)
+        if not path.exists():
+            return False
+        if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+            path.unlink()
+            return False
+        try:
+            with open(path, 'rb') as f:
+                graph = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        # mark as recently used
+        os.utime(path, times=(time.time(), path.stat().st_mtime))
+        graph = nx.relabel_nodes(graph, {0: builder.graph.node_id(builder.obj)})
+        # the root node is kept and updated
+        builder.graph.add_nodes_from(graph.nodes.items())
+        builder.graph.add_edges_from(graph.edges.data())
+        return True
+
+    def store(self, builder):
+        """
+        Stores the graph of the `builder`.
+
+        Node titles are rendered before storing. The nodes are relabeled: the root
+        object is 0, other nodes are negative integers. Nothing is stored, if the
+        traversal has been stopped by the `max_time` budget.
+
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder, which has traversed the object.
+        """
+        if builder.stop_reason == 'max_time':
+            # a nondeterministic graph
+            return
+        builder.graph.render_titles()
+        root = builder.graph.node_id(builder.obj)
+        mapping = {root: 0}
+        for node in builder.graph.nodes:
+            if node != root:
+                mapping[node] = -len(mapping)
+        graph = nx.DiGraph()
+        graph.add_nodes_from((mapping[node], attr) for node, attr in builder.graph.nodes.items())
+        graph.add_edges_from((mapping[u], mapping[v], attr) for u, v, attr in builder.graph.edges.data())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / self.cache_key(builder)
+        path_tmp = path.with_suffix('.tmp')
+        with open(path_tmp, 'wb') as f:
+            pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path_tmp, path)
+        self.evict()
+
+    def invalidate(self, obj_type=None):
+        """
+        Removes cached graphs.
+
+        Parameters
+        ----------
+        obj_type : type, optional
+            Remove only the graphs of `obj_type` root objects.
+            Default is None (remove all).
+        """
+        pattern = "*.pickle" if obj_type is None else f"{self._type_name(obj_type)}-*.pickle"
+        for path in self.directory.glob(pattern):
+            path.unlink()
+
+    def evict(self):
+        """
+        Removes the graphs, older than `max_age`, and the least recently used graphs
+        to fit in `max_size`.
+        """
+        # the access time is tracked in st_atime by `load()`
+        paths = sorted(self.directory.glob("*.pickle"), key=lambda p: p.stat().st_atime, reverse=True)
+        total_size = 0
+        now = time.time()
+        for path in paths:
+            stat = path.stat()
+            expired = self.max_age is not None and now - stat.st_mtime > self.max_age
+            if expired or (self.max_size is not None and total_size + stat.st_size > self.max_size):
+                path.unlink()
+            else:
+                total_size += stat.st_size
@@ -0,0 +1,236 @@
+"""
+Command-line batch inspection of many objects.
+
+Each target is an import path and an expression, separated by a colon, e.g.
+``neo.io:BlackrockIO('data/file.ns5')``. The expression is evaluated in the
+namespace of the imported module. The targets are inspected concurrently in
+a process pool; each of them is traversed once and queried with all the keys.
+
+For each target, the output directory gets a subdirectory with the matches
+``<key>.txt`` in the `to_string()` format and, optionally, the stripped graphs
+``<key>.<format>``. The targets and the keys, which file names would be the
+same, get a short hash suffix. The ``summary.json`` file lists the number of
+matches and the errors of all targets.
+
+Examples
+--------
+$ pinspect 'neo.io:BlackrockIO("file.ns5")' 'neo.io:NixIO("file.nix")' -k epoch -k event -o results
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import importlib
+import json
+import re
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from pinspect.export import write_dot, write_graphml, write_jsonl
+from pinspect.inspector import Inspector
+from pinspect.traverse import STRATEGIES, BACKENDS
+from pinspect.utils import to_string
+
+GRAPH_WRITERS = {
+    'graphml': write_graphml,
+    'jsonl': write_jsonl,
+    'dot': write_dot,
+}
+
+
+def load_target(target):
+    """
+    Parameters
+    ----------
+    target : str
+        ``module:expression``.
+
+    Returns
+    -------
+    object
+        The value of the expression, evaluated in the namespace of the module.
+    """
+    module_name, sep, expression = target.partition(':')
+    if not sep or not expression:
+        raise ValueError(f"Invalid target '{target}'. Expected 'module:expression'")
+    module = importlib.import_module(module_name)
+    return eval(expression, dict(vars(module)))
+
+
+def safe_name(name):
+    """
+    Returns
+    -------
+    str
+        The `name` with the symbols, not allowed in file names, replaced by '_'.
+    """
+    return re.sub(r"[^\w.-]+", '_', name).strip('._') or '_'
+
+
+def unique_names(names):
+    """
+    Parameters
+    ----------
+    names : list of str
+        Names, e.g. the targets or the keys.
+
+    Returns
+    -------
+    dict
+        The file name of each distinct name: the `safe_name()`, followed by a short
+        hash of the name, if several names have the same `safe_name()`, ignoring
+        the case.
+    """
+    names = list(dict.fromkeys(names))
+    counts = collections.Counter(safe_name(name).lower() for name in names)
+    file_names = {}
+    for name in names:
+        file_name = safe_name(name)
+        if counts[file_name.lower()] > 1:
+            file_name = f"{file_name}-{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+        file_names[name] = file_name
+    return file_names
+
+
+def inspect_target(target, keys, output_dir, graph_format=None, name=None, **kwargs):
+    """
+    Inspects a single target and writes its matches. Runs in a worker process.
+
+    Parameters
+    ----------
+    target : str
+        ``module:expression``.
+    keys : list of str
+        The keys to look for.
+    output_dir : str or Path
+        The output directory.
+    graph_format : {'graphml', 'jsonl', 'dot'}, optional
+        Write the stripped graph of each key in this format.
+        Default is None (only the matches are written).
+    name : str, optional
+        The name of the target subdirectory.
+        Default is None (the `safe_name()` of the `target`).
+    **kwargs
+        `Inspector` parameters.
+
+    Returns
+    -------
+    dict
+        The summary of the target.
+    """
+    start = time.perf_counter()
+    obj = load_target(target)
+    inspector = Inspector(obj, **kwargs).build()
+    if name is None:
+        name = safe_name(target)
+    target_dir = Path(output_dir) / name
+    target_dir.mkdir(parents=True, exist_ok=True)
+    summary = dict(target=target, directory=str(target_dir), nodes=len(inspector.graph),
+                   edges=inspector.graph.number_of_edges(), matches={})
+    if inspector.builder.static is not None:
+        summary['calls_avoided'] = inspector.builder.n_calls_avoided
+    key_names = unique_names(keys)
+    for key in keys:
+        graph = inspector.query(key)
+        n_matches = 0
+        with open(target_dir / f"{key_names[key]}.txt", 'w', encoding='utf-8') as f:
+            if len(graph) > 0:
+                for match in to_string(graph, source=inspector.root, prefix=obj.__class__.__name__,
+                                       dedup_suffixes=True):
+                    f.write(match)
+                    f.write('\n')
+                    n_matches += 1
+        if graph_format is not None:
+            GRAPH_WRITERS[graph_format](graph, target_dir / f"{key_names[key]}.{graph_format}")
+        summary['matches'][key] = n_matches
+    summary['time'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='pinspect', description="Inspect objects for methods and attributes "
+                                                                   "that match the keys.")
+    parser.add_argument('targets', nargs='*', help="objects to inspect as 'module:expression'")
+    parser.add_argument('-k', '--key', dest='keys', action='append', required=True,
+                        help="a key to look for; repeat to look for several keys")
+    parser.add_argument('-f', '--targets-file', help="a file with a target per line")
+    parser.add_argument('-o', '--output', default='pinspect-output', help="the output directory")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="the number of worker processes (default: the number of CPUs)")
+    parser.add_argument('--graph-format', choices=sorted(GRAPH_WRITERS), help="also write the stripped graphs")
+    parser.add_argument('--ignore-key', default='', help="do not access or execute the matching attributes")
+    parser.add_argument('--max-depth', type=int, default=10)
+    parser.add_argument('--strategy', choices=STRATEGIES, default='dfs')
+    parser.add_argument('--max-nodes', type=int)
+    parser.add_argument('--max-time', type=float, help="the traversal time budget of a target, s")
+    parser.add_argument('--backend', choices=BACKENDS, default='networkx')
+    parser.add_argument('--static', action='store_true',
+                        help="do not execute the methods with required parameters, found from their signatures")
+    args = parser.parse_args(argv)
+    if args.targets_file is not None:
+        with open(args.targets_file, encoding='utf-8') as f:
+            args.targets.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    if len(args.targets) == 0:
+        parser.error("no targets")
+    return args
+
+
+def main(argv=None):
+    """
+    The ``pinspect`` console entry point.
+
+    Returns
+    -------
+    int
+        The exit code: 0 if all targets have been inspected, 1 otherwise.
+    """
+    args = parse_args(argv)
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    kwargs = dict(ignore_key=args.ignore_key, max_depth=args.max_depth, strategy=args.strategy,
+                  max_nodes=args.max_nodes, max_time=args.max_time, backend=args.backend,
+                  static='signature' if args.static else None)
+    target_names = unique_names(args.targets)
+    summaries = {}
+
+    def report(target, summary):
+        summaries[target] = summary
+        if 'error' in summary:
+            print(f"{target}: {summary['error']}", file=sys.stderr)
+        else:
+            matches = ', '.join(f"{key}: {n_matches}" for key, n_matches in summary['matches'].items())
+            print(f"{target}: {matches} ({summary['time']} s)")
+
+    if args.jobs == 1:
+        for target in args.targets:
+            try:
+                summary = inspect_target(target, args.keys, output_dir, args.graph_format,
+                                         name=target_names[target], **kwargs)
+            except Exception as error:
+                summary = dict(target=target, error=repr(error), traceback=traceback.format_exc())
+            report(target, summary)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = {pool.submit(inspect_target, target, args.keys, output_dir, args.graph_format,
+                                   name=target_names[target], **kwargs): target for target in args.targets}
+            for future in concurrent.futures.as_completed(futures):
+                target = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as error:
+                    summary = dict(target=target, error=repr(error),
+                                   traceback=''.join(traceback.format_exception(type(error), error,
+                                                                                error.__traceback__)))
+                report(target, summary)
+
+    summaries = [summaries[target] for target in args.targets]
+    with open(output_dir / 'summary.json', 'w') as f:
+        json.dump(summaries, f, indent=2)
+    return int(any('error' in summary for summary in summaries))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
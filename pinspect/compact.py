@@ -0,0 +1,500 @@
+"""
+Compact array-backed graph backend of `GraphBuilder`.
+"""
+
+from array import array
+from bisect import bisect_left
+
+import networkx as nx
+
+from pinspect.traverse import TopologicalOrder
+from pinspect.utils import node_label, short_title
+
+# node and edge colors are stored as indices in this tuple
+COLORS = (None, 'red', 'magenta', 'green', 'blue')
+_COLOR_IDS = {color: color_id for color_id, color in enumerate(COLORS)}
+
+# the index of a missing node or edge
+_NONE = -1
+
+
+class _NodeView:
+    """
+    A read-only view of the nodes, which mimics `nx.DiGraph.nodes`.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return iter(self._graph)
+
+    def __len__(self):
+        return len(self._graph)
+
+    def __contains__(self, node):
+        return node in self._graph
+
+    def __getitem__(self, node):
+        if node not in self._graph:
+            raise KeyError(node)
+        return self._graph._node_attr(node)
+
+    def items(self):
+        return ((node, self._graph._node_attr(node)) for node in self._graph)
+
+    def data(self, name=None):
+        if name is None:
+            return self.items()
+        return ((node, self._graph._node_attr(node).get(name)) for node in self._graph)
+
+
+class _EdgeView:
+    """
+    A read-only view of the edges, which mimics `nx.DiGraph.edges`.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return ((u, v) for u, v, edge in self._graph._iter_edges())
+
+    def __len__(self):
+        return self._graph.number_of_edges()
+
+    def data(self, name=None):
+        graph = self._graph
+        if name is None:
+            return ((u, v, graph._edge_attr(edge)) for u, v, edge in graph._iter_edges())
+        if name == 'label':
+            labels = graph._labels
+            return ((u, v, labels[graph._edge_label[edge]]) for u, v, edge in graph._iter_edges())
+        return ((u, v, graph._edge_attr(edge).get(name)) for u, v, edge in graph._iter_edges())
+
+
+class _AdjacencyView:
+    """
+    A read-only view of the successors or predecessors of each node,
+    which mimics `nx.DiGraph.succ` and `nx.DiGraph.pred`.
+    """
+
+    def __init__(self, graph, outgoing):
+        self._graph = graph
+        self._outgoing = outgoing
+
+    def __getitem__(self, node):
+        if node not in self._graph:
+            raise KeyError(node)
+        return _Neighbors(self._graph, node, outgoing=self._outgoing)
+
+
+class _Neighbors:
+
+    def __init__(self, graph, node, outgoing):
+        self._graph = graph
+        self._node = node
+        self._outgoing = outgoing
+
+    def _iter_edges(self):
+        graph = self._graph
+        if self._outgoing:
+            edge, next_edge, ends = graph._first_out[self._node], graph._next_out, graph._edge_dst
+        else:
+            edge, next_edge, ends = graph._first_in[self._node], graph._next_in, graph._edge_src
+        while edge != _NONE:
+            if graph._edge_label[edge] != _NONE:
+                yield ends[edge], edge
+            edge = next_edge[edge]
+
+    def __iter__(self):
+        return (node for node, edge in self._iter_edges())
+
+    def __len__(self):
+        return sum(1 for _ in self._iter_edges())
+
+    def items(self):
+        return ((node, self._graph._edge_attr(edge)) for node, edge in self._iter_edges())
+
+
+class CompactDiGraph(TopologicalOrder):
+    """
+    Directed Acyclic Graph, stored in flat arrays.
+
+    Nodes are consecutive integers, which index the arrays of levels, colors and
+    labels. Labels are interned: each distinct label string is stored once. Edges
+    are stored in arrays as well and chained into the lists of outgoing and
+    incoming edges of each node. The rare extra edge attributes (e.g. the profiling
+    `duration` and `size`) are kept in a dict.
+
+    The graph supports the subset of the `DiGraphAcyclic` interface used by
+    `GraphBuilder`, `match_subgraph()` and `GraphCache`. Node attributes, returned
+    by `nodes[node]`, are read-only copies. Use `to_networkx()` to get a networkx
+    graph.
+    """
+
+    def __init__(self, synthetic_ids=False):
+        self.synthetic_ids = synthetic_ids
+        self._labels = []
+        self._label_ids = {}
+        # node arrays; a removed node has the label _NONE
+        self._node_label = array('l')
+        self._level = array('l')
+        self._color = array('b')
+        self._first_out = array('l')
+        self._last_out = array('l')
+        self._first_in = array('l')
+        self._last_in = array('l')
+        # edge arrays; a removed edge has the label _NONE
+        self._edge_src = array('l')
+        self._edge_dst = array('l')
+        self._edge_label = array('l')
+        self._edge_color = array('b')
+        self._next_out = array('l')
+        self._next_in = array('l')
+        self._edge_extra = {}
+        self._n_nodes = 0
+        self._n_edges = 0
+        self._order = array('q')
+        self._order_sorted = array('q')
+        self._titles = {}
+        self._objects = {}
+        # id(obj) -> node or, with synthetic ids, id(obj) -> (node, obj)
+        self._node_ids = {}
+        self._pinned_nodes = {}
+        # the ids of the nodes, loaded by `add_nodes_from()`
+        self._loaded_ids = {}
+        self.nodes = _NodeView(self)
+        self.edges = _EdgeView(self)
+        self.succ = _AdjacencyView(self, outgoing=True)
+        self.pred = _AdjacencyView(self, outgoing=False)
+
+    def __len__(self):
+        return self._n_nodes
+
+    def __iter__(self):
+        node_label = self._node_label
+        return (node for node in range(len(node_label)) if node_label[node] != _NONE)
+
+    def __contains__(self, node):
+        return isinstance(node, int) and 0 <= node < len(self._node_label) and self._node_label[node] != _NONE
+
+    def number_of_nodes(self):
+        return self._n_nodes
+
+    def number_of_edges(self):
+        return self._n_edges
+
+    def _intern(self, label):
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self._labels)
+            self._labels.append(label)
+            self._label_ids[label] = label_id
+        return label_id
+
+    def _node_attr(self, node):
+        attr = dict(label=self._labels[self._node_label[node]], level=self._level[node],
+                    color=COLORS[self._color[node]])
+        title = self._titles.get(node)
+        if title is not None:
+            attr['title'] = title
+        return attr
+
+    def _edge_attr(self, edge):
+        attr = dict(label=self._labels[self._edge_label[edge]], color=COLORS[self._edge_color[edge]])
+        attr.update(self._edge_extra.get(edge, ()))
+        return attr
+
+    def _iter_edges(self):
+        edge_label = self._edge_label
+        for edge in range(len(edge_label)):
+            if edge_label[edge] != _NONE:
+                yield self._edge_src[edge], self._edge_dst[edge], edge
+
+    def node_id(self, obj):
+        """
+        Parameters
+        ----------
+        obj : object
+            An object.
+
+        Returns
+        -------
+        int
+            The node of the `obj`, if it's in the graph, or the node it would get
+            if added. Exceptions always get a new node.
+        """
+        if self.synthetic_ids:
+            pinned = self._node_ids.get(id(obj))
+            if pinned is not None and pinned[1] is obj:
+                return pinned[0]
+        elif not isinstance(obj, Exception):
+            node = self._node_ids.get(id(obj))
+            # the entry of a removed node is left, if its object had been released
+            if node is not None and node in self:
+                return node
+        return len(self._node_label)
+
+    def add_node(self, obj, level=0, **attr):
+        """
+        Adds `obj` in the graph, if not present.
+
+        Parameters
+        ----------
+        obj : object
+            An object to add in the graph.
+        level : int, optional
+            The node level.
+
+        Returns
+        -------
+        int
+            Node id.
+        """
+        node = self.node_id(obj)
+        if node in self:
+            return node
+        label, color = node_label(obj)
+        node = self._append_node(label, level=level, color=color)
+        if self.synthetic_ids:
+            self._node_ids[id(obj)] = (node, obj)
+            self._pinned_nodes[node] = id(obj)
+            self._titles[node] = short_title(obj)
+        else:
+            if not isinstance(obj, Exception):
+                self._node_ids[id(obj)] = node
+            self._objects[node] = obj
+        return node
+
+    def _append_node(self, label, level, color=None):
+        node = len(self._node_label)
+        self._node_label.append(self._intern(label))
+        self._level.append(level)
+        self._color.append(_COLOR_IDS[color])
+        for edges in (self._first_out, self._last_out, self._first_in, self._last_in):
+            edges.append(_NONE)
+        self._append_order(node)
+        self._n_nodes += 1
+        return node
+
+    def add_edge(self, u, v_obj, label=None, **attr):
+        """
+        Adds `v_obj` node in the graph, if not present, and then
+        adds an edge from `u` to `node_id(v_obj)`.
+
+        Parameters
+        ----------
+        u : int
+            A node from.
+        v_obj : object
+            A node object to.
+        label : str
+            Edge label.
+        **attr
+            Other edge attributes.
+
+        Returns
+        -------
+        bool
+            False, if the edge closes a cycle, and True otherwise.
+        """
+        v = self.add_node(v_obj, level=self._level[u] + 1)
+        if not self._update_order(u, v):
+            return False
+        if label.endswith('()'):
+            color = 'red'
+        elif self._level[v] < self._level[u]:
+            # level up
+            color = 'magenta'
+        else:
+            color = None
+        self._append_edge(u, v, label=label, color=color, **attr)
+        return True
+
+    def _append_edge(self, u, v, label, color=None, **attr):
+        edge = len(self._edge_label)
+        self._edge_src.append(u)
+        self._edge_dst.append(v)
+        self._edge_label.append(self._intern(label))
+        self._edge_color.append(_COLOR_IDS[color])
+        self._next_out.append(_NONE)
+        self._next_in.append(_NONE)
+        for first, last, next_edge, node in ((self._first_out, self._last_out, self._next_out, u),
+                                             (self._first_in, self._last_in, self._next_in, v)):
+            if first[node] == _NONE:
+                first[node] = edge
+            else:
+                next_edge[last[node]] = edge
+            last[node] = edge
+        if len(attr) > 0:
+            self._edge_extra[edge] = attr
+        self._n_edges += 1
+
+    def remove_node(self, n):
+        """
+        Removes the node `n` and its edges.
+
+        Parameters
+        ----------
+        n : int
+            Node id.
+        """
+        if n not in self:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.")
+        for first, next_edge in ((self._first_out, self._next_out), (self._first_in, self._next_in)):
+            edge = first[n]
+            while edge != _NONE:
+                if self._edge_label[edge] != _NONE:
+                    self._edge_label[edge] = _NONE
+                    self._edge_extra.pop(edge, None)
+                    self._n_edges -= 1
+                edge = next_edge[edge]
+        self._node_label[n] = _NONE
+        self._n_nodes -= 1
+        self._discard_order(n)
+        self._titles.pop(n, None)
+        obj = self._objects.pop(n, None)
+        if obj is not None and self._node_ids.get(id(obj)) == n:
+            del self._node_ids[id(obj)]
+        self.release(n)
+
+    def clear(self):
+        self.__init__(synthetic_ids=self.synthetic_ids)
+
+    def add_nodes_from(self, nodes):
+        """
+        Adds or updates the nodes from pairs of node ids and attributes, as in
+        `nx.DiGraph.nodes.items()`.
+
+        The ids of the nodes, which are not in the graph, are replaced by new
+        node ids; `add_edges_from()` translates them.
+
+        Parameters
+        ----------
+        nodes : iterable
+            Pairs of a node id and a dict of the node attributes.
+        """
+        self._loaded_ids = {}
+        for node, attr in nodes:
+            if node not in self:
+                self._loaded_ids[node] = self._append_node(attr['label'], level=attr['level'],
+                                                           color=attr.get('color'))
+            else:
+                self._node_label[node] = self._intern(attr['label'])
+                self._level[node] = attr['level']
+                self._color[node] = _COLOR_IDS[attr.get('color')]
+            if 'title' in attr:
+                self._titles[self._loaded_ids.get(node, node)] = attr['title']
+
+    def add_edges_from(self, edges):
+        """
+        Adds the edges from triples `(u, v, attr)`, as in `nx.DiGraph.edges.data()`,
+        skipping those that close a cycle.
+
+        Parameters
+        ----------
+        edges : iterable
+            Triples of the nodes, added by `add_nodes_from()`, and a dict of
+            the edge attributes.
+        """
+        for u, v, attr in edges:
+            u = self._loaded_ids.get(u, u)
+            v = self._loaded_ids.get(v, v)
+            if self._update_order(u, v):
+                self._append_edge(u, v, **attr)
+
+    def release(self, node):
+        """
+        Drops the reference to the object of the `node`, if `synthetic_ids` is set.
+
+        Parameters
+        ----------
+        node : int
+            Node id.
+        """
+        obj_id = self._pinned_nodes.pop(node, None)
+        if obj_id is not None:
+            del self._node_ids[obj_id]
+
+    def node_title(self, node):
+        """
+        Renders the title of the `node`, if not rendered yet.
+
+        Parameters
+        ----------
+        node : int
+            Node id.
+
+        Returns
+        -------
+        str
+            The node title: a short representation of its object.
+        """
+        title = self._titles.get(node)
+        if title is None:
+            if node not in self._objects:
+                # the object has been released
+                return self._labels[self._node_label[node]]
+            title = short_title(self._objects.pop(node))
+            self._titles[node] = title
+        return title
+
+    def render_titles(self, nodes=None):
+        """
+        Renders the titles of the `nodes`.
+
+        Parameters
+        ----------
+        nodes : iterable, optional
+            Node ids. If None, all nodes are rendered.
+        """
+        if nodes is None:
+            nodes = list(self._objects)
+        for node in nodes:
+            self.node_title(node)
+
+    def release_objects(self):
+        """
+        Drops the references to the objects of the nodes with not yet rendered titles.
+        """
+        self._objects.clear()
+
+    def to_networkx(self):
+        """
+        Returns
+        -------
+        nx.DiGraph
+            A copy of the graph with the same node ids and attributes.
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes.items())
+        graph.add_edges_from(self.edges.data())
+        return graph
+
+    def _append_order(self, node):
+        if len(self._order_sorted) > 0:
+            pos = self._order_sorted[-1] + self.ORDER_GAP
+        else:
+            pos = 0
+        self._order.append(pos)
+        self._order_sorted.append(pos)
+
+    def _discard_order(self, node):
+        pos = self._order[node]
+        order_sorted = self._order_sorted
+        # the position of a removed node is left in `_order`
+        idx = bisect_left(order_sorted, pos)
+        if idx < len(order_sorted) and order_sorted[idx] == pos:
+            del order_sorted[idx]
+
+    def _reset_order(self, nodes_sorted):
+        for idx, node in enumerate(nodes_sorted):
+            self._order[node] = idx * self.ORDER_GAP
+        self._order_sorted = array('q', sorted(self._order[node] for node in self))
+
+    def _predecessors(self, node):
+        return self.pred[node]
+
+    def _nodes_in_order(self):
+        return sorted(self, key=self._order.__getitem__)
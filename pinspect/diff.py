@@ -0,0 +1,248 @@
+"""
+Shallow fingerprints of the inspected objects and the difference of two traversals
+of the same object, e.g. before and after its state has changed.
+"""
+
+import networkx as nx
+
+DIFF_STATUSES = ('added', 'removed', 'changed')
+
+# the node and edge colors of the diff statuses in `to_pyvis()`
+DIFF_COLORS = {
+    'added': 'green',
+    'removed': 'gray',
+    'changed': 'orange',
+}
+
+# the labels of the immutable leaves, which titles are compared to tell whether they have changed
+SCALAR_LABELS = frozenset(['bool', 'int', 'float', 'complex', 'str', 'bytes', 'NoneType'])
+
+
+def fingerprint(obj):
+    """
+    The shallow state of an object: its attribute values, if they are scalars,
+    the identities and sizes of its containers, and the identities of the
+    other attribute values. The attribute values themselves are not inspected.
+
+    Parameters
+    ----------
+    obj : object
+        An object.
+
+    Returns
+    -------
+    tuple
+        The fingerprint of the `obj` state. Equal fingerprints of the same object,
+        taken at different times, mean that its attributes have not been reassigned.
+    """
+    try:
+        state = vars(obj).items()
+    except TypeError:
+        names = (name for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ()))
+        state = ((name, getattr(obj, name, None)) for name in names)
+    items = []
+    for name, value in state:
+        if isinstance(value, (bool, int, float, complex, str, bytes, type(None))):
+            items.append((name, value))
+        elif isinstance(value, (list, dict, set, bytearray)):
+            items.append((name, id(value), len(value)))
+        else:
+            items.append((name, id(value)))
+    return tuple(items)
+
+
+class GraphDiff:
+    def __init__(self, previous, current):
+        """
+        The difference of two traversals of the same object.
+
+        The nodes of the two graphs are matched by their first paths from the root:
+        the objects, reached by the same attributes and methods, are compared even
+        if they are different objects. A node, present in both graphs, has changed,
+        if its class or color differs, if it is an exception with a different message,
+        or if it is the same inspected object, which attributes have been reassigned
+        (see `fingerprint()`). The edges are matched by their parent paths and labels;
+        an edge has changed, if it leads to a different path or to a scalar (a number,
+        a string, None) with a different value. The scalars, which are shared by
+        many edges, are compared as the edge values rather than as nodes.
+
+        Parameters
+        ----------
+        previous : GraphBuilder
+            The builder of the previous traversal.
+        current : GraphBuilder
+            The builder of the current traversal.
+
+        Attributes
+        ----------
+        added_nodes, removed_nodes, changed_nodes : list of str
+            The first paths to the nodes in the `to_string()` format, without the target.
+        added_edges, removed_edges, changed_edges : list of tuple
+            The edges as (parent path, edge label) pairs.
+        graph : nx.DiGraph
+            The changes and the paths to them from the root node `source`, for
+            `to_string()` and `to_pyvis()`. The `diff` attribute of the changed nodes
+            and edges is one of `DIFF_STATUSES`; only the top node of an added or
+            removed subtree is included. The nodes, which are not in the current
+            graph, have string ids ``'<status>:<path>'``.
+        source : int or str
+            The root node of the `graph`.
+        """
+        self.previous = previous
+        self.current = current
+        prev_paths = previous.first_paths()
+        cur_paths = current.first_paths()
+        prev_nodes = {path: node for node, path in prev_paths.items() if not self._is_scalar(previous, node)}
+        cur_nodes = {path: node for node, path in cur_paths.items() if not self._is_scalar(current, node)}
+        self.added_nodes = [path for path in cur_nodes if path not in prev_nodes]
+        self.removed_nodes = [path for path in prev_nodes if path not in cur_nodes]
+        self.changed_nodes = [path for path, node in cur_nodes.items()
+                              if path in prev_nodes and self._node_changed(prev_nodes[path], node)]
+
+        prev_edges = self._edges(previous, prev_paths)
+        cur_edges = self._edges(current, cur_paths)
+        self.added_edges = [edge for edge in cur_edges if edge not in prev_edges]
+        self.removed_edges = [edge for edge in prev_edges if edge not in cur_edges]
+        self.changed_edges = [edge for edge, (node, value) in cur_edges.items()
+                              if edge in prev_edges and prev_edges[edge][1] != value]
+
+        self.source = current.graph.node_id(current.obj)
+        self.graph = nx.DiGraph()
+        statuses = dict.fromkeys(self.added_nodes, 'added')
+        statuses.update(dict.fromkeys(self.removed_nodes, 'removed'))
+        self._add_path(self.source)
+        self._add_nodes(prev_paths, prev_nodes, cur_paths, cur_nodes, statuses)
+        self._add_edges(prev_edges, cur_edges, cur_nodes, statuses)
+
+    def __len__(self):
+        """
+        Returns
+        -------
+        int
+            The total number of added, removed and changed nodes and edges.
+        """
+        return len(self.added_nodes) + len(self.removed_nodes) + len(self.changed_nodes) + \
+            len(self.added_edges) + len(self.removed_edges) + len(self.changed_edges)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(nodes: +{len(self.added_nodes)} -{len(self.removed_nodes)} " \
+               f"~{len(self.changed_nodes)}, edges: +{len(self.added_edges)} -{len(self.removed_edges)} " \
+               f"~{len(self.changed_edges)})"
+
+    @staticmethod
+    def _is_scalar(builder, node):
+        return builder.graph.nodes[node]['label'] in SCALAR_LABELS
+
+    def _node_changed(self, prev_node, node):
+        prev_attr = self.previous.graph.nodes[prev_node]
+        attr = self.current.graph.nodes[node]
+        if prev_attr['label'] != attr['label'] or prev_attr.get('color') != attr.get('color'):
+            return True
+        if attr.get('color') == 'red':
+            return self.previous.graph.node_title(prev_node) != self.current.graph.node_title(node)
+        prev_state = self.previous.states.get(prev_node)
+        state = self.current.states.get(node)
+        if prev_node == node and prev_state is not None and state is not None and prev_state[0] is state[0]:
+            return prev_state[1] != state[1]
+        return False
+
+    def _edges(self, builder, paths):
+        # (parent path, edge label) -> (target node, target path or scalar value)
+        edges = {}
+        for u, v, label in builder.graph.edges.data('label'):
+            if u not in paths or v not in paths:
+                continue
+            if self._is_scalar(builder, v):
+                value = (builder.graph.nodes[v]['label'], builder.graph.node_title(v))
+            else:
+                value = paths[v]
+            edges[(paths[u], label)] = (v, value)
+        return edges
+
+    def _add_node(self, builder, node, node_id=None, status=None):
+        if node_id is None:
+            node_id = node
+        attr = builder.graph.nodes[node]
+        color = attr.get('color') if status is None else DIFF_COLORS[status]
+        self.graph.add_node(node_id, label=attr['label'], level=attr['level'], color=color,
+                            title=builder.graph.node_title(node), diff=status)
+
+    def _add_edge(self, u, v, label, color=None, status=None):
+        if status is not None:
+            color = DIFF_COLORS[status]
+        self.graph.add_edge(u, v, label=label, color=color, diff=status)
+
+    def _add_path(self, node):
+        # adds the first path from the root to the current `node`
+        chain = []
+        while node not in self.graph:
+            chain.append(node)
+            parent_edge = self.current.parent_edge(node)
+            if parent_edge is None:
+                break
+            node = parent_edge[0]
+        for node in reversed(chain):
+            self._add_node(self.current, node)
+            parent_edge = self.current.parent_edge(node)
+            if parent_edge is not None:
+                parent, label = parent_edge
+                self._add_edge(parent, node, label, color=self.current.graph.edges[parent, node]['color'])
+
+    def _is_top(self, builder, node, paths, statuses):
+        # whether the parent of the added or removed `node` is present in both graphs
+        parent_edge = builder.parent_edge(node)
+        return parent_edge is None or paths[parent_edge[0]] not in statuses
+
+    def _add_nodes(self, prev_paths, prev_nodes, cur_paths, cur_nodes, statuses):
+        for path in self.added_nodes:
+            node = cur_nodes[path]
+            if self._is_top(self.current, node, cur_paths, statuses):
+                self._add_path(node)
+                self.graph.nodes[node].update(diff='added', color=DIFF_COLORS['added'])
+                parent_edge = self.current.parent_edge(node)
+                if parent_edge is not None:
+                    self.graph.edges[parent_edge[0], node].update(diff='added', color=DIFF_COLORS['added'])
+        for path in self.changed_nodes:
+            node = cur_nodes[path]
+            self._add_path(node)
+            self.graph.nodes[node].update(diff='changed', color=DIFF_COLORS['changed'])
+        for path in self.removed_nodes:
+            node = prev_nodes[path]
+            if self._is_top(self.previous, node, prev_paths, statuses):
+                parent, label = self.previous.parent_edge(node)
+                parent_path = prev_paths[parent]
+                self._add_copy(cur_nodes[parent_path], parent_path, label, self.previous, node, status='removed')
+
+    def _add_copy(self, parent, parent_path, label, builder, node, status):
+        # adds a copy of the `node` of the `builder` graph as a child of the current `parent`
+        self._add_path(parent)
+        node_id = f"{status}:{parent_path}.{label}"
+        self._add_node(builder, node, node_id=node_id, status=status)
+        self._add_edge(parent, node_id, label, status=status)
+
+    def _add_edges(self, prev_edges, cur_edges, cur_nodes, statuses):
+        for status, edges in (('added', self.added_edges), ('changed', self.changed_edges),
+                              ('removed', self.removed_edges)):
+            for parent_path, label in edges:
+                if parent_path in statuses:
+                    # the edges of the added and removed subtrees
+                    continue
+                if status == 'removed':
+                    node, value = prev_edges[(parent_path, label)]
+                    builder = self.previous
+                else:
+                    node, value = cur_edges[(parent_path, label)]
+                    builder = self.current
+                if value == f"{parent_path}.{label}" and value in statuses:
+                    # the first edge of an added or removed node
+                    continue
+                parent = cur_nodes[parent_path]
+                if status == 'removed' or self._is_scalar(builder, node) or self.graph.has_edge(parent, node):
+                    # the removed targets and the scalars, shared by many edges, are separate leaves;
+                    # so are the targets, connected to the parent already: a graph has a single edge
+                    # between two nodes
+                    self._add_copy(parent, parent_path, label, builder, node, status=status)
+                else:
+                    self._add_path(parent)
+                    self._add_path(node)
+                    self._add_edge(parent, node, label, status=status)
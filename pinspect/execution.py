@@ -0,0 +1,617 @@
+"""
+Executors of the methods, called by `GraphBuilder` during the traversal.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import inspect
+import math
+import os
+import pickle
+import select
+import signal
+import threading
+import time
+
+from pinspect.utils import short_title
+
+# how often to check whether a submitted call has started, seconds
+POLL_INTERVAL = 0.05
+
+
+def call_quietly(func):
+    """
+    Calls `func()` with the standard output suppressed.
+    """
+    with contextlib.redirect_stdout(None):
+        return func()
+
+
+class SerialExecutor:
+    """
+    Executes the calls one by one in the calling thread, at the moment
+    their results are requested. This is the default executor.
+    """
+
+    # whether all calls of an object should be submitted before requesting the results
+    prefetch = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def submit(self, func):
+        """
+        Schedules `func()` for the execution.
+
+        Parameters
+        ----------
+        func : callable
+            A function without arguments.
+
+        Returns
+        -------
+        object
+            A handle to pass in `result()`.
+        """
+        return func
+
+    def result(self, future):
+        """
+        Parameters
+        ----------
+        future : object
+            A handle, returned by `submit()`.
+
+        Returns
+        -------
+        object
+            The result of the call.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the call.
+        """
+        return call_quietly(future)
+
+    def shutdown(self):
+        """
+        Releases the resources of the executor.
+        """
+        pass
+
+
+class PoolExecutor(SerialExecutor):
+
+    prefetch = True
+
+    def __init__(self, max_workers=None, timeout=None, kind='thread'):
+        """
+        Executes the calls concurrently in a pool of threads or processes.
+
+        All calls of an inspected object are submitted at once, and their results
+        are collected in the order of the attribute names, which keeps the graph
+        deterministic.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            The max number of calls executed concurrently.
+            Default is chosen by `concurrent.futures`.
+        timeout : float, optional
+            The max duration of a call in seconds, counted since the call is started.
+            If exceeded, the call is recorded as `TimeoutError`.
+            Default is None (no limit).
+        kind : {'thread', 'process'}, optional
+            The kind of workers.
+            With 'process', the inspected objects and the call results must be
+            picklable; otherwise, the call is recorded as a pickling error.
+            Default is 'thread'.
+
+        Notes
+        -----
+        Python threads cannot be interrupted: a timed-out call in a 'thread' pool
+        keeps running in the background and occupies a worker. Timed-out process
+        workers are terminated on `shutdown()`.
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Invalid kind='{kind}'. Choose either 'thread' or 'process'")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.kind = kind
+        self._pool = None
+        self._timed_out = False
+        self._quiet = None
+        self._futures = set()
+
+    def __enter__(self):
+        if self.kind == 'thread':
+            # the standard output is shared across threads
+            self._quiet = contextlib.redirect_stdout(None)
+            self._quiet.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        if self._quiet is not None:
+            self._quiet.__exit__(exc_type, exc_val, exc_tb)
+            self._quiet = None
+
+    def submit(self, func):
+        if self._pool is None:
+            if self.kind == 'thread':
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        if self.kind == 'thread':
+            # the standard output is suppressed in `__enter__()`
+            future = self._pool.submit(func)
+        else:
+            future = self._pool.submit(call_quietly, func)
+        self._futures.add(future)
+        return future
+
+    def result(self, future):
+        self._futures.discard(future)
+        if self.timeout is None:
+            return future.result()
+        deadline = None
+        while True:
+            if deadline is None and (future.running() or future.done()):
+                deadline = time.monotonic() + self.timeout
+            if deadline is None:
+                wait_timeout = POLL_INTERVAL
+            else:
+                wait_timeout = max(deadline - time.monotonic(), 0)
+            done, _ = concurrent.futures.wait([future], timeout=wait_timeout)
+            if done:
+                return future.result()
+            if deadline is not None and time.monotonic() >= deadline:
+                future.cancel()
+                self._timed_out = True
+                raise TimeoutError(f"The call timed out after {self.timeout} s")
+
+    def shutdown(self):
+        if self._pool is None:
+            return
+        # the calls, which results have not been requested, if the traversal is stopped early
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        if self._timed_out and self.kind == 'process':
+            # stuck workers would block the interpreter exit otherwise
+            for process in list(getattr(self._pool, '_processes', {}).values()):
+                process.terminate()
+        self._pool.shutdown(wait=not self._timed_out)
+        self._pool = None
+        self._timed_out = False
+
+
+class AsyncSample(list):
+    """
+    The first elements of an async generator, returned by a method and sampled
+    by `AsyncExecutor`. It is inspected as a list.
+    """
+
+
+class AsyncExecutor(SerialExecutor):
+
+    prefetch = True
+
+    def __init__(self, max_concurrency=None, timeout=None, max_items=1):
+        """
+        Awaits the coroutine methods (``async def``) concurrently on an event loop.
+
+        The event loop runs in a background thread. All coroutine calls of an
+        inspected object are submitted at once and awaited concurrently, so that
+        the I/O-bound methods overlap; their results are collected in the order
+        of the attribute names. The results, which are async generators, are
+        sampled: their first `max_items` elements are collected in an `AsyncSample`
+        list. The regular methods are executed one by one in the calling thread,
+        as by `SerialExecutor`; the awaitables they return are awaited too.
+
+        Parameters
+        ----------
+        max_concurrency : int, optional
+            The max number of coroutines awaited concurrently.
+            Default is None (no limit).
+        timeout : float, optional
+            The max duration of a coroutine call or of sampling an async generator
+            in seconds, counted since the call is started. If exceeded, the coroutine
+            is cancelled, and the call is recorded as `TimeoutError`.
+            Default is None (no limit).
+        max_items : int, optional
+            The max number of elements to take from an async generator.
+            Default is 1.
+
+        Notes
+        -----
+        The coroutines run in the event loop thread, while the regular methods run
+        in the calling thread; the objects, which are not thread-safe, may be
+        accessed by both of them at the same time.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_items = max_items
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._quiet = None
+        self._futures = set()
+
+    def __enter__(self):
+        # the standard output is shared with the event loop thread
+        self._quiet = contextlib.redirect_stdout(None)
+        self._quiet.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        if self._quiet is not None:
+            self._quiet.__exit__(exc_type, exc_val, exc_tb)
+            self._quiet = None
+
+    def submit(self, func):
+        if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+            return self._schedule(func)
+        # executed in `result()`
+        return func
+
+    def result(self, future):
+        if isinstance(future, concurrent.futures.Future):
+            self._futures.discard(future)
+            return future.result()
+        result = call_quietly(future)
+        if inspect.isawaitable(result) or inspect.isasyncgen(result):
+            return self.result(self._schedule(lambda: result))
+        return result
+
+    def shutdown(self):
+        if self._loop is None:
+            return
+        # the calls, which results have not been requested, if the traversal is stopped early
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+
+    def _schedule(self, func):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='pinspect-async', daemon=True)
+            self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(self._run(func), self._loop)
+        self._futures.add(future)
+        return future
+
+    async def _run(self, func):
+        if self.max_concurrency is None:
+            return await self._await(func)
+        if self._semaphore is None:
+            # created in the event loop thread
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await self._await(func)
+
+    async def _await(self, func):
+        result = func()
+        if inspect.isasyncgen(result):
+            result = self._sample(result)
+        if self.timeout is None:
+            return await result
+        try:
+            return await asyncio.wait_for(result, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"The call timed out after {self.timeout} s") from None
+
+    async def _sample(self, generator):
+        items = AsyncSample()
+        try:
+            if self.max_items > 0:
+                async for item in generator:
+                    items.append(item)
+                    if len(items) >= self.max_items:
+                        break
+        finally:
+            await generator.aclose()
+        return items
+
+    async def _cancel_all(self):
+        if hasattr(asyncio, 'all_tasks'):
+            tasks, current = asyncio.all_tasks(), asyncio.current_task()
+        else:
+            # Python 3.6
+            tasks, current = asyncio.Task.all_tasks(), asyncio.Task.current_task()
+        tasks = [task for task in tasks if task is not current and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._loop.shutdown_asyncgens()
+
+
+class ResultSummary:
+    """
+    A stand-in for a call result, which could not be sent from a sandbox child
+    process. Its class name is the name of the result class, and the
+    representation is the title of the result.
+    """
+
+    def __init__(self, title):
+        self.title = title
+
+    def __repr__(self):
+        return self.title
+
+
+@functools.lru_cache(maxsize=None)
+def summary_class(class_name):
+    """
+    Parameters
+    ----------
+    class_name : str
+        The class name of a call result.
+
+    Returns
+    -------
+    type
+        A `ResultSummary` subclass named `class_name`.
+    """
+    return type(class_name, (ResultSummary,), {})
+
+
+class _SandboxCall:
+    def __init__(self, func):
+        self.func = func
+        self.pid = None
+        self.fd = None
+        self.start_time = None
+        # the pickled result, read so far, and the exit status of the finished child
+        self.chunks = []
+        self.status = None
+        # the error of a call, timed out before its result has been requested
+        self.error = None
+
+
+class SandboxExecutor(SerialExecutor):
+
+    prefetch = True
+
+    def __init__(self, max_workers=None, timeout=None, cpu_time=None, memory=None):
+        """
+        Executes each call in a forked child process with resource limits.
+
+        The child shares the inspected object with the parent copy-on-write, so
+        the object does not have to be picklable. A call that hangs, exceeds the
+        limits or crashes the interpreter kills only its child; the call is
+        recorded as an error. Results are pickled back to the parent; a result
+        that cannot be pickled is replaced by a `ResultSummary` leaf.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            The max number of child processes running concurrently. The result of
+            a call, which has not started yet, is requested only once a running
+            call has finished; the results of the finished calls are kept until
+            requested.
+            Default is None (`os.cpu_count()`).
+        timeout : float, optional
+            The max wall-clock time to wait for a call in seconds, counted since
+            its result is requested, as by `PoolExecutor`: a call that has finished
+            meanwhile is never timed out. If exceeded, the child is killed and the
+            call is recorded as `TimeoutError`. Waiting for a free worker takes at
+            most `timeout` seconds too, after which the longest running call is
+            timed out.
+            Default is None (no limit).
+        cpu_time : int, optional
+            The max CPU time of a call in seconds (`RLIMIT_CPU`).
+            Default is None (no limit).
+        memory : int, optional
+            The max address space of a child in bytes (`RLIMIT_AS`), including
+            the memory inherited from the parent. Allocations beyond the limit
+            raise `MemoryError` in the call.
+            Default is None (no limit).
+
+        Raises
+        ------
+        OSError
+            If the platform does not support `os.fork()`.
+
+        Notes
+        -----
+        A child, killed by a signal (a segfault or the `cpu_time` limit), is
+        recorded as `ChildProcessError`.
+        """
+        if not hasattr(os, 'fork'):
+            raise OSError("SandboxExecutor requires os.fork(), which is not available on this platform")
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cpu_time = cpu_time
+        self.memory = memory
+        self._pending = collections.deque()
+        self._running = set()
+
+    def submit(self, func):
+        call = _SandboxCall(func)
+        self._pending.append(call)
+        self._start_pending()
+        return call
+
+    def result(self, future):
+        if future.pid is None:
+            # all workers are busy with the calls, which results have not been requested yet
+            self._wait_worker()
+            self._start(future)
+        try:
+            if future.error is not None:
+                raise future.error
+            status, payload = self._collect(future)
+        finally:
+            self._running.discard(future)
+            self._start_pending()
+        if os.WIFSIGNALED(status):
+            raise ChildProcessError(f"The call was killed by {signal.Signals(os.WTERMSIG(status)).name}")
+        if len(payload) == 0:
+            raise ChildProcessError(f"The call exited with the code {os.WEXITSTATUS(status)}")
+        kind, value = pickle.loads(payload)
+        if kind == 'error':
+            raise value
+        if kind == 'summary':
+            class_name, title = value
+            return summary_class(class_name)(title)
+        return value
+
+    def shutdown(self):
+        for call in self._running:
+            self._kill(call)
+        self._running.clear()
+        self._pending.clear()
+
+    def _start_pending(self):
+        while len(self._pending) > 0 and len(self._running) < self.max_workers:
+            self._start(self._pending.popleft())
+
+    def _start(self, call):
+        if call in self._pending:
+            self._pending.remove(call)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._run_child(call.func, write_fd)
+        os.close(write_fd)
+        call.pid = pid
+        call.fd = read_fd
+        call.start_time = time.monotonic()
+        self._running.add(call)
+
+    def _wait_worker(self):
+        """
+        Waits until a running call finishes, if all workers are busy. The results
+        of the finished calls are kept until requested.
+        """
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+        while len(self._running) >= self.max_workers:
+            calls = {call.fd: call for call in self._running}
+            wait_timeout = None
+            if deadline is not None:
+                wait_timeout = max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select(list(calls), [], [], wait_timeout)
+            if len(ready) == 0:
+                if deadline is not None and time.monotonic() >= deadline:
+                    call = min(self._running, key=lambda call: call.start_time)
+                    self._kill(call)
+                    call.error = TimeoutError(f"The call timed out after {self.timeout} s")
+                    self._running.discard(call)
+                continue
+            for fd in ready:
+                call = calls[fd]
+                if self._read(call):
+                    self._running.discard(call)
+
+    def _read(self, call):
+        """
+        Reads a chunk of the pickled result of the `call`, which pipe is ready.
+
+        Returns
+        -------
+        bool
+            Whether the result has been read completely, and the child has exited.
+        """
+        chunk = os.read(call.fd, 2 ** 16)
+        if len(chunk) > 0:
+            call.chunks.append(chunk)
+            return False
+        os.close(call.fd)
+        call.fd = None
+        _, call.status = os.waitpid(call.pid, 0)
+        return True
+
+    def _run_child(self, func, write_fd):
+        # never returns
+        try:
+            import resource
+            if self.cpu_time is not None:
+                cpu_time = math.ceil(self.cpu_time)
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_time, cpu_time + 1))
+            if self.memory is not None:
+                resource.setrlimit(resource.RLIMIT_AS, (self.memory, self.memory))
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, 1)
+            try:
+                result = ('result', func())
+            except BaseException as err:
+                result = ('error', err)
+            try:
+                payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                kind, value = result
+                if kind == 'error':
+                    value = RuntimeError(f"{value.__class__.__name__}: {value}")
+                else:
+                    value = (value.__class__.__name__, short_title(value))
+                    kind = 'summary'
+                payload = pickle.dumps((kind, value), protocol=pickle.HIGHEST_PROTOCOL)
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(payload)
+        finally:
+            os._exit(0)
+
+    def _collect(self, call):
+        """
+        Reads the pickled result of the `call` and waits for its child to exit.
+
+        Returns
+        -------
+        status : int
+            The exit status of the child.
+        payload : bytes
+            The pickled result.
+        """
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+        try:
+            while call.status is None:
+                wait_timeout = None
+                if deadline is not None:
+                    wait_timeout = max(deadline - time.monotonic(), 0)
+                # the pipe is polled before timing out: the result may be written already
+                ready, _, _ = select.select([call.fd], [], [], wait_timeout)
+                if len(ready) == 0:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._kill(call)
+                        raise TimeoutError(f"The call timed out after {self.timeout} s")
+                    continue
+                self._read(call)
+        except BaseException:
+            self._kill(call)
+            raise
+        return call.status, b''.join(call.chunks)
+
+    @staticmethod
+    def _kill(call):
+        if call.fd is None:
+            return
+        os.close(call.fd)
+        call.fd = None
+        try:
+            os.kill(call.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        os.waitpid(call.pid, 0)
@@ -0,0 +1,282 @@
+"""
+Level-of-detail reduction and streaming export of large graphs.
+
+The writers take a graph, built by `GraphBuilder` or reduced by `cluster()` and
+`collapse_subtrees()`, and write it node by node without building a pyvis
+network or any other intermediate representation.
+
+Node titles of a `DiGraphAcyclic` graph are rendered lazily; call
+`graph.render_titles()` beforehand to export them.
+"""
+
+import contextlib
+import json
+from collections import Counter
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import networkx as nx
+
+CLUSTER_BY = ('class', 'level')
+
+# the max number of distinct edge labels, listed in a cluster edge label
+CLUSTER_MAX_LABELS = 3
+
+# the GraphML attributes: (element, name, type)
+GRAPHML_KEYS = (
+    ('node', 'label', 'string'),
+    ('node', 'level', 'int'),
+    ('node', 'color', 'string'),
+    ('node', 'title', 'string'),
+    ('node', 'count', 'int'),
+    ('edge', 'label', 'string'),
+    ('edge', 'color', 'string'),
+    ('edge', 'duration', 'double'),
+    ('edge', 'size', 'long'),
+    ('edge', 'count', 'int'),
+)
+
+
+@contextlib.contextmanager
+def _open_text(file):
+    if isinstance(file, (str, Path)):
+        with open(file, 'w', encoding='utf-8') as f:
+            yield f
+    else:
+        yield file
+        file.flush()
+
+
+def _roots(graph):
+    return [node for node in graph if len(graph.pred[node]) == 0]
+
+
+def cluster(graph, by='class'):
+    """
+    Merges the nodes of the same class or depth into a single node.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactDiGraph
+        Graph, obtained by `GraphBuilder`.
+    by : {'class', 'level'}, optional
+        Merge the nodes with the same label (the class name) or the same level.
+        Default is 'class'.
+
+    Returns
+    -------
+    clustered : nx.DiGraph
+        A graph with a node per cluster. The node `count` attribute is the number
+        of merged nodes. The edges between the same clusters are merged too;
+        their `label` lists the first merged edge labels, and `count` is the number
+        of merged edges. Unlike the original graph, the result may have cycles.
+    """
+    if by not in CLUSTER_BY:
+        raise ValueError(f"Invalid by='{by}'. Choose one of {CLUSTER_BY}")
+    clustered = nx.DiGraph()
+    cluster_of = {}
+    for node, attr in graph.nodes.items():
+        if by == 'class':
+            cluster_id = attr['label']
+        else:
+            cluster_id = attr['level']
+        cluster_of[node] = cluster_id
+        cluster_attr = clustered.nodes.get(cluster_id)
+        if cluster_attr is None:
+            label = cluster_id if by == 'class' else f"level {cluster_id}"
+            clustered.add_node(cluster_id, label=label, level=attr['level'], color=attr.get('color'), count=1)
+        else:
+            cluster_attr['level'] = min(cluster_attr['level'], attr['level'])
+            cluster_attr['count'] += 1
+    edge_labels = {}
+    for u, v, label in graph.edges.data('label'):
+        edge = (cluster_of[u], cluster_of[v])
+        labels = edge_labels.get(edge)
+        if labels is None:
+            labels = edge_labels[edge] = Counter()
+        labels[label] += 1
+    for (u, v), labels in edge_labels.items():
+        label = ', '.join(label for label, count in labels.most_common(CLUSTER_MAX_LABELS))
+        if len(labels) > CLUSTER_MAX_LABELS:
+            label = f"{label}, ..."
+        clustered.add_edge(u, v, label=label, color=None, count=sum(labels.values()))
+    for node, attr in clustered.nodes.items():
+        attr['title'] = f"{attr['label']}: {attr['count']} nodes"
+    return clustered
+
+
+def collapse_subtrees(graph, source=None, min_size=2):
+    """
+    Merges the repeated subtrees into a single copy.
+
+    Two subtrees are the same if their roots have the same label and color and
+    their children are reached by the same edge labels and are the same subtrees,
+    for example, the elements of a list of similar objects. The first met copy is
+    kept; the edges to the other copies are redirected to it.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactDiGraph
+        Graph, obtained by `GraphBuilder`.
+    source : int or str, optional
+        The root node. If None, all nodes without parents are the roots.
+        Default is None.
+    min_size : int, optional
+        Collapse only the subtrees with at least this many nodes. The default 2
+        keeps the leaves, e.g. the attributes of a builtin type, separate.
+
+    Returns
+    -------
+    collapsed : nx.DiGraph
+        A graph with the nodes reachable from the `source`. The node `count`
+        attribute is the number of merged copies of its subtree.
+    """
+    roots = _roots(graph) if source is None else [source]
+    # the ids of the distinct subtrees and their sizes, computed bottom-up
+    subtree_ids = {}
+    subtree_of = {}
+    subtree_size = {}
+    for root in roots:
+        if root in subtree_of:
+            continue
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in subtree_of:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in graph.succ[node] if child not in subtree_of)
+                continue
+            attr = graph.nodes[node]
+            children = sorted((edge_attr['label'], subtree_of[child])
+                              for child, edge_attr in graph.succ[node].items())
+            subtree_key = (attr['label'], attr.get('color'), tuple(children))
+            subtree_id = subtree_ids.setdefault(subtree_key, len(subtree_ids))
+            subtree_of[node] = subtree_id
+            subtree_size[subtree_id] = 1 + sum(subtree_size[child_id] for label, child_id in children)
+
+    collapsed = nx.DiGraph()
+    kept = {}
+    copies = {}
+
+    def keep(node):
+        # returns the node of the collapsed graph and whether it should be expanded
+        if node in kept:
+            return kept[node], False
+        subtree_id = subtree_of[node]
+        if subtree_size[subtree_id] >= min_size:
+            copy = copies.get(subtree_id)
+            if copy is not None:
+                collapsed.nodes[copy]['count'] += 1
+                kept[node] = copy
+                return copy, False
+            copies[subtree_id] = node
+        collapsed.add_node(node, **dict(graph.nodes[node], count=1))
+        kept[node] = node
+        return node, True
+
+    queue = [node for node in roots if keep(node)[1]]
+    for node in queue:
+        for child, edge_attr in graph.succ[node].items():
+            child_kept, expand = keep(child)
+            collapsed.add_edge(node, child_kept, **edge_attr)
+            if expand:
+                queue.append(child)
+    return collapsed
+
+
+def write_jsonl(graph, file):
+    """
+    Writes the graph as JSON lines: first the nodes, then the edges.
+
+    A node line is ``{"node": id, <attributes>}``; an edge line is
+    ``{"source": id, "target": id, <attributes>}``.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactDiGraph
+        A graph.
+    file : str or Path or file-like
+        A path of the file to create or an open text file.
+    """
+    with _open_text(file) as f:
+        for node, attr in graph.nodes.items():
+            f.write(json.dumps(dict(node=node, **attr), default=str))
+            f.write('\n')
+        for u, v, attr in graph.edges.data():
+            f.write(json.dumps(dict(source=u, target=v, **attr), default=str))
+            f.write('\n')
+
+
+def _dot_quote(value):
+    value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{value}"'
+
+
+def write_dot(graph, file):
+    """
+    Writes the graph in the Graphviz DOT format.
+
+    The node titles are written as tooltips.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactDiGraph
+        A graph.
+    file : str or Path or file-like
+        A path of the file to create or an open text file.
+    """
+    with _open_text(file) as f:
+        f.write("digraph pinspect {\n")
+        for node, attr in graph.nodes.items():
+            label = attr['label']
+            if attr.get('count', 1) > 1:
+                label = f"{label} x{attr['count']}"
+            options = [f"label={_dot_quote(label)}"]
+            if attr.get('color') is not None:
+                options.append(f"color={_dot_quote(attr['color'])}")
+            if attr.get('title') is not None:
+                options.append(f"tooltip={_dot_quote(attr['title'])}")
+            f.write(f"  {_dot_quote(node)} [{', '.join(options)}];\n")
+        for u, v, attr in graph.edges.data():
+            options = [f"label={_dot_quote(attr['label'])}"]
+            if attr.get('color') is not None:
+                options.append(f"color={_dot_quote(attr['color'])}")
+            f.write(f"  {_dot_quote(u)} -> {_dot_quote(v)} [{', '.join(options)}];\n")
+        f.write("}\n")
+
+
+def _graphml_data(attr, element):
+    data = []
+    for key_element, name, _ in GRAPHML_KEYS:
+        if key_element == element and attr.get(name) is not None:
+            data.append(f'<data key="{element}_{name}">{escape(str(attr[name]))}</data>')
+    return ''.join(data)
+
+
+def write_graphml(graph, file):
+    """
+    Writes the graph in the GraphML format.
+
+    Only the attributes, listed in `GRAPHML_KEYS`, are written.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactDiGraph
+        A graph.
+    file : str or Path or file-like
+        A path of the file to create or an open text file.
+    """
+    with _open_text(file) as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for element, name, attr_type in GRAPHML_KEYS:
+            f.write(f'  <key id="{element}_{name}" for="{element}" attr.name="{name}" attr.type="{attr_type}"/>\n')
+        f.write('  <graph edgedefault="directed">\n')
+        for node, attr in graph.nodes.items():
+            f.write(f'    <node id={quoteattr(str(node))}>{_graphml_data(attr, "node")}</node>\n')
+        for u, v, attr in graph.edges.data():
+            f.write(f'    <edge source={quoteattr(str(u))} target={quoteattr(str(v))}>'
+                    f'{_graphml_data(attr, "edge")}</edge>\n')
+        f.write('  </graph>\n</graphml>\n')
@@ -0,0 +1,246 @@
+"""
+Build once, query many: an index over a traversed graph.
+"""
+
+import re
+
+from pinspect.traverse import GraphBuilder, match_subgraph
+from pinspect.utils import to_string
+
+
+def tokenize(label):
+    """
+    Parameters
+    ----------
+    label : str
+        A node or edge label.
+
+    Returns
+    -------
+    set
+        Lower-case tokens of the `label`: alphanumeric words and their CamelCase parts.
+        For example, "BlackrockIO.read_epoch()" gives
+        {'blackrockio', 'blackrock', 'io', 'read', 'epoch'}.
+    """
+    tokens = set()
+    for word in re.findall(r"[a-zA-Z0-9]+", label):
+        tokens.add(word.lower())
+        tokens.update(part.lower() for part in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+", word))
+    return tokens
+
+
+class Inspector:
+    def __init__(self, obj, ignore_key='', ignore_class=(), executor=None, cache=None, **kwargs):
+        """
+        Traverses the object once and answers many queries with different keys.
+
+        Node labels (class names) and edge labels (attribute and method names) are
+        indexed: a query finds the matching labels in the vocabulary of distinct labels,
+        which is much smaller than the graph, and strips the graph starting from
+        the matches only.
+
+        Parameters
+        ----------
+        obj : object
+            An object to inspect.
+        ignore_key : str or list, optional
+            A string or a list of strings to ignore `obj` attributes and methods from being
+            accessed and executed. See `find()`.
+        ignore_class : list, optional
+            A list of class types to ignore.
+        executor : SerialExecutor, optional
+            Executes the methods of inspected objects. See `find()`.
+        cache : GraphCache, optional
+            Load the graph from or store it in the cache. See `find()`.
+        **kwargs
+            Other `GraphBuilder` parameters. The key-dependent `static='prune'` mode
+            is not supported; use `static='signature'`.
+
+        Raises
+        ------
+        ValueError
+            If `static='prune'`.
+
+        Examples
+        --------
+        >>> inspector = Inspector(session).build()
+        >>> graph = inspector.query('epoch')
+        >>> matches = inspector.matches('event', 'spike', match='any')
+        """
+        if kwargs.get('static') == 'prune':
+            raise ValueError("Inspector does not know the keys beforehand; static='prune' is not supported")
+        self.obj = obj
+        self._builder_kwargs = dict(kwargs, ignore_key=ignore_key, ignore_class=ignore_class, executor=executor)
+        self.builder = GraphBuilder(obj, key='', **self._builder_kwargs)
+        self.cache = cache
+        self.graph = None
+        self.root = self.builder.graph.node_id(obj)
+        self._nodes_by_label = {}
+        self._edges_by_label = {}
+        self._labels_by_token = {}
+        self._labels_by_key = {}
+
+    def build(self):
+        """
+        Traverses the object and builds the index.
+
+        Returns
+        -------
+        Inspector
+            Self.
+        """
+        if self.builder.previous is not None or self.cache is None or not self.cache.load(self.builder):
+            self.builder.traverse(self.obj)
+            if self.cache is not None:
+                self.cache.store(self.builder)
+        self.builder.obj_saved.clear()
+        self.graph = self.builder.graph
+        self._nodes_by_label = {}
+        self._edges_by_label = {}
+        self._labels_by_token = {}
+        self._labels_by_key = {}
+        for node, label in self.graph.nodes.data('label'):
+            self._nodes_by_label.setdefault(label, []).append(node)
+        for u, v, label in self.graph.edges.data('label'):
+            self._edges_by_label.setdefault(label, []).append((u, v))
+        for label in self._nodes_by_label.keys() | self._edges_by_label.keys():
+            for token in tokenize(label):
+                self._labels_by_token.setdefault(token, set()).add(label)
+        return self
+
+    def refresh(self):
+        """
+        Traverses the object again after its state has changed, e.g. more data has
+        been read, and rebuilds the index.
+
+        The methods of the objects, which attributes have not been reassigned,
+        are not executed again. Pass ``incremental=True`` in the constructor to
+        keep the method results for the reuse; otherwise, all methods are executed.
+
+        Returns
+        -------
+        GraphDiff
+            The changes since the previous traversal.
+
+        Raises
+        ------
+        ValueError
+            If the object has not been built yet.
+
+        Examples
+        --------
+        >>> inspector = Inspector(session, incremental=True).build()
+        >>> session.read()
+        >>> diff = inspector.refresh()
+        >>> print('\\n'.join(to_string(diff.graph, source=diff.source, prefix='BlackrockIO')))
+        """
+        if self.graph is None:
+            raise ValueError("Call build() first")
+        self.builder = GraphBuilder(self.obj, key='', previous=self.builder, **self._builder_kwargs)
+        self.build()
+        diff = self.builder.diff()
+        # only the last traversal is kept for the next refresh
+        self.builder.previous = None
+        return diff
+
+    def labels(self, key):
+        """
+        Parameters
+        ----------
+        key : str
+            A regular expression, matched case-insensitively.
+
+        Returns
+        -------
+        set
+            Node and edge labels that match the `key`.
+
+        Raises
+        ------
+        ValueError
+            If the `key` is a part of the ignored keys.
+        """
+        labels = self._labels_by_key.get(key)
+        if labels is not None:
+            return labels
+        if self.graph is None:
+            raise ValueError("Call build() first")
+        ignore_key = self.builder.ignore_attribute.ignore.pattern
+        if re.search(ignore_key, key):
+            raise ValueError(f"The key='{key}' cannot be a part of ignore_key='{ignore_key}'")
+        pattern = re.compile(key, flags=re.IGNORECASE)
+        if re.fullmatch(r"[a-zA-Z0-9]+", key):
+            # a plain word matches only within an alphanumeric token
+            key_lower = key.lower()
+            candidates = set()
+            for token, token_labels in self._labels_by_token.items():
+                if key_lower in token:
+                    candidates.update(token_labels)
+        else:
+            candidates = self._nodes_by_label.keys() | self._edges_by_label.keys()
+        labels = {label for label in candidates if pattern.search(label)}
+        self._labels_by_key[key] = labels
+        return labels
+
+    def _match(self, keys, match, exclude):
+        if match not in ('any', 'all'):
+            raise ValueError(f"Invalid match='{match}'. Choose either 'any' or 'all'")
+        label_sets = [self.labels(key) for key in keys]
+        if match == 'any':
+            labels = set().union(*label_sets)
+        else:
+            labels = set.intersection(*label_sets)
+        if exclude is not None:
+            labels = labels.difference(self.labels(exclude))
+        return labels
+
+    def query(self, *keys, match='any', exclude=None, with_methods=True, view=False):
+        """
+        Strips the graph to the nodes and edges that match the keys.
+
+        Parameters
+        ----------
+        *keys : str
+            Regular expressions to look for.
+        match : {'any', 'all'}, optional
+            A label should match any of the `keys` or all of them.
+            Default is 'any'.
+        exclude : str, optional
+            Labels, matching this regular expression, are not matched.
+        with_methods : bool, optional
+            Match edge labels (method and attribute names) as well, not only node labels.
+            Default is True.
+        view : bool, optional
+            Return a read-only view of the graph instead of a copy. See `match_subgraph()`.
+            Default is False.
+
+        Returns
+        -------
+        graph : nx.DiGraph
+            Stripped graph with edges and nodes that match the keys.
+        """
+        labels = self._match(keys, match=match, exclude=exclude)
+        nodes = [node for label in labels for node in self._nodes_by_label.get(label, ())]
+        edges = []
+        if with_methods:
+            edges = [edge for label in labels for edge in self._edges_by_label.get(label, ())]
+        return match_subgraph(self.graph, nodes=nodes, edges=edges, root=self.root, view=view)
+
+    def matches(self, *keys, **kwargs):
+        """
+        Parameters
+        ----------
+        *keys : str
+            Regular expressions to look for.
+        **kwargs
+            `query()` parameters.
+
+        Returns
+        -------
+        list
+            The paths to the matches in the `to_string()` format.
+        """
+        graph = self.query(*keys, **kwargs)
+        if len(graph) == 0:
+            return []
+        return list(to_string(graph, source=self.root, prefix=self.obj.__class__.__name__))
@@ -1,12 +1,102 @@
+import json
 import logging
 import time
 from pathlib import Path
 
+# the parent of the `pinspect.*` module loggers
+logger = logging.getLogger('pinspect')
 
-def init_logger():
+
+def init_logger(directory='logs', level=logging.DEBUG):
     """
-    Initializes the logger in 'logs' directory.
+    Writes the `pinspect` logs in a file in the `directory`.
+
+    Logging is opt-in: importing `pinspect` does not configure the logging
+    and does not create any files. Only the `pinspect` logger is configured;
+    the root logger is left intact.
+
+    Parameters
+    ----------
+    directory : str or Path, optional
+        The directory of the log files.
+        Default is 'logs' in the current working directory.
+    level : int, optional
+        The logging level.
+        Default is `logging.DEBUG`.
+
+    Returns
+    -------
+    handler : logging.FileHandler
+        The added handler; remove it with `logger.removeHandler()` to stop logging.
     """
-    logpath = Path(f"logs/{time.strftime('%Y.%m.%d %H:%M')}.txt")
+    logpath = Path(directory) / f"{time.strftime('%Y.%m.%d %H:%M')}.txt"
     logpath.parent.mkdir(exist_ok=True)
-    logging.basicConfig(filename=logpath, level=logging.DEBUG)
+    handler = logging.FileHandler(logpath)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+class TraceWriter:
+    def __init__(self, file):
+        """
+        Writes the traversal events of `GraphBuilder` as JSON lines.
+
+        Each line is an object with the `event` name, the `time` in seconds since
+        the writer has been created, and the event fields:
+          * 'visit' - `level`, `node`, `label` (the class name) and `edge`, by which
+            the node has been reached;
+          * 'call' - `method` and `duration`, the time spent waiting for the result;
+          * 'error' - `method`, `duration`, `error` (the exception class) and `message`;
+          * 'avoided' - `method` and `reason`, if the call has been avoided by the static
+            analysis (see the `GraphBuilder` `static` parameter);
+          * 'stop' - `reason`, if the traversal has been stopped early by a budget.
+
+        Parameters
+        ----------
+        file : str or Path or file-like
+            A path of the file to create or an open text file.
+
+        Examples
+        --------
+        >>> with TraceWriter('trace.jsonl') as trace:
+        ...     find(session, key='epoch', trace=trace)
+        """
+        if isinstance(file, (str, Path)):
+            self.file = open(file, 'w')
+            self._owns_file = True
+        else:
+            self.file = file
+            self._owns_file = False
+        self._start_time = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def emit(self, event, **fields):
+        """
+        Writes the `event` with its `fields`.
+
+        Parameters
+        ----------
+        event : str
+            The event name.
+        **fields
+            JSON-serializable event fields; other values are converted to strings.
+        """
+        record = dict(event=event, time=round(time.monotonic() - self._start_time, 6), **fields)
+        self.file.write(json.dumps(record, default=str))
+        self.file.write('\n')
+
+    def close(self):
+        """
+        Closes the file, if it has been opened by the writer.
+        """
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
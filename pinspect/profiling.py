@@ -0,0 +1,120 @@
+"""
+Profiling of the traversal: per-call execution time and result size, and per-phase timings.
+"""
+
+import collections
+import contextlib
+import time
+
+CallRecord = collections.namedtuple('CallRecord', ['method', 'duration', 'size'])
+
+
+class Profiler:
+    def __init__(self):
+        """
+        Collects the timings of a `GraphBuilder` traversal and of the `find()` phases.
+
+        The phases are:
+          * 'traverse' - the whole traversal;
+          * 'execute' - waiting for the results of the method calls;
+          * 'graph' - adding the nodes and edges in the graph;
+          * 'strip', 'to_string', 'to_pyvis', 'cache' - the `find()` steps.
+
+        Each executed method is recorded as a `CallRecord`; its duration and the
+        size of the result are also stored as the `duration` and `size` attributes
+        of the graph edge.
+
+        Examples
+        --------
+        >>> profiler = Profiler()
+        >>> find(session, key='epoch', profiler=profiler)
+        >>> print(profiler.format(top=5))
+        """
+        self.phases = collections.defaultdict(float)
+        self.calls = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Accumulates the time spent in the `with` block as the `name` phase.
+
+        Parameters
+        ----------
+        name : str
+            The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def record_call(self, method, duration, size):
+        """
+        Parameters
+        ----------
+        method : str
+            The full method name, "Class.method()".
+        duration : float
+            The time spent waiting for the result, seconds. For `SerialExecutor`,
+            this is the execution time of the call.
+        size : int or None
+            The size of the result in bytes, as returned by `sys.getsizeof()`,
+            or None, if the call raised an exception.
+        """
+        self.phases['execute'] += duration
+        self.calls.append(CallRecord(method, duration, size))
+
+    def slowest(self, n=10):
+        """
+        Parameters
+        ----------
+        n : int, optional
+            The number of calls.
+
+        Returns
+        -------
+        list
+            The `n` slowest calls as `CallRecord` tuples, the slowest first.
+        """
+        return sorted(self.calls, key=lambda call: call.duration, reverse=True)[:n]
+
+    def report(self, top=10):
+        """
+        Parameters
+        ----------
+        top : int, optional
+            The number of the slowest calls to report.
+
+        Returns
+        -------
+        dict
+            The structured report: the phase timings ('phases'), the number of
+            executed calls ('n_calls') and the slowest calls ('slowest').
+        """
+        return {
+            'phases': dict(self.phases),
+            'n_calls': len(self.calls),
+            'slowest': [call._asdict() for call in self.slowest(top)],
+        }
+
+    def format(self, top=10):
+        """
+        Parameters
+        ----------
+        top : int, optional
+            The number of the slowest calls to report.
+
+        Returns
+        -------
+        str
+            A human-readable report.
+        """
+        lines = ["Phase timings, s:"]
+        for name, duration in sorted(self.phases.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"  {name:<12} {duration:.4f}")
+        lines.append(f"The slowest calls out of {len(self.calls)}, s:")
+        for call in self.slowest(top):
+            size = '-' if call.size is None else f"{call.size} B"
+            lines.append(f"  {call.duration:.4f}  {call.method} ({size})")
+        return '\n'.join(lines)
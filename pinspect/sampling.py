@@ -0,0 +1,91 @@
+"""
+Sampling of the container elements to inspect.
+"""
+
+import itertools
+import random
+
+SAMPLING_MODES = ('first', 'random', 'types')
+
+
+class ContainerSampler:
+    def __init__(self, mode='first', k=1, seed=None, max_dict_entries=None, max_scan=10000):
+        """
+        Chooses the elements of lists, tuples, sets and dicts that `GraphBuilder` inspects.
+
+        The default sampler inspects the first element of a sequence and all dict entries.
+
+        Parameters
+        ----------
+        mode : {'first', 'random', 'types'}, optional
+            How to choose the elements:
+              * 'first' - the first `k` elements;
+              * 'random' - `k` random elements;
+              * 'types' - the first element of each distinct type, up to `k` types.
+            Default is 'first'.
+        k : int, optional
+            The max number of elements to sample from a list, tuple or set.
+            Default is 1.
+        seed : int, optional
+            The random seed of the 'random' mode.
+            Default is None.
+        max_dict_entries : int, optional
+            The max number of dict entries to sample, chosen by the `mode`.
+            Default is None (all entries).
+        max_scan : int, optional
+            The max number of elements to scan in the 'types' mode.
+            Default is 10000.
+        """
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"Invalid mode='{mode}'. Choose one of {SAMPLING_MODES}")
+        self.mode = mode
+        self.k = k
+        self.seed = seed
+        self.max_dict_entries = max_dict_entries
+        self.max_scan = max_scan
+        self._rng = random.Random(seed)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(mode={self.mode!r}, k={self.k}, seed={self.seed}, " \
+               f"max_dict_entries={self.max_dict_entries}, max_scan={self.max_scan})"
+
+    def sample(self, container):
+        """
+        Parameters
+        ----------
+        container : list or tuple or set or dict
+            A container to sample from.
+
+        Returns
+        -------
+        iterable
+            Pairs of the element index (the position in the iteration order for sets)
+            or the dict key, and the element, in the iteration order.
+        """
+        if isinstance(container, dict):
+            k = self.max_dict_entries
+            items = iter(container.items())
+        else:
+            k = self.k
+            items = enumerate(container)
+        if k is None or k >= len(container):
+            return items
+        if k <= 0:
+            return iter(())
+        if self.mode == 'first':
+            return itertools.islice(items, k)
+        if self.mode == 'random':
+            if isinstance(container, (list, tuple)):
+                return ((index, container[index]) for index in sorted(self._rng.sample(range(len(container)), k)))
+            positions = set(self._rng.sample(range(len(container)), k))
+            items = itertools.islice(items, max(positions) + 1)
+            return (item for position, item in enumerate(items) if position in positions)
+        sampled = []
+        types = set()
+        for key, value in itertools.islice(items, self.max_scan):
+            if type(value) not in types:
+                types.add(type(value))
+                sampled.append((key, value))
+                if len(sampled) == k:
+                    break
+        return sampled
@@ -0,0 +1,202 @@
+"""
+Sharing of the class-level inspection results across many root objects.
+"""
+
+import collections
+
+from pinspect.utils import AttributePlan
+
+# A recorded node: its `label` and `color`, the `obj_class` of the node, if it's an
+# instance of a tried class, and its out-`edges` as (edge label, RecordedNode) pairs.
+# A node, reached by several edges, is the same RecordedNode.
+RecordedNode = collections.namedtuple('RecordedNode', ['label', 'color', 'obj_class', 'edges'])
+
+# The recorded result of a method call: the `edges` from the instance to the result
+# (several, if the result is a sequence) and the `level`, at which the instance has been
+# inspected, if the result subgraph has been cut by `max_depth`, or None, if it's complete.
+CallRecord = collections.namedtuple('CallRecord', ['edges', 'level'])
+
+
+class InspectionSession:
+    def __init__(self):
+        """
+        Shares the class-level results of the inspection across many `GraphBuilder`s,
+        e.g. of the files, opened with the same IO class.
+
+        A builder, created with the session, records the method results of each
+        class it has inspected: the subgraphs below the method calls of the first
+        inspected instance. The next builders with the same settings still access
+        the attributes of each instance, which differ from one instance to another,
+        but replay the recorded results of the already executed methods instead of
+        executing them again, so that the total cost of the calls scales with the
+        number of distinct classes rather than with the number of inspected objects.
+
+        The replayed nodes are `RecordedObject` stand-ins: they have the labels
+        of the recorded objects, but not their titles. Only the results of
+        complete traversals, not stopped by a budget, are recorded. A result,
+        cut by `max_depth`, is replayed only at the same or a deeper level; at
+        a shallower level, the method is executed again, and its result is
+        recorded anew.
+
+        Examples
+        --------
+        >>> session = InspectionSession()
+        >>> for path in paths:
+        ...     find(BlackrockIO(path), key='epoch', session=session)
+
+        Attributes
+        ----------
+        exceptions : dict
+            The exception class name, raised by each method, `{'Class.method()': 'ValueError'}`.
+        return_types : dict
+            The class name of the result of each method, `{'Class.method()': 'Epoch'}`.
+        n_replayed_calls : int
+            The number of method calls, replayed instead of being executed.
+        """
+        self.exceptions = {}
+        self.return_types = {}
+        self.n_replayed_calls = 0
+        self._attribute_plans = {}
+        self._records = {}
+
+    @staticmethod
+    def settings(builder):
+        """
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder.
+
+        Returns
+        -------
+        tuple
+            The `builder` settings that affect the inspection of a class. The
+            builders with the same settings share the recorded method results.
+        """
+        ignore = builder.ignore_attribute
+        return (
+            builder.module,
+            ignore.ignore.pattern,
+            ignore.obj_class,
+            builder.max_depth,
+            builder.strategy,
+            builder.max_calls,
+            repr(builder.sampler),
+            builder.static_settings(),
+        )
+
+    def attribute_plan(self, builder, obj_class):
+        """
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder.
+        obj_class : type
+            An object class.
+
+        Returns
+        -------
+        AttributePlan
+            The attributes of `obj_class` instances to inspect, shared by the builders
+            with the same settings.
+        """
+        plans = self._attribute_plans.setdefault(self.settings(builder), {})
+        plan = plans.get(obj_class)
+        if plan is None:
+            plan = AttributePlan(obj_class, ignore_attribute=builder.ignore_attribute)
+            plans[obj_class] = plan
+        return plan
+
+    def recorded(self, builder, obj_class, level=0):
+        """
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder.
+        obj_class : type
+            An object class.
+        level : int, optional
+            The level of the `obj_class` instance to replay the method results at.
+            Default is 0.
+
+        Returns
+        -------
+        dict
+            The recorded edges from an `obj_class` instance to the result of each method
+            as (edge label, `RecordedNode`) pairs, `{'method': (('method()', node),)}`,
+            if the method has been executed with the `builder` settings, and its result
+            subgraph is complete or has been recorded at the `level` or above.
+        """
+        records = self._records.get(self.settings(builder), {}).get(obj_class, {})
+        return {method: record.edges for method, record in records.items()
+                if record.level is None or level >= record.level}
+
+    def record(self, builder):
+        """
+        Records the method results of the classes, inspected by the `builder`.
+
+        Parameters
+        ----------
+        builder : GraphBuilder
+            A graph builder, which has traversed the object.
+        """
+        if builder.stop_reason is not None:
+            # the subgraphs may be incomplete
+            return
+        records = self._records.setdefault(self.settings(builder), {})
+        graph = builder.graph
+        # the class of the nodes with a label of a tried class; ambiguous names are not resolved
+        class_names = collections.Counter(obj_class.__name__ for obj_class in builder.tried_classes)
+        class_by_label = {obj_class.__name__: obj_class for obj_class in builder.tried_classes
+                          if class_names[obj_class.__name__] == 1}
+        recorded_nodes = {}
+
+        def record_node(node):
+            recorded = recorded_nodes.get(node)
+            if recorded is None:
+                attr = graph.nodes[node]
+                edges = tuple((edge_attr['label'], record_node(child)) for child, edge_attr in graph.succ[node].items())
+                recorded = recorded_nodes[node] = RecordedNode(attr['label'], attr.get('color'),
+                                                               class_by_label.get(attr['label']), edges)
+            return recorded
+
+        def is_truncated(nodes):
+            # whether the subgraphs of the nodes have been cut by `max_depth`
+            stack = list(nodes)
+            visited = set(stack)
+            while len(stack) > 0:
+                node = stack.pop()
+                if node in builder.truncated_nodes:
+                    return True
+                for child in graph.succ[node]:
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append(child)
+            return False
+
+        for obj_class, (node, level) in builder.inspected_classes.items():
+            if node not in graph:
+                continue
+            # the results of a method, which returns a sequence, are attached to the instance as 'method()[i]'
+            results = collections.defaultdict(list)
+            for child, edge_attr in graph.succ[node].items():
+                method, call, _ = edge_attr['label'].partition('()')
+                if call:
+                    results[method].append((edge_attr['label'], child))
+            class_records = records.setdefault(obj_class, {})
+            for method, edges in results.items():
+                method_level = level if is_truncated(child for _, child in edges) else None
+                record = class_records.get(method)
+                if record is not None and (record.level is None or
+                                           method_level is not None and method_level >= record.level):
+                    # the recorded result is at least as deep
+                    continue
+                edges = tuple((edge_label, record_node(child)) for edge_label, child in edges)
+                class_records[method] = CallRecord(edges, method_level)
+                for edge_label, child in edges:
+                    if edge_label == f"{method}()":
+                        full_name = f"{obj_class.__name__}.{edge_label}"
+                        if child.color == 'red':
+                            self.exceptions[full_name] = child.label
+                        else:
+                            self.return_types[full_name] = child.label
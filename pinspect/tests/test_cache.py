@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+
+import pinspect
+from pinspect import GraphCache, to_string
+from pinspect.tests.test_traverse import MagicWorld, Wizard
+
+
+class TestGraphCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = GraphCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def find(self, obj, key, cache=True, **kwargs):
+        graph = pinspect.find(obj, key=key, verbose=False, visualize=False, cache=self.cache if cache else None,
+                              **kwargs)
+        if len(graph) == 0:
+            return []
+        return sorted(to_string(graph, source=id(obj), prefix=obj.__class__.__name__))
+
+    def test_load(self):
+        matches = self.find(MagicWorld(), key='spell')
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 1)
+        world = MagicWorld()
+        self.assertEqual(self.find(world, key='spell'), matches)
+        # the methods have not been executed
+        self.assertEqual(world.wizards[0].points, 10)
+        self.assertEqual(self.find(world, key='error'), ["MagicWorld.wizards[0].die() -> 'ValueError'"])
+
+    def test_settings(self):
+        world = MagicWorld()
+        # the best-first order and the budget cut-offs depend on the key
+        self.find(world, key='die', strategy='best', max_nodes=3)
+        self.assertEqual(self.find(world, key='spell', strategy='best', max_nodes=3),
+                         self.find(world, key='spell', cache=False, strategy='best', max_nodes=3))
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 2)
+        pinspect.find(world, key='spell', verbose=False, visualize=False, cache=self.cache, memory_bounded=True)
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 3)
+        # the time budget is nondeterministic
+        self.find(world, key='spell', max_time=0)
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 3)
+
+    def test_invalidate(self):
+        self.find(MagicWorld(), key='spell')
+        self.find(Wizard("Harry"), key='spell')
+        self.cache.invalidate(Wizard)
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 1)
+        self.cache.invalidate()
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 0)
+
+    def test_evict(self):
+        self.cache.max_size = 1
+        self.find(MagicWorld(), key='spell')
+        self.assertEqual(len(list(self.cache.directory.iterdir())), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
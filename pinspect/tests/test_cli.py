@@ -0,0 +1,50 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pinspect.cli import main, load_target, safe_name, unique_names
+from pinspect.tests.test_traverse import MagicWorld
+
+
+class TestCli(unittest.TestCase):
+
+    def test_load_target(self):
+        self.assertIsInstance(load_target('pinspect.tests.test_traverse:MagicWorld()'), MagicWorld)
+        self.assertEqual(load_target('collections:OrderedDict(a=1)'), dict(a=1))
+        self.assertRaises(ValueError, load_target, 'pinspect.tests.test_traverse')
+
+    def test_unique_names(self):
+        names = unique_names(['die|error', 'spell', 'die_error', 'Spell', 'spell'])
+        self.assertEqual(len(names), 4)
+        self.assertEqual(len(set(name.lower() for name in names.values())), 4)
+        self.assertTrue(names['die|error'].startswith('die_error-'))
+        self.assertEqual(unique_names(['die|error', 'spell']), {'die|error': 'die_error', 'spell': 'spell'})
+
+    def test_main(self):
+        targets = ['pinspect.tests.test_traverse:MagicWorld()', 'pinspect.tests.test_traverse:Wizard("Harry")',
+                   'pinspect.tests.test_traverse:Dragon()']
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs), tempfile.TemporaryDirectory() as output:
+                exit_code = main([*targets, '-k', 'spell', '-k', 'die|error', '-k', 'die_error', '-o', output,
+                                  '-j', str(jobs), '--graph-format', 'graphml'])
+                self.assertEqual(exit_code, 1)
+                with open(Path(output) / 'summary.json') as f:
+                    summaries = json.load(f)
+                self.assertEqual([summary['target'] for summary in summaries], targets)
+                world, wizard, dragon = summaries
+                self.assertEqual(world['matches'], {'spell': 2, 'die|error': 1, 'die_error': 0})
+                self.assertEqual(wizard['matches'], {'spell': 2, 'die|error': 1, 'die_error': 0})
+                self.assertIn('Dragon', dragon['error'])
+                world_dir = Path(world['directory'])
+                self.assertEqual(world_dir.name, safe_name(targets[0]))
+                matches = (world_dir / 'spell.txt').read_text().splitlines()
+                self.assertIn("MagicWorld.wizards[0].cast_spell() -> 'Spell'", matches)
+                key_names = unique_names(['die|error', 'die_error'])
+                self.assertEqual(len((world_dir / f"{key_names['die|error']}.txt").read_text().splitlines()), 1)
+                self.assertEqual((world_dir / f"{key_names['die_error']}.txt").read_text(), '')
+                self.assertTrue((world_dir / f"{key_names['die|error']}.graphml").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+
+import pinspect
+from pinspect import GraphCache, to_string
+from pinspect.compact import CompactDiGraph
+from pinspect.tests.test_traverse import MagicWorld, make_tree
+from pinspect.traverse import GraphBuilder, STRATEGIES
+
+
+def edge_labels(graph):
+    labels = graph.nodes.data('label')
+    labels = dict(labels)
+    return sorted((labels[u], label, labels[v]) for u, v, label in graph.edges.data('label'))
+
+
+class TestCompactDiGraph(unittest.TestCase):
+
+    def test_random_edges(self):
+        # compare against the reference implementation with `nx.has_path`
+        objects = [object() for _ in range(30)]
+        for order_gap in (CompactDiGraph.ORDER_GAP, 2):
+            with self.subTest(order_gap=order_gap):
+                graph = CompactDiGraph()
+                graph.ORDER_GAP = order_gap
+                nodes = [graph.add_node(obj, level=0) for obj in objects]
+                rng = random.Random(0)
+                reference = nx.DiGraph()
+                reference.add_nodes_from(nodes)
+                for _ in range(300):
+                    u, v = rng.sample(range(len(objects)), k=2)
+                    expected = not nx.has_path(reference, v, u)
+                    if expected:
+                        reference.add_edge(u, v)
+                    self.assertEqual(graph.add_edge(u, objects[v], label='edge'), expected)
+                self.assertEqual(set(graph.edges), set(reference.edges))
+                self.assertEqual(set(graph.pred[5]), set(reference.pred[5]))
+                self.assertTrue(nx.is_directed_acyclic_graph(graph.to_networkx()))
+
+    def test_remove_node(self):
+        graph = CompactDiGraph()
+        root, child = object(), []
+        graph.add_node(root)
+        graph.add_edge(0, child, label='child')
+        graph.remove_node(graph.node_id(child))
+        self.assertEqual(len(graph), 1)
+        self.assertEqual(graph.number_of_edges(), 0)
+        self.assertEqual(list(graph.succ[0]), [])
+        self.assertNotIn(1, graph)
+        # the object of a rendered node is released; adding it again gives a new node
+        graph.add_edge(0, child, label='child')
+        node = graph.node_id(child)
+        graph.node_title(node)
+        graph.remove_node(node)
+        node_new = graph.add_node(child)
+        self.assertIn(node_new, graph)
+        self.assertNotEqual(node_new, node)
+        self.assertEqual(graph.node_id(child), node_new)
+
+
+class TestCompactBackend(unittest.TestCase):
+
+    def test_same_graph(self):
+        for strategy in STRATEGIES:
+            for memory_bounded in (False, True):
+                with self.subTest(strategy=strategy, memory_bounded=memory_bounded):
+                    world = MagicWorld()
+                    builder = GraphBuilder(world, key='spell', strategy=strategy, memory_bounded=memory_bounded)
+                    builder.traverse(world)
+                    builder_compact = GraphBuilder(world, key='spell', strategy=strategy,
+                                                   memory_bounded=memory_bounded, backend='compact')
+                    builder_compact.traverse(world)
+                    self.assertIsInstance(builder_compact.graph, CompactDiGraph)
+                    self.assertEqual(edge_labels(builder_compact.graph), edge_labels(builder.graph))
+                    graph, graph_compact = builder.strip(), builder_compact.strip()
+                    self.assertIsInstance(graph_compact, nx.DiGraph)
+                    self.assertEqual(sorted(to_string(graph_compact, source=0, prefix='MagicWorld')),
+                                     sorted(to_string(graph, source=builder.graph.node_id(world),
+                                                      prefix='MagicWorld')))
+
+    def test_tree(self):
+        root = make_tree(depth=4, width=3)
+        builder = GraphBuilder(root, key='', max_depth=100, backend='compact')
+        builder.traverse(root)
+        self.assertEqual(len(builder.graph), (3 ** 5 - 1) // 2)
+        graph = builder.graph.to_networkx()
+        self.assertTrue(nx.is_tree(graph))
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GraphCache(directory)
+            world = MagicWorld()
+            graph = pinspect.find(world, key='spell', verbose=False, visualize=False, cache=cache,
+                                  backend='compact')
+            graph_cached = pinspect.find(world, key='spell', verbose=False, visualize=False, cache=cache,
+                                         backend='compact')
+            self.assertEqual(edge_labels(graph_cached), edge_labels(graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import collections
+import unittest
+
+from pinspect import Inspector, to_pyvis, to_string
+from pinspect.diff import fingerprint
+from pinspect.traverse import GraphBuilder
+
+CALLS = collections.Counter()
+
+
+class Book:
+    def __init__(self, title):
+        self.title = title
+
+
+class Catalog:
+    pass
+
+
+class Shelf:
+    def __init__(self):
+        self.books = []
+
+    def count_books(self):
+        CALLS['count_books'] += 1
+        return len(self.books)
+
+    def first_book(self):
+        CALLS['first_book'] += 1
+        if len(self.books) == 0:
+            return None
+        return self.books[0]
+
+
+class Archive:
+    def __init__(self):
+        self.shelf = Shelf()
+        self.city = 'Alexandria'
+
+    def catalog(self):
+        CALLS['catalog'] += 1
+        return Catalog()
+
+
+class TestDiff(unittest.TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+        self.archive = Archive()
+        self.builder = GraphBuilder(self.archive, key='', incremental=True)
+        self.builder.traverse(self.archive)
+
+    def reinspect(self):
+        CALLS.clear()
+        builder = GraphBuilder(self.archive, key='', previous=self.builder)
+        builder.traverse(self.archive)
+        return builder
+
+    def test_fingerprint(self):
+        shelf = Shelf()
+        state = fingerprint(shelf)
+        self.assertEqual(fingerprint(shelf), state)
+        shelf.books.append(Book('Dune'))
+        self.assertNotEqual(fingerprint(shelf), state)
+        self.assertEqual(fingerprint(Book('Dune')), fingerprint(Book('Dune')))
+
+    def test_unchanged(self):
+        builder = self.reinspect()
+        self.assertEqual(CALLS, {})
+        self.assertEqual(builder.n_calls_reused, 3)
+        self.assertEqual(set(builder.graph.edges), set(self.builder.graph.edges))
+        diff = builder.diff()
+        self.assertEqual(len(diff), 0)
+        self.assertEqual(list(to_string(diff.graph, source=diff.source, prefix='Archive')), ["Archive -> 'Archive'"])
+
+    def test_changed(self):
+        self.archive.shelf.books.append(Book('Dune'))
+        self.archive.city = 'Pergamon'
+        builder = self.reinspect()
+        # both the archive and the shelf have changed
+        self.assertEqual(CALLS, dict(catalog=1, count_books=1, first_book=1))
+        diff = builder.diff()
+        self.assertEqual(diff.changed_nodes, ['Archive', 'Archive.shelf'])
+        # the first book is reached by 'books[0]' first
+        self.assertEqual(diff.added_nodes, ['Archive.shelf.books[0]'])
+        self.assertEqual(diff.removed_nodes, ['Archive.shelf.books'])
+        self.assertEqual(sorted(diff.changed_edges), [('Archive', 'city'), ('Archive.shelf', 'count_books()'),
+                                                      ('Archive.shelf', 'first_book()')])
+        matches = list(to_string(diff.graph, source=diff.source, prefix='Archive'))
+        self.assertEqual(sorted(matches), sorted([
+            "Archive -> 'Archive' (changed)",
+            "Archive.city -> 'str' (changed)",
+            "Archive.shelf -> 'Shelf' (changed)",
+            "Archive.shelf.books -> 'list of size 0' (removed)",
+            "Archive.shelf.books[0] -> 'Book' (added)",
+            "Archive.shelf.count_books() -> 'int' (changed)",
+            "Archive.shelf.first_book() -> 'Book' (changed)",
+        ]))
+        net = to_pyvis(diff.graph)
+        self.assertEqual(net.node_map[diff.source]['label'], 'Archive (changed)')
+
+        # the next traversal is compared with this one
+        self.builder = builder
+        builder = self.reinspect()
+        self.assertEqual(CALLS, {})
+        self.assertEqual(len(builder.diff()), 0)
+
+    def test_inspector(self):
+        inspector = Inspector(self.archive, incremental=True).build()
+        self.assertEqual(inspector.matches('book'), ["Archive.shelf.books -> 'list of size 0'",
+                                                     "Archive.shelf.count_books() -> 'int'",
+                                                     "Archive.shelf.first_book() -> 'NoneType'"])
+        CALLS.clear()
+        self.archive.shelf.books.append(Book('Dune'))
+        diff = inspector.refresh()
+        # the archive attributes have not been reassigned
+        self.assertEqual(CALLS, dict(count_books=1, first_book=1))
+        self.assertIn('Archive.shelf.books[0]', diff.added_nodes)
+        self.assertIn("Archive.shelf.first_book() -> 'Book'", inspector.matches('book'))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.builder.diff()
+        with self.assertRaises(ValueError):
+            GraphBuilder(self.archive, key='', incremental=True, memory_bounded=True)
+        with self.assertRaises(ValueError):
+            GraphBuilder(self.archive, key='', backend='compact', incremental=True)
+        with self.assertRaises(ValueError):
+            GraphBuilder(self.archive, key='', backend='compact', previous=self.builder)
+
+
+if __name__ == '__main__':
+    unittest.main()
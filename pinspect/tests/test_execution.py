@@ -0,0 +1,234 @@
+import asyncio
+import contextlib
+import functools
+import gc
+import io
+import os
+import signal
+import time
+import unittest
+import warnings
+
+import pinspect
+from pinspect import to_string, PoolExecutor, SandboxExecutor, AsyncExecutor, ContainerSampler
+from pinspect.tests.test_traverse import MagicWorld, Spell
+from pinspect.traverse import GraphBuilder
+
+
+class Sloth:
+    def sleep(self):
+        time.sleep(1)
+        return MagicWorld()
+
+    def wake_up(self):
+        return MagicWorld()
+
+
+class Gremlin:
+    def crash(self):
+        os.kill(os.getpid(), signal.SIGSEGV)
+
+    def hog(self):
+        return bytearray(2 ** 30)
+
+    def spin(self):
+        while True:
+            pass
+
+    def nap(self):
+        time.sleep(10)
+
+    def make_callback(self):
+        return lambda: None
+
+    def wake_up(self):
+        return MagicWorld()
+
+
+class Hedgehog:
+    def dig(self):
+        time.sleep(0.4)
+        return 'burrow'
+
+    def sniff(self):
+        time.sleep(0.4)
+        return 'worm'
+
+
+class Den:
+    def enter(self):
+        return Hedgehog()
+
+    def leave(self):
+        return 42
+
+
+class Owl:
+    async def fetch_world(self):
+        await asyncio.sleep(0.3)
+        return MagicWorld()
+
+    async def fetch_spell(self):
+        await asyncio.sleep(0.3)
+        return Spell()
+
+    async def hoot(self):
+        await asyncio.sleep(10)
+
+    async def letters(self):
+        for _ in range(3):
+            await asyncio.sleep(0)
+            yield Spell()
+
+    def perch(self):
+        return 'branch'
+
+
+class TestPoolExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.world = MagicWorld()
+
+    def assertSameMatches(self, executor):
+        graph = pinspect.find(self.world, key='spell', verbose=False, visualize=False)
+        world_pool = MagicWorld()
+        graph_pool = pinspect.find(world_pool, key='spell', verbose=False, visualize=False, executor=executor)
+        self.assertEqual(len(graph_pool), len(graph))
+        prefix = self.world.__class__.__name__
+        matches_pool = to_string(graph_pool, source=id(world_pool), prefix=prefix)
+        matches = to_string(graph, source=id(self.world), prefix=prefix)
+        self.assertEqual(sorted(matches_pool), sorted(matches))
+
+    def test_thread_pool(self):
+        self.assertSameMatches(PoolExecutor(max_workers=4))
+
+    def test_process_pool(self):
+        self.assertSameMatches(PoolExecutor(max_workers=2, kind='process'))
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires os.fork()")
+    def test_sandbox(self):
+        self.assertSameMatches(SandboxExecutor(max_workers=2))
+
+    def test_async(self):
+        self.assertSameMatches(AsyncExecutor())
+
+    def test_print_matches(self):
+        for executor in (PoolExecutor(max_workers=4), AsyncExecutor()):
+            with self.subTest(executor=executor.__class__.__name__):
+                stdout = io.StringIO()
+                with contextlib.redirect_stdout(stdout):
+                    for match in pinspect.iter_find(MagicWorld(), key='spell', executor=executor):
+                        print(match)
+                self.assertEqual(stdout.getvalue().splitlines(), list(pinspect.iter_find(self.world, key='spell')))
+
+    def test_timeout(self):
+        sloth = Sloth()
+        graph = pinspect.find(sloth, key='error|world', verbose=False, visualize=False,
+                              executor=PoolExecutor(timeout=0.1))
+        labels = {graph.nodes[v]['label']: label for u, v, label in graph.edges.data('label')}
+        self.assertEqual(labels['TimeoutError'], 'sleep()')
+        self.assertEqual(labels['MagicWorld'], 'wake_up()')
+        self.assertIn('timed out', graph.nodes[next(iter(graph.adj[id(sloth)]))]['title'])
+
+
+class TestAsyncExecutor(unittest.TestCase):
+
+    def test_coroutines(self):
+        owl = Owl()
+        builder = GraphBuilder(owl, key='', executor=AsyncExecutor(timeout=1, max_items=2),
+                               sampler=ContainerSampler(k=10))
+        start = time.monotonic()
+        builder.traverse(owl)
+        # the coroutines are awaited concurrently
+        self.assertLess(time.monotonic() - start, 2)
+        labels = sorted((label, builder.graph.nodes[v]['label']) for u, v, label in builder.graph.edges.data('label')
+                        if u == id(owl))
+        self.assertEqual(labels, [
+            ('fetch_spell()', 'Spell'),
+            ('fetch_world()', 'MagicWorld'),
+            ('hoot()', 'TimeoutError'),
+            ('letters()[0]', 'Spell'),
+            ('letters()[1]', 'Spell'),
+            ('perch()', 'str'),
+        ])
+
+    def test_max_concurrency(self):
+        owl = Owl()
+        builder = GraphBuilder(owl, key='', ignore_key='hoot', executor=AsyncExecutor(max_concurrency=1))
+        start = time.monotonic()
+        builder.traverse(owl)
+        self.assertGreaterEqual(time.monotonic() - start, 0.6)
+
+    def test_serial_executor(self):
+        owl = Owl()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            builder = GraphBuilder(owl, key='')
+            builder.traverse(owl)
+            gc.collect()
+        self.assertEqual([str(warning.message) for warning in caught if warning.category is RuntimeWarning], [])
+        labels = {label: builder.graph.nodes[v]['label'] for u, v, label in builder.graph.edges.data('label')}
+        self.assertEqual(labels['fetch_world()'], 'coroutine')
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), "requires os.fork()")
+class TestSandboxExecutor(unittest.TestCase):
+
+    def test_misbehaving(self):
+        # POSIX only, as is os.fork()
+        import resource
+        with open('/proc/self/statm') as f:
+            address_space = int(f.read().split()[0]) * resource.getpagesize()
+        executor = SandboxExecutor(timeout=4, cpu_time=1, memory=address_space + 2 ** 28)
+        gremlin = Gremlin()
+        builder = GraphBuilder(gremlin, key='', executor=executor)
+        builder.traverse(gremlin)
+        labels = {label: builder.graph.nodes[v]['label'] for u, v, label in builder.graph.edges.data('label')}
+        self.assertEqual(labels, {
+            'crash()': 'ChildProcessError',
+            'hog()': 'MemoryError',
+            'spin()': 'ChildProcessError',
+            'nap()': 'TimeoutError',
+            'make_callback()': 'function',
+            'wake_up()': 'MagicWorld',
+        })
+        titles = {label: builder.graph.node_title(v) for u, v, label in builder.graph.edges.data('label')}
+        self.assertIn('SIGSEGV', titles['crash()'])
+        self.assertIn('SIGXCPU', titles['spin()'])
+        self.assertIn('lambda', titles['make_callback()'])
+
+    def test_finished_calls(self):
+        den = Den()
+        # the hedgehog methods take longer than the timeout in total, while 'leave()' has finished long ago
+        builder = GraphBuilder(den, key='', executor=SandboxExecutor(max_workers=2, timeout=0.6))
+        builder.traverse(den)
+        labels = {label: builder.graph.nodes[v]['label'] for u, v, label in builder.graph.edges.data('label')}
+        self.assertEqual(labels, {
+            'enter()': 'Hedgehog',
+            'leave()': 'int',
+            'dig()': 'str',
+            'sniff()': 'str',
+        })
+
+    def test_max_workers(self):
+        def finish(delay):
+            time.sleep(delay)
+            return time.monotonic()
+
+        executor = SandboxExecutor(max_workers=1)
+        first = executor.submit(functools.partial(finish, 0.3))
+        second = executor.submit(functools.partial(finish, 0))
+        # the second call starts only once the first one has finished
+        second_time = executor.result(second)
+        self.assertGreaterEqual(second_time, executor.result(first))
+
+        executor = SandboxExecutor(max_workers=1, timeout=0.3)
+        first = executor.submit(Gremlin().nap)
+        second = executor.submit(Den().leave)
+        self.assertEqual(executor.result(second), 42)
+        self.assertRaises(TimeoutError, executor.result, first)
+        executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
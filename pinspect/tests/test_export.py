@@ -0,0 +1,104 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import networkx as nx
+
+from pinspect import to_pyvis
+from pinspect.export import cluster, collapse_subtrees, write_dot, write_graphml, write_jsonl
+from pinspect.tests.test_traverse import MagicWorld, make_tree
+from pinspect.traverse import GraphBuilder
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.world = MagicWorld()
+        builder = GraphBuilder(self.world, key='spell')
+        builder.traverse(self.world)
+        builder.graph.render_titles()
+        self.graph = builder.graph
+
+    def test_cluster(self):
+        clustered = cluster(self.graph, by='class')
+        self.assertEqual(set(clustered), set(dict(self.graph.nodes.data('label')).values()))
+        self.assertEqual(sum(count for node, count in clustered.nodes.data('count')), len(self.graph))
+        self.assertEqual(sum(count for u, v, count in clustered.edges.data('count')),
+                         self.graph.number_of_edges())
+        self.assertEqual(clustered.nodes['Wizard']['count'], 2)
+        by_level = cluster(self.graph, by='level')
+        self.assertEqual(by_level.nodes[0]['count'], 1)
+        self.assertRaises(ValueError, cluster, self.graph, by='color')
+
+    def test_collapse_subtrees(self):
+        graph = nx.DiGraph()
+        graph.add_node('forest', label='Forest', level=0)
+        for branch in ('left', 'right'):
+            graph.add_node(branch, label='Branch', level=1)
+            graph.add_edge('forest', branch, label=branch, color=None)
+            for leaf in range(2):
+                graph.add_node(f"{branch}{leaf}", label='Leaf', level=2)
+                graph.add_edge(branch, f"{branch}{leaf}", label=f"leaves[{leaf}]", color=None)
+        collapsed = collapse_subtrees(graph, source='forest')
+        self.assertEqual(sorted(collapsed), ['forest', 'left', 'left0', 'left1'])
+        self.assertEqual(collapsed.nodes['left']['count'], 2)
+        self.assertEqual(sorted(collapsed.succ['forest']), ['left'])
+        # the leaves of a branch are the same too
+        collapsed = collapse_subtrees(graph, min_size=1)
+        self.assertEqual(sorted(collapsed), ['forest', 'left', 'left0'])
+        self.assertEqual(collapsed.nodes['left0']['count'], 2)
+        # a tree of distinct classes has nothing to collapse
+        root = make_tree(depth=2, width=3)
+        builder = GraphBuilder(root, key='', max_depth=100)
+        builder.traverse(root)
+        self.assertEqual(len(collapse_subtrees(builder.graph)), len(builder.graph))
+
+    def test_to_pyvis(self):
+        net = to_pyvis(cluster(self.graph), physics=False)
+        self.assertEqual(len(net.nodes), len(set(dict(self.graph.nodes.data('label')).values())))
+        self.assertIn('x2', net.node_map['Wizard']['label'])
+        self.assertFalse(net.options.physics.enabled)
+
+    def test_write_jsonl(self):
+        file = io.StringIO()
+        write_jsonl(self.graph, file)
+        records = [json.loads(line) for line in file.getvalue().splitlines()]
+        nodes = [record for record in records if 'node' in record]
+        edges = [record for record in records if 'source' in record]
+        self.assertEqual(len(nodes), len(self.graph))
+        self.assertEqual(len(edges), self.graph.number_of_edges())
+        self.assertEqual(nodes[0]['title'], self.graph.nodes[nodes[0]['node']]['title'])
+
+    def test_write_graphml(self):
+        file = io.BytesIO()
+        text = io.TextIOWrapper(file, encoding='utf-8')
+        write_graphml(self.graph, text)
+        file.seek(0)
+        graph = nx.read_graphml(file)
+        self.assertEqual(len(graph), len(self.graph))
+        self.assertEqual(graph.number_of_edges(), self.graph.number_of_edges())
+        node = id(self.world)
+        self.assertEqual(graph.nodes[str(node)]['label'], 'MagicWorld')
+        self.assertEqual(graph.nodes[str(node)]['title'], self.graph.nodes[node]['title'])
+
+    def test_write_file(self):
+        graph = nx.DiGraph()
+        graph.add_node('spell', label='Spell', level=0, title="Spell('Expelliarmus ✨', power='∞')")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'spell.graphml'
+            write_graphml(graph, path)
+            self.assertEqual(nx.read_graphml(path).nodes['spell']['title'], graph.nodes['spell']['title'])
+
+    def test_write_dot(self):
+        file = io.StringIO()
+        write_dot(self.graph, file)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(lines[0], "digraph pinspect {")
+        self.assertEqual(lines[-1], "}")
+        self.assertEqual(sum('->' in line for line in lines), self.graph.number_of_edges())
+
+
+if __name__ == '__main__':
+    unittest.main()
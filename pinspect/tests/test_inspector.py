@@ -0,0 +1,41 @@
+import unittest
+
+import pinspect
+from pinspect import Inspector, to_string
+from pinspect.inspector import tokenize
+from pinspect.tests.test_traverse import MagicWorld
+
+
+class TestInspector(unittest.TestCase):
+
+    def setUp(self):
+        self.world = MagicWorld()
+        self.inspector = Inspector(self.world).build()
+
+    def test_query(self):
+        for key in ('spell', 'spe.l', 'error'):
+            with self.subTest(key=key):
+                world = MagicWorld()
+                graph = pinspect.find(world, key=key, verbose=False, visualize=False)
+                matches = sorted(to_string(graph, source=id(world), prefix='MagicWorld'))
+                self.assertEqual(sorted(self.inspector.matches(key)), matches)
+
+    def test_boolean(self):
+        self.assertEqual(self.inspector.matches('spell', 'error'),
+                         self.inspector.matches('spell|error'))
+        self.assertEqual(self.inspector.matches('spell', 'cast', match='all'),
+                         ["MagicWorld.wizards[0].cast_spell() -> 'Spell'"])
+        self.assertEqual(self.inspector.matches('spell|error', exclude='spell'),
+                         ["MagicWorld.wizards[0].die() -> 'ValueError'"])
+        self.assertEqual(self.inspector.matches('dragon'), [])
+
+    def test_ignore_key(self):
+        with self.assertRaises(ValueError):
+            self.inspector.query('delete')
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("BlackrockIO.read_epoch()"), {'blackrockio', 'blackrock', 'io', 'read', 'epoch'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import time
+import unittest
+
+import pinspect
+from pinspect import Profiler, to_pyvis
+from pinspect.tests.test_traverse import MagicWorld
+
+
+class Turtle:
+    def crawl(self):
+        time.sleep(0.1)
+        return MagicWorld()
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_find(self):
+        profiler = Profiler()
+        graph = pinspect.find(Turtle(), key='world', verbose=False, visualize=False, profiler=profiler)
+        report = profiler.report(top=1)
+        self.assertEqual(report['n_calls'], 1)
+        slowest = report['slowest'][0]
+        self.assertEqual(slowest['method'], 'Turtle.crawl()')
+        self.assertGreaterEqual(slowest['duration'], 0.1)
+        for phase in ('traverse', 'execute', 'graph', 'strip'):
+            self.assertIn(phase, report['phases'])
+        self.assertGreaterEqual(report['phases']['traverse'], report['phases']['execute'])
+        edge_attr = next(attr for _, _, attr in graph.edges.data() if attr['label'] == 'crawl()')
+        self.assertEqual(edge_attr['duration'], slowest['duration'])
+        self.assertEqual(edge_attr['size'], slowest['size'])
+        net = to_pyvis(graph, hot_duration=0.1)
+        colors = {edge['title'].split()[0]: edge['color'] for edge in net.edges}
+        self.assertEqual(colors['crawl()'], 'orange')
+        self.assertIn('Turtle.crawl()', profiler.format())
@@ -0,0 +1,57 @@
+import unittest
+
+import pinspect
+from pinspect import ContainerSampler, to_string
+
+
+class Charm:
+    pass
+
+
+class Witch:
+    def brew_charm(self):
+        return Charm()
+
+
+class Library:
+    def __init__(self):
+        self.shelf = ['book', 1.0, Charm(), 'scroll']
+        self.catalog = {f"item{i}": Witch() for i in range(100)}
+
+
+class TestContainerSampler(unittest.TestCase):
+
+    def test_modes(self):
+        items = list(range(10)) + ['a', 'b', 2.0]
+        self.assertEqual(list(ContainerSampler().sample(items)), [(0, 0)])
+        self.assertEqual(list(ContainerSampler(k=3).sample(items)), [(0, 0), (1, 1), (2, 2)])
+        self.assertEqual(list(ContainerSampler(mode='types', k=5).sample(items)), [(0, 0), (10, 'a'), (12, 2.0)])
+        sampled = list(ContainerSampler(mode='random', k=4, seed=0).sample(items))
+        self.assertEqual(sampled, list(ContainerSampler(mode='random', k=4, seed=0).sample(items)))
+        self.assertEqual(len(sampled), 4)
+        for index, element in sampled:
+            self.assertEqual(items[index], element)
+        sampled_set = list(ContainerSampler(mode='random', k=2, seed=0).sample(set(items)))
+        self.assertEqual(len(sampled_set), 2)
+        data = dict(a=1, b=2, c=3)
+        self.assertEqual(list(ContainerSampler().sample(data)), list(data.items()))
+        self.assertEqual(list(ContainerSampler(max_dict_entries=2).sample(data)), [('a', 1), ('b', 2)])
+        self.assertRaises(ValueError, ContainerSampler, mode='last')
+
+    def test_find(self):
+        library = Library()
+        graph = pinspect.find(library, key='charm', verbose=False, visualize=False)
+        matches = list(to_string(graph, source=id(library), prefix='Library'))
+        self.assertEqual(matches, ["Library.catalog.['item0'].brew_charm() -> 'Charm'"])
+        sampler = ContainerSampler(mode='types', k=10, max_dict_entries=2)
+        graph = pinspect.find(library, key='charm', verbose=False, visualize=False, sampler=sampler)
+        matches = sorted(to_string(graph, source=id(library), prefix='Library'))
+        self.assertEqual(matches, ["Library.catalog.['item0'].brew_charm() -> 'Charm'",
+                                   "Library.shelf[2] -> 'Charm'"])
+        sampler = ContainerSampler(max_dict_entries=2)
+        graph = pinspect.find(library, key='witch', verbose=False, visualize=False, sampler=sampler)
+        self.assertEqual(sorted(label for _, _, label in graph.edges.data('label')),
+                         ["['item0']", "['item1']", 'catalog'])
+
+if __name__ == '__main__':
+    unittest.main()
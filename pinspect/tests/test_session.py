@@ -0,0 +1,168 @@
+import unittest
+
+from pinspect import InspectionSession, to_string
+from pinspect.traverse import GraphBuilder, STRATEGIES
+
+CALLS = []
+
+
+class Potion:
+    def __init__(self, color):
+        self.color = color
+
+
+class Cauldron:
+    def __init__(self, size):
+        self.size = size
+        self.ingredients = {'frog': Potion('green')}
+
+    def brew(self):
+        CALLS.append('brew')
+        return Potion('red')
+
+    def explode(self):
+        CALLS.append('explode')
+        raise RuntimeError("Boom")
+
+
+class Laboratory:
+    def __init__(self, name):
+        self.name = name
+        self.cauldron = Cauldron(size=len(name))
+
+    def open_cauldron(self):
+        CALLS.append('open_cauldron')
+        return Cauldron(size=1)
+
+
+class Shelf:
+    def __init__(self, items):
+        self.items = items
+
+    def count(self):
+        CALLS.append('count')
+        return len(self.items)
+
+
+class Recipe:
+    def __init__(self):
+        self.potion = Potion('blue')
+
+
+class Alchemist:
+    def __init__(self, recipe):
+        self.recipe = recipe
+
+
+class Apprentice:
+    def __init__(self, recipe):
+        self.recipe = recipe
+
+
+class Guild:
+    def __init__(self):
+        # the recipe is shared by the alchemist and the apprentice
+        recipe = Recipe()
+        self.alchemist = Alchemist(recipe)
+        self.apprentice = Apprentice(recipe)
+
+
+class Cellar:
+    def __init__(self):
+        self.cauldron = Cauldron(size=3)
+
+
+class Tower:
+    def __init__(self):
+        self.cellar = Cellar()
+
+
+class TestInspectionSession(unittest.TestCase):
+
+    def test_replay(self):
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                session = InspectionSession()
+                CALLS.clear()
+                builder = GraphBuilder(Laboratory('first'), key='potion|error', strategy=strategy, session=session)
+                builder.traverse(builder.obj)
+                self.assertEqual(sorted(CALLS), ['brew', 'explode', 'open_cauldron'])
+                CALLS.clear()
+                builder_replayed = GraphBuilder(Laboratory('second'), key='potion|error', strategy=strategy,
+                                                session=session)
+                builder_replayed.traverse(builder_replayed.obj)
+                self.assertEqual(CALLS, [])
+                self.assertEqual(session.n_replayed_calls, 3)
+                self.assertEqual(sorted(to_string(builder_replayed.strip(), source=builder_replayed._root_node)),
+                                 sorted(to_string(builder.strip(), source=builder._root_node)))
+                self.assertEqual(session.exceptions, {'Cauldron.explode()': 'RuntimeError'})
+                self.assertEqual(session.return_types, {'Cauldron.brew()': 'Potion',
+                                                        'Laboratory.open_cauldron()': 'Cauldron'})
+
+    def test_same_matches(self):
+        def matches(obj, session=None, **kwargs):
+            builder = GraphBuilder(obj, key='potion|color', session=session, **kwargs)
+            builder.traverse(obj)
+            return sorted(to_string(builder.strip(), source=builder._root_node))
+
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                session = InspectionSession()
+                guild = Guild()
+                matches(guild, session=session, strategy=strategy)
+                # the shared recipe is replayed once, below both parents
+                self.assertEqual(matches(guild, session=session, strategy=strategy),
+                                 matches(guild, strategy=strategy))
+                self.assertEqual(len(matches(guild, strategy=strategy)), 2)
+
+                # the cauldron subgraph is cut by max_depth in the tower
+                session = InspectionSession()
+                matches(Tower(), session=session, strategy=strategy, max_depth=4)
+                laboratory = Laboratory('first')
+                self.assertEqual(matches(laboratory, session=session, strategy=strategy, max_depth=4),
+                                 matches(laboratory, strategy=strategy, max_depth=4))
+                # the complete subgraph, recorded from the laboratory, is replayed in the tower
+                CALLS.clear()
+                replayed = matches(Tower(), session=session, strategy=strategy, max_depth=4)
+                self.assertEqual(CALLS, [])
+                self.assertEqual(replayed, matches(Tower(), strategy=strategy, max_depth=4))
+
+    def test_instances(self):
+        # the attributes of each instance are inspected; only the method results are replayed
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                session = InspectionSession()
+                builder = GraphBuilder(Shelf({'a': 1}), key='potion', strategy=strategy, session=session)
+                builder.traverse(builder.obj)
+                CALLS.clear()
+                shelf = Shelf({'b': Potion('green')})
+                builder_replayed = GraphBuilder(shelf, key='potion', strategy=strategy, session=session)
+                builder_replayed.traverse(shelf)
+                self.assertEqual(CALLS, [])
+                self.assertEqual(session.n_replayed_calls, 1)
+                builder = GraphBuilder(shelf, key='potion', strategy=strategy)
+                builder.traverse(shelf)
+                matches = sorted(to_string(builder.strip(), source=builder._root_node))
+                self.assertEqual(matches, [".items.['b'] -> 'Potion'"])
+                self.assertEqual(sorted(to_string(builder_replayed.strip(), source=builder_replayed._root_node)),
+                                 matches)
+
+    def test_settings(self):
+        session = InspectionSession()
+        builder = GraphBuilder(Laboratory('first'), key='potion', session=session)
+        builder.traverse(builder.obj)
+        CALLS.clear()
+        builder_other = GraphBuilder(Laboratory('second'), key='potion', ignore_key='explode', session=session)
+        builder_other.traverse(builder_other.obj)
+        # the other settings are not shared
+        self.assertEqual(sorted(CALLS), ['brew', 'open_cauldron'])
+        self.assertIsNot(builder_other.attribute_plan(Laboratory), builder.attribute_plan(Laboratory))
+        # an incomplete traversal is not recorded
+        session = InspectionSession()
+        builder = GraphBuilder(Laboratory('first'), key='potion', max_nodes=2, session=session)
+        builder.traverse(builder.obj)
+        self.assertEqual(session.recorded(builder, Laboratory), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,17 @@
+import contextlib
+import io
+import itertools
+import json
+import random
 import unittest
+
+import networkx as nx
+
 import pinspect
 from pinspect import to_string, to_pyvis
-
-from pinspect.utils import check_edge
+from pinspect.traverse import DiGraphAcyclic, GraphBuilder, STRATEGIES, match_subgraph
+from pinspect.utils import check_edge, short_title, TITLE_MAX_LENGTH, AttributePlan, IgnoreFunc, numpy_members, \
+    StaticInfo
 
 
 class Spell:
@@ -24,6 +33,51 @@ class Wizard:
         raise ValueError("A wizard never dies!")
 
 
+def make_tree(depth, width):
+    """
+    Creates a tree of objects, each of its own class.
+    """
+    counter = itertools.count()
+    root = type(f"Node{next(counter)}", (), {})()
+    leaves = [root]
+    for _ in range(depth):
+        children = []
+        for parent in leaves:
+            for child_id in range(width):
+                child = type(f"Node{next(counter)}", (), {})()
+                setattr(parent, f"child{child_id}", child)
+                children.append(child)
+        leaves = children
+    return root
+
+
+class Library:
+    def __init__(self):
+        self.calls = []
+
+    def lend(self, reader, days=14):
+        self.calls.append('lend')
+        return Spell()
+
+    def count(self) -> int:
+        self.calls.append('count')
+        return 3
+
+    def catalog(self):
+        """
+        Returns
+        -------
+        list
+            The books.
+        """
+        self.calls.append('catalog')
+        return [Spell()]
+
+    def spellbook(self) -> 'Spell':
+        self.calls.append('spellbook')
+        return Spell()
+
+
 class MagicWorld:
     def __init__(self):
         self.wizards = [Wizard("Harry"), Wizard("Voldemort")]
@@ -59,6 +113,289 @@ class TestTraverse(unittest.TestCase):
         self.assertEqual(check_edge(graph, edge_label='spell'), 2)
         self.assertEqual(check_edge(graph, edge_label='wizards'), 1)
 
+    def test_lazy_titles(self):
+        builder = GraphBuilder(self.world, key='spell')
+        builder.traverse(self.world)
+        self.assertFalse(any('title' in attr for attr in builder.graph.nodes.values()))
+        graph = builder.strip()
+        self.assertEqual(graph.nodes[id(self.world)]['title'], short_title(self.world))
+        builder.graph.release_objects()
+        node_not_rendered = next(node for node in builder.graph if node not in graph)
+        self.assertEqual(builder.graph.node_title(node_not_rendered),
+                         builder.graph.nodes[node_not_rendered]['label'])
+
+    def test_to_string_paths(self):
+        # a chain of diamonds has 2 ** depth paths
+        depth = 30
+        graph = nx.DiGraph()
+        for level in range(depth):
+            graph.add_edge(f"n{level}", f"a{level}", label='a')
+            graph.add_edge(f"n{level}", f"b{level}", label='b')
+            graph.add_edge(f"a{level}", f"n{level + 1}", label='x')
+            graph.add_edge(f"b{level}", f"n{level + 1}", label='x')
+        for node in graph:
+            graph.nodes[node]['label'] = node.upper()
+        paths = list(to_string(graph, source='n0', prefix='root', dedup_suffixes=True))
+        self.assertEqual(len(paths), depth + 1)
+        self.assertEqual(paths[0], f"root{'.a.x' * depth} -> 'N{depth}'")
+        self.assertEqual(paths[1], f"root{'.a.x' * (depth - 1)}.b.x -> 'N{depth}'")
+        self.assertEqual(paths[2], f"root{'.a.x' * (depth - 2)}.b.x -> same as root{'.a.x' * (depth - 1)}")
+        paths = list(to_string(graph, source='n0', prefix='root', max_paths=5))
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(paths[1], f"root{'.a.x' * (depth - 1)}.b.x -> 'N{depth}'")
+        # deeper than the recursion limit
+        chain = nx.path_graph(5000, create_using=nx.DiGraph)
+        nx.set_node_attributes(chain, 'leaf', name='label')
+        nx.set_edge_attributes(chain, 'next', name='label')
+        self.assertEqual(list(to_string(chain, source=0)), [f"{'.next' * 4999} -> 'leaf'"])
+
+    def test_to_string_shortest_first(self):
+        graph = pinspect.find(self.world, key='spell', verbose=False, visualize=False)
+        matches = list(to_string(graph, source=id(self.world), prefix='MagicWorld', shortest_first=True))
+        self.assertEqual(sorted(matches, key=lambda match: match.count('.')), matches)
+        self.assertEqual(sorted(matches),
+                         sorted(to_string(graph, source=id(self.world), prefix='MagicWorld')))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            pinspect.find(self.world, key='spell', visualize=False, max_paths=1)
+        self.assertEqual(stdout.getvalue().splitlines(),
+                         ["MagicWorld.wizards[0].cast_spell() -> 'Spell'", "... (more matches are not shown)"])
+
+    def test_short_title(self):
+        self.assertEqual(short_title(list(range(10 ** 5))), "[0, 1, 2, 3, 4, 5, ...]")
+        self.assertEqual(len(short_title('spell' * 10 ** 5)), TITLE_MAX_LENGTH)
+        self.assertEqual(len(short_title(bytearray(10 ** 6))), TITLE_MAX_LENGTH)
+
+    def test_strip(self):
+        builder = GraphBuilder(self.world, key='spell')
+        builder.traverse(self.world)
+        graph = builder.strip()
+        graph_view = builder.strip(view=True)
+        self.assertEqual(set(graph_view.edges), set(graph.edges))
+        self.assertEqual(set(graph_view.nodes), set(graph.nodes))
+        self.assertEqual(graph.nodes[id(self.world)]['color'], 'blue')
+        matches = sorted(to_string(graph, source=id(self.world), prefix='MagicWorld'))
+        paths = sorted(f"MagicWorld.{'.'.join(path[:-1])} -> '{path[-1]}'" for path in builder.match_paths())
+        self.assertEqual(paths, matches)
+        builder_none = GraphBuilder(self.world, key='nothing')
+        builder_none.traverse(self.world)
+        self.assertEqual(len(builder_none.strip()), 0)
+        self.assertEqual(list(builder_none.match_paths()), [])
+
+    def test_multiple_keys(self):
+        keys = ['spell', 'die|error', 'name', 'nothing']
+        graphs = pinspect.find(self.world, key=keys, verbose=False, visualize=False)
+        self.assertEqual(list(graphs), keys)
+        self.assertEqual(len(graphs['nothing']), 0)
+        for key in keys[:-1]:
+            with self.subTest(key=key):
+                graph = pinspect.find(self.world, key=key, verbose=False, visualize=False)
+                self.assertEqual(sorted(to_string(graphs[key], source=id(self.world))),
+                                 sorted(to_string(graph, source=id(self.world))))
+        builder = GraphBuilder(self.world, key=keys)
+        builder.traverse(self.world)
+        graphs = builder.strip_keys()
+        self.assertEqual(set(builder.strip().edges), set().union(*(graph.edges for graph in graphs.values())))
+        graph_spell = match_subgraph(builder.graph, *builder.matched(key='spell'), root=id(self.world))
+        self.assertEqual(set(graphs['spell'].edges), set(graph_spell.edges))
+        self.assertEqual(dict(graphs['spell'].nodes.data('color')), dict(graph_spell.nodes.data('color')))
+        with self.assertRaisesRegex(ValueError, "key='delete_spell'"):
+            GraphBuilder(self.world, key=['spell', 'delete_spell'])
+
+    def test_trace(self):
+        stream = io.StringIO()
+        with pinspect.TraceWriter(stream) as trace:
+            pinspect.find(self.world, key='spell', verbose=False, visualize=False, trace=trace)
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        visited = {event['label'] for event in events if event['event'] == 'visit'}
+        self.assertTrue({'Wizard', 'Spell', 'ValueError'}.issubset(visited))
+        calls = {event['method'] for event in events if event['event'] == 'call'}
+        self.assertIn('Wizard.cast_spell()', calls)
+        errors = [event for event in events if event['event'] == 'error']
+        self.assertEqual([(error['method'], error['error']) for error in errors], [('Wizard.die()', 'ValueError')])
+
+    def test_static(self):
+        library = Library()
+        builder = GraphBuilder(library, key='spell')
+        builder.traverse(library)
+        expected = sorted(to_string(builder.strip(), source=id(library)))
+        self.assertEqual(builder.n_calls, 4)
+        for static, n_calls in zip(('signature', 'prune'), (3, 2)):
+            with self.subTest(static=static):
+                library = Library()
+                builder = GraphBuilder(library, key='spell', static=static)
+                builder.traverse(library)
+                self.assertEqual(builder.n_calls, n_calls)
+                self.assertEqual(sorted(to_string(builder.strip(), source=id(library))), expected)
+                errors = [label for node, label in builder.graph.nodes.data('label')
+                          if builder.graph.nodes[node]['color'] == 'red']
+                self.assertEqual(errors, ['TypeError'])
+        # the result of count() is an int leaf; catalog() returns a container
+        self.assertEqual(library.calls, ['catalog', 'spellbook'])
+        self.assertEqual(builder.n_calls_avoided, 2)
+        # the method name matches the key
+        library = Library()
+        GraphBuilder(library, key='count', static='prune').traverse(library)
+        self.assertIn('count', library.calls)
+        with self.assertRaises(ValueError):
+            GraphBuilder(library, key='spell', static='types')
+
+    def test_debug_log(self):
+        with self.assertLogs('pinspect', level='DEBUG') as logs:
+            pinspect.find(self.world, key='spell', verbose=False, visualize=False)
+        self.assertTrue(any('Inspecting MagicWorld' in line for line in logs.output))
+        self.assertTrue(any('Executing Wizard.cast_spell()' in line for line in logs.output))
+
+    def test_iter_find(self):
+        matches = list(pinspect.iter_find(self.world, key='spell'))
+        expected_matches = [
+            "MagicWorld.wizards[0].cast_spell() -> 'Spell'",
+            "MagicWorld.wizards[0].hidden_spells[0] -> 'Spell'",
+        ]
+        self.assertEqual(matches, expected_matches)
+        matches = list(pinspect.iter_find(MagicWorld(), key='spell', max_matches=1))
+        self.assertEqual(matches, expected_matches[:1])
+
+
+class TestDiGraphAcyclic(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = [object() for _ in range(30)]
+        self.graph = DiGraphAcyclic()
+        for obj in self.objects:
+            self.graph.add_node(obj, level=0)
+
+    def test_self_loop(self):
+        obj = self.objects[0]
+        self.assertFalse(self.graph.add_edge(id(obj), obj, label='self'))
+
+    def test_cycle(self):
+        a, b, c = self.objects[:3]
+        self.assertTrue(self.graph.add_edge(id(c), b, label='b'))
+        self.assertTrue(self.graph.add_edge(id(b), a, label='a'))
+        self.assertFalse(self.graph.add_edge(id(a), c, label='c'))
+        self.assertEqual(self.graph.number_of_edges(), 2)
+
+    def test_random_edges(self):
+        # compare against the reference implementation with `nx.has_path`
+        for order_gap in (DiGraphAcyclic.ORDER_GAP, 2):
+            with self.subTest(order_gap=order_gap):
+                self.graph = DiGraphAcyclic()
+                self.graph.ORDER_GAP = order_gap
+                for obj in self.objects:
+                    self.graph.add_node(obj, level=0)
+                rng = random.Random(0)
+                reference = nx.DiGraph()
+                reference.add_nodes_from(id(obj) for obj in self.objects)
+                for _ in range(300):
+                    u, v = rng.sample(self.objects, k=2)
+                    expected = not nx.has_path(reference, id(v), id(u))
+                    if expected:
+                        reference.add_edge(id(u), id(v))
+                    self.assertEqual(self.graph.add_edge(id(u), v, label='edge'), expected)
+                self.assertTrue(nx.is_directed_acyclic_graph(self.graph))
+                self.assertEqual(set(self.graph.edges), set(reference.edges))
+
+
+class TestStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.world = MagicWorld()
+
+    def test_strategies(self):
+        graph = pinspect.find(self.world, key='spell', verbose=False, visualize=False)
+        for strategy in ('bfs', 'best'):
+            with self.subTest(strategy=strategy):
+                world = MagicWorld()
+                graph_strategy = pinspect.find(world, key='spell', verbose=False, visualize=False, strategy=strategy)
+                matches = to_string(graph, source=id(self.world), prefix='MagicWorld')
+                matches_strategy = to_string(graph_strategy, source=id(world), prefix='MagicWorld')
+                self.assertEqual(sorted(matches_strategy), sorted(matches))
+
+    def test_deep(self):
+        root = make_tree(depth=3000, width=1)
+        builder = GraphBuilder(root, key='', max_depth=10 ** 4)
+        builder.traverse(root)
+        self.assertEqual(len(builder.graph), 3001)
+
+    def test_budgets(self):
+        root = make_tree(depth=3, width=5)
+        builder = GraphBuilder(root, key='', max_depth=10 ** 4, max_nodes=10)
+        builder.traverse(root)
+        self.assertEqual(len(builder.graph), 10)
+        self.assertEqual(builder.stop_reason, 'max_nodes')
+        builder = GraphBuilder(self.world, key='', max_calls=1)
+        builder.traverse(self.world)
+        self.assertEqual(builder.n_calls, 1)
+        self.assertIsNone(builder.stop_reason)
+
+    def test_best_first(self):
+        root = make_tree(depth=2, width=5)
+        root.spells = make_tree(depth=1, width=1)
+        builder = GraphBuilder(root, key='spells', strategy='best', max_nodes=2)
+        builder.traverse(root)
+        self.assertEqual(builder.graph.nodes[id(root.spells)]['level'], 1)
+
+    def test_memory_bounded(self):
+        graph = pinspect.find(self.world, key='spell', verbose=False, visualize=False)
+        matches = sorted(to_string(graph, source=id(self.world), prefix='MagicWorld'))
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                world = MagicWorld()
+                builder = GraphBuilder(world, key='spell', strategy=strategy, memory_bounded=True)
+                builder.traverse(world)
+                # only the root object is kept alive
+                self.assertEqual(list(builder.graph._pinned_nodes), [builder.graph.node_id(world)])
+                self.assertEqual(len(builder.obj_saved), 0)
+                graph_bounded = builder.strip()
+                self.assertEqual(builder.graph.node_id(world), 0)
+                matches_bounded = to_string(graph_bounded, source=0, prefix='MagicWorld')
+                self.assertEqual(sorted(matches_bounded), matches)
+
+
+class TestAttributePlan(unittest.TestCase):
+
+    def test_names(self):
+        wizard = Wizard("Harry")
+        wizard.__dict__['delete_me'] = None
+        ignore = IgnoreFunc(key='delete', obj_class=[Spell])
+        plan = AttributePlan(Wizard, ignore_attribute=ignore)
+        expected = [name for name in dir(wizard) if not name.startswith('__') and not ignore(wizard, name)]
+        self.assertEqual(plan.names(wizard), expected)
+        self.assertTrue(plan.is_method(wizard, 'cast_spell'))
+        self.assertFalse(plan.is_method(wizard, 'name'))
+        self.assertEqual(plan.full_name('die'), 'Wizard.die')
+
+    def test_static_info(self):
+        plan = AttributePlan(Library, ignore_attribute=IgnoreFunc(key='delete'))
+        self.assertEqual(plan.static_info('lend'), StaticInfo(required=['reader'], return_class=None))
+        self.assertEqual(plan.static_info('count'), StaticInfo(required=[], return_class=int))
+        self.assertIs(plan.static_info('catalog').return_class, list)
+        self.assertIs(plan.static_info('spellbook').return_class, Spell)
+        self.assertIs(AttributePlan(Wizard, ignore_attribute=IgnoreFunc(key='delete')).static_info(
+            'die').return_class, None)
+
+    def test_ignore_subclass(self):
+        class Charm(Spell):
+            def cast(self):
+                pass
+
+        ignore = IgnoreFunc(key='delete', obj_class=[Spell])
+        self.assertEqual(ignore.ignored_members(Charm), ignore.ignored_members(Spell))
+        self.assertFalse(AttributePlan(Charm, ignore_attribute=ignore).is_inspected('__class__'))
+        self.assertEqual(AttributePlan(Charm, ignore_attribute=ignore).names(Charm()), ['cast'])
+
+    def test_ignore_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        ignore = IgnoreFunc(key='delete')
+        self.assertTrue(ignore(np.zeros(3), 'sum'))
+        self.assertFalse(ignore(Spell(), 'sum'))
+        # computed once per process
+        self.assertIs(ignore.ignored_functions[np.ndarray], numpy_members(np))
+
 
 if __name__ == '__main__':
     unittest.main()
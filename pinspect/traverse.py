@@ -3,32 +3,184 @@ The main function is `find()`.
 """
 
 
+import bisect
+import collections
+import collections.abc
 import contextlib
+import difflib
+import heapq
 import inspect
+import itertools
 import logging
 import re
+import sys
+import time
 import uuid
-from pprint import pformat
 
 import networkx as nx
 from tqdm import tqdm
 
-from pinspect.logger import init_logger
+from pinspect.diff import fingerprint, GraphDiff
+from pinspect.execution import SerialExecutor
+from pinspect.sampling import ContainerSampler
 from pinspect.utils import get_module_root, IgnoreFunc, REGEX_NEVER_MATCH, NON_EXECUTABLE, to_pyvis, to_string, \
-    check_edge
+    check_edge, short_title, AttributePlan, RecordedObject, node_label
 
-init_logger()
 
+logger = logging.getLogger(__name__)
 
-class DiGraphAcyclic(nx.DiGraph):
+STRATEGIES = ('dfs', 'bfs', 'best')
+
+BACKENDS = ('networkx', 'compact')
+
+STATIC_MODES = ('signature', 'prune')
+
+# the `future` of a method call, avoided by the static analysis; the `value` is the predicted error
+AVOIDED_CALL = object()
+
+# the `future` of a method call, which result is reused from the previous traversal;
+# the `value` is a pair of the result and whether it has been raised
+REUSED_CALL = object()
+
+# the `future` of a method call, which result is replayed from the `InspectionSession`;
+# the `value` is the recorded edges to the result
+REPLAYED_CALL = object()
+
+# the suffix of the edge label of a sequence element, attached to the parent of the sequence
+_ELEMENT_SUFFIX = re.compile(r'(?:\[\d+\])+$')
+
+# a child of an expanded object: either an attribute `value` or a method call `future`
+PendingChild = collections.namedtuple('PendingChild', ['level', 'parent', 'edge_name', 'value', 'future'])
+
+
+class _NoPhase:
+    """
+    A no-op context manager of the phases, timed without a profiler.
+    `contextlib.nullcontext()` is new in Python 3.7.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NO_PHASE = _NoPhase()
+
+
+class TopologicalOrder:
+    """
+    Incremental topological order of the nodes of a graph, which detects cycles.
+
+    An edge `u -> v` with `order[u] < order[v]` can never close a cycle, which is
+    always the case when `v` is a new node. Otherwise, only the ancestors of `u`
+    that are placed after `v` are searched and, if `v` is not among them, moved
+    right before `v`. The order positions are spaced by `ORDER_GAP` to leave room
+    for such moves.
+
+    Subclasses store the position of each node in `_order` and the sorted positions
+    in `_order_sorted`, keep them up to date when the nodes are added or removed,
+    and implement:
+
+    * ``_predecessors(node)`` - the predecessors of the `node`;
+    * ``_nodes_in_order()`` - all the nodes, sorted by their order positions;
+    * ``_reset_order(nodes_sorted)`` - reassigns the order positions of all the
+      nodes, given in a topological order, spaced by `ORDER_GAP`.
+    """
+
+    ORDER_GAP = 1 << 32
+
+    def _update_order(self, u, v):
+        """
+        Updates the topological order to account for a new edge `u -> v`.
+
+        Parameters
+        ----------
+        u, v : int or str
+            Existing nodes.
+
+        Returns
+        -------
+        bool
+            False, if the edge `u -> v` closes a cycle, and True otherwise.
+            The order is left untouched if a cycle is detected.
+        """
+        if u == v:
+            return False
+        order = self._order
+        if order[u] < order[v]:
+            return True
+
+        # search the ancestors of `u` that are placed after `v`
+        lower = order[v]
+        ancestors = [u]
+        visited = {u}
+        for node in ancestors:
+            for parent in self._predecessors(node):
+                if parent == v:
+                    # makes cycle
+                    return False
+                if parent not in visited and order[parent] > lower:
+                    visited.add(parent)
+                    ancestors.append(parent)
+
+        # move the ancestors right before `v`, keeping their relative order
+        order_sorted = self._order_sorted
+        idx = bisect.bisect_left(order_sorted, lower)
+        prev = order_sorted[idx - 1] if idx > 0 else lower - self.ORDER_GAP
+        step = (lower - prev) // (len(ancestors) + 1)
+        ancestors.sort(key=order.__getitem__)
+        if step == 0:
+            # no room left; rebuild the order with ancestors moved
+            moved = set(ancestors)
+            nodes_sorted = self._nodes_in_order()
+            idx = nodes_sorted.index(v)
+            nodes_sorted = [node for node in nodes_sorted[:idx] if node not in moved] + ancestors + \
+                           [node for node in nodes_sorted[idx:] if node not in moved]
+            self._reset_order(nodes_sorted)
+            return True
+        for node in ancestors:
+            del order_sorted[bisect.bisect_left(order_sorted, order[node])]
+        for pos_id, node in enumerate(ancestors, start=1):
+            order[node] = prev + pos_id * step
+            bisect.insort(order_sorted, order[node])
+        return True
+
+
+class DiGraphAcyclic(TopologicalOrder, nx.DiGraph):
     """
     Directed Acyclic Graph.
+
+    Acyclicity is maintained incrementally with a topological order of the nodes,
+    see `TopologicalOrder`.
+
+    Node titles (object representations) are rendered lazily, when requested by
+    `node_title()` or `render_titles()`. Until then, the graph keeps a reference
+    to the node objects; `release_objects()` drops them.
+
+    With `synthetic_ids=True`, node ids are consecutive integers instead of `id(obj)`,
+    and titles are rendered right away. The graph keeps a reference to an object only
+    until `release()` is called for its node, after which the object may be garbage
+    collected: if it's added again, it gets a new node.
     """
 
+    def __init__(self, incoming_graph_data=None, synthetic_ids=False, **attr):
+        self._order = {}
+        self._order_sorted = []
+        self._objects = {}
+        self._error_ids = {}
+        self.synthetic_ids = synthetic_ids
+        # id(obj) -> (node, obj) and node -> id(obj) of not released objects
+        self._pinned = {}
+        self._pinned_nodes = {}
+        self._next_id = 0
+        super().__init__(incoming_graph_data, **attr)
+
     def add_edge(self, u, v_obj, label=None, **attr):
         """
-        Adds `id(v_obj)` node in the graph, if not present, and then
-        adds an edge from `u` to `id(v_obj)`.
+        Adds `v_obj` node in the graph, if not present, and then
+        adds an edge from `u` to `node_id(v_obj)`.
 
         Parameters
         ----------
@@ -36,7 +188,7 @@ class DiGraphAcyclic(nx.DiGraph):
             A node from.
         v_obj : object
             A node object to.
-            The node of the object is `id(v_obj)`.
+            The node of the object is `node_id(v_obj)`.
         label : str
             Edge label.
 
@@ -48,7 +200,7 @@ class DiGraphAcyclic(nx.DiGraph):
             Otherwise, returns True.
         """
         v_of_edge = self.add_node(v_obj, level=self.nodes[u]['level'] + 1)
-        if nx.has_path(self, v_of_edge, u):
+        if not self._update_order(u, v_of_edge):
             # makes cycle
             return False
         if label.endswith('()'):
@@ -61,6 +213,145 @@ class DiGraphAcyclic(nx.DiGraph):
         super().add_edge(u, v_of_edge, label=label, color=color, **attr)
         return True
 
+    def remove_node(self, n):
+        super().remove_node(n)
+        self._discard_order(n)
+        self._objects.pop(n, None)
+        self.release(n)
+
+    def remove_nodes_from(self, nodes):
+        nodes = list(nodes)
+        super().remove_nodes_from(nodes)
+        for n in nodes:
+            self._discard_order(n)
+            self._objects.pop(n, None)
+            self.release(n)
+
+    def clear(self):
+        super().clear()
+        self._order.clear()
+        self._order_sorted.clear()
+        self._objects.clear()
+        self._error_ids.clear()
+        self._pinned.clear()
+        self._pinned_nodes.clear()
+
+    def release(self, node):
+        """
+        Drops the reference to the object of the `node`, if `synthetic_ids` is set.
+
+        Parameters
+        ----------
+        node : int
+            Node id.
+        """
+        obj_id = self._pinned_nodes.pop(node, None)
+        if obj_id is not None:
+            del self._pinned[obj_id]
+
+    def node_title(self, node):
+        """
+        Renders the title of the `node`, if not rendered yet.
+
+        Parameters
+        ----------
+        node : int or str
+            Node id.
+
+        Returns
+        -------
+        str
+            The node title: a short representation of its object.
+        """
+        attr = self._node[node]
+        if 'title' not in attr:
+            if node not in self._objects:
+                # the object has been released
+                return attr['label']
+            attr['title'] = short_title(self._objects.pop(node))
+        return attr['title']
+
+    def render_titles(self, nodes=None):
+        """
+        Renders the titles of the `nodes`.
+
+        Parameters
+        ----------
+        nodes : iterable, optional
+            Node ids. If None, all nodes are rendered.
+        """
+        if nodes is None:
+            nodes = list(self._objects)
+        for node in nodes:
+            self.node_title(node)
+
+    def release_objects(self):
+        """
+        Drops the references to the objects of the nodes with not yet rendered titles.
+        """
+        self._objects.clear()
+
+    def _append_order(self, node):
+        if len(self._order_sorted) > 0:
+            pos = self._order_sorted[-1] + self.ORDER_GAP
+        else:
+            pos = 0
+        self._order[node] = pos
+        self._order_sorted.append(pos)
+
+    def _discard_order(self, node):
+        pos = self._order.pop(node, None)
+        if pos is not None:
+            del self._order_sorted[bisect.bisect_left(self._order_sorted, pos)]
+
+    def _reset_order(self, nodes_sorted):
+        self._order = {node: idx * self.ORDER_GAP for idx, node in enumerate(nodes_sorted)}
+        self._order_sorted = sorted(self._order.values())
+
+    def _predecessors(self, node):
+        return self._pred[node]
+
+    def _nodes_in_order(self):
+        return sorted(self._order, key=self._order.__getitem__)
+
+    def _update_order(self, u, v):
+        if len(self._order) != len(self._node):
+            # nodes were added or removed, bypassing the order, e.g. by `add_nodes_from()`
+            self._reset_order(nx.topological_sort(self))
+        return super()._update_order(u, v)
+
+    def node_id(self, obj):
+        """
+        Parameters
+        ----------
+        obj : object
+            An object.
+
+        Returns
+        -------
+        int or str
+            The id of the `obj` node: `id(obj)` or, for exceptions, a unique string.
+            With `synthetic_ids`, a new integer for objects that are not in the graph
+            or have been released.
+        """
+        if self.synthetic_ids:
+            pinned = self._pinned.get(id(obj))
+            if pinned is not None and pinned[1] is obj:
+                return pinned[0]
+            node = self._next_id
+            self._next_id += 1
+            self._pinned[id(obj)] = (node, obj)
+            self._pinned_nodes[node] = id(obj)
+            return node
+        if isinstance(obj, Exception):
+            error_id = self._error_ids.get(id(obj))
+            if error_id is None or error_id[1] is not obj:
+                # keep the exception to make sure its id is not reused
+                error_id = (uuid.uuid4().hex, obj)
+                self._error_ids[id(obj)] = error_id
+            return error_id[0]
+        return id(obj)
+
     def add_node(self, obj, **attr):
         """
         Adds `obj` in the graph, if not present.
@@ -79,38 +370,212 @@ class DiGraphAcyclic(nx.DiGraph):
         -----
         Due to the fact that two objects with non-overlapping lifetime might have the same identifier
         (address in memory), adding a node might overwrite the node with the same ID.
+        Use `synthetic_ids` to avoid this.
 
         """
-        if isinstance(obj, Exception):
-            obj_id = uuid.uuid4().hex
-            color = 'red'
-        else:
-            obj_id = id(obj)
-            color = None
+        obj_id = self.node_id(obj)
         if obj_id in self.nodes:
             return obj_id
-        label = obj.__class__.__name__
-        if isinstance(obj, (set, list, tuple, dict)):
-            label = f"{label} of size {len(obj)}"
-        title = pformat(obj, depth=1, compact=True)
-        title = title.splitlines()
-        title_short = title[0]
-        if len(title) > 1:
-            title_short = f"{title_short} ..., {title[-1]}"
-        title_short = title_short.strip('<>')
-        super().add_node(obj_id, label=label, title=title_short, color=color, **attr)
+        label, color = node_label(obj)
+        self._append_order(obj_id)
+        if self.synthetic_ids:
+            attr['title'] = short_title(obj)
+        else:
+            self._objects[obj_id] = obj
+        super().add_node(obj_id, label=label, color=color, **attr)
         return obj_id
 
 
+def match_ancestors(graph, nodes, edges=()):
+    """
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        A graph.
+    nodes : set
+        The matched nodes.
+    edges : set, optional
+        The matched edges `(u, v)`.
+
+    Returns
+    -------
+    set
+        The matched nodes, the sources of the matched edges and all their ancestors,
+        collected by a single multi-source reverse traversal.
+    """
+    ancestors = set(nodes)
+    ancestors.update(u for u, v in edges)
+    stack = list(ancestors)
+    while len(stack) > 0:
+        node = stack.pop()
+        for parent in graph.pred[node]:
+            if parent not in ancestors:
+                ancestors.add(parent)
+                stack.append(parent)
+    return ancestors
+
+
+def match_subgraph(graph, nodes, edges=(), root=None, view=False):
+    """
+    Strips the `graph` to the paths that lead to the matched nodes and edges.
+
+    The ancestors of the matched nodes and edges are collected by a single reverse
+    traversal, so the cost is proportional to the size of the result rather than
+    of the `graph`.
+
+    Parameters
+    ----------
+    graph : DiGraphAcyclic or CompactDiGraph
+        A graph, built by `GraphBuilder`.
+    nodes : iterable
+        The nodes, which labels match a key. Colored in green in the result.
+    edges : iterable, optional
+        The edges `(u, v)`, which labels match a key.
+    root : int or str, optional
+        The root node. Colored in blue in the result.
+    view : bool, optional
+        Return a read-only view of the `graph` instead of a copy. A view is
+        created in constant time, but its nodes are neither colored nor have
+        rendered titles. Ignored, if the `graph` is not a networkx graph.
+        Default is False.
+
+    Returns
+    -------
+    graph_stripped : nx.DiGraph
+        The subgraph: the in-edges of the matched nodes and their ancestors,
+        and the matched edges. Node titles are rendered.
+    """
+    nodes = set(nodes)
+    edges = set(edges)
+    ancestors = match_ancestors(graph, nodes=nodes, edges=edges)
+    if view and isinstance(graph, nx.DiGraph):
+        targets = {v for u, v in edges}
+
+        def filter_node(node):
+            return node in ancestors or node in targets
+
+        def filter_edge(u, v):
+            return u in ancestors and (v in ancestors or (u, v) in edges)
+
+        return nx.subgraph_view(graph, filter_node=filter_node, filter_edge=filter_edge)
+    return _copy_subgraph(graph, ancestors, nodes=nodes, edges=edges, root=root)
+
+
+def _copy_subgraph(graph, ancestors, nodes, edges, root):
+    graph_stripped = nx.DiGraph()
+    for u in ancestors:
+        for v, edge_attr in graph.succ[u].items():
+            if v in ancestors or (u, v) in edges:
+                for node in (u, v):
+                    if node not in graph_stripped:
+                        graph_stripped.add_node(node, **graph.nodes[node])
+                        graph_stripped.nodes[node]['title'] = graph.node_title(node)
+                graph_stripped.add_edge(u, v, **edge_attr)
+    for node in nodes.intersection(graph_stripped.nodes):
+        graph_stripped.nodes[node]['color'] = 'green'
+    if root in graph_stripped:
+        graph_stripped.nodes[root]['color'] = 'blue'
+    return graph_stripped
+
+
+def match_subgraphs(graph, nodes, edges, root=None):
+    """
+    Strips the `graph` for several keys at once: the same as `match_subgraph()`
+    of each key, but the ancestors of all the keys are collected by a single
+    reverse traversal, which propagates a bit mask of the keys.
+
+    Parameters
+    ----------
+    graph : DiGraphAcyclic or CompactDiGraph
+        A graph, built by `GraphBuilder`.
+    nodes : dict
+        The matched nodes of each key.
+    edges : dict
+        The matched edges `(u, v)` of each key.
+    root : int or str, optional
+        The root node.
+
+    Returns
+    -------
+    dict
+        The stripped `nx.DiGraph` of each key. See `match_subgraph()`.
+    """
+    keys = list(nodes)
+    nodes = {key: set(nodes[key]) for key in keys}
+    edges = {key: set(edges.get(key, ())) for key in keys}
+    masks = {}
+    for bit, key in enumerate(keys):
+        for node in itertools.chain(nodes[key], (u for u, v in edges[key])):
+            masks[node] = masks.get(node, 0) | (1 << bit)
+    stack = list(masks)
+    while len(stack) > 0:
+        node = stack.pop()
+        mask = masks[node]
+        for parent in graph.pred[node]:
+            parent_mask = masks.get(parent, 0)
+            if mask & ~parent_mask:
+                masks[parent] = parent_mask | mask
+                stack.append(parent)
+    graphs = {}
+    for bit, key in enumerate(keys):
+        ancestors = {node for node, mask in masks.items() if mask & (1 << bit)}
+        graphs[key] = _copy_subgraph(graph, ancestors, nodes=nodes[key], edges=edges[key], root=root)
+    return graphs
+
+
+def match_paths(graph, nodes, edges=(), root=None):
+    """
+    Enumerates the paths from the `root` to the matched nodes and edges without
+    building the stripped graph.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        A graph, built by `GraphBuilder`.
+    nodes : iterable
+        The nodes, which labels match a key.
+    edges : iterable, optional
+        The edges `(u, v)`, which labels match a key.
+    root : int or str
+        The root node.
+
+    Yields
+    ------
+    tuple
+        The edge labels along a path from the `root` to a leaf of the stripped
+        graph, followed by the leaf node label: the same paths as `to_string()`
+        of the `match_subgraph()` output.
+    """
+    edges = set(edges)
+    ancestors = match_ancestors(graph, nodes=nodes, edges=edges)
+    if root not in ancestors:
+        return
+    stack = [(root, ())]
+    while len(stack) > 0:
+        node, path = stack.pop()
+        children = [(v, edge_attr['label']) for v, edge_attr in graph.succ[node].items()
+                    if node in ancestors and (v in ancestors or (node, v) in edges)]
+        if len(children) == 0:
+            if len(path) > 0:
+                yield path + (graph.nodes[node]['label'],)
+            continue
+        # reversed to yield the paths in the order of the edges
+        for v, label in reversed(children):
+            stack.append((v, path + (label,)))
+
+
 class GraphBuilder:
-    def __init__(self, obj, key, ignore_key='', ignore_class=(), max_depth=10):
+    def __init__(self, obj, key, ignore_key='', ignore_class=(), max_depth=10, executor=None, strategy='dfs',
+                 max_nodes=None, max_time=None, max_calls=None, memory_bounded=False, profiler=None, trace=None,
+                 sampler=None, backend='networkx', session=None, static=None, incremental=False, previous=None):
         """
         Parameters
         ----------
         obj : object
             An object to inspect for `key`.
-        key : str
-            A key to look for.
+        key : str or list of str
+            A key to look for, or several keys to look for in a single traversal.
+            Use `strip_keys()` to get the matches of each key.
         ignore_key : str or list, optional
             A string or a list of strings to ignore `obj` attributes and methods from being accessed and executed.
             Apart from user-provided strings, all methods that contain one of the following key-words will be ignored:
@@ -122,118 +587,1007 @@ class GraphBuilder:
         max_depth : int, optional
             The max recursion depth.
             Default is 10.
+        executor : SerialExecutor, optional
+            Executes the methods of inspected objects. Pass `PoolExecutor` to run the calls
+            concurrently in a pool of threads or processes with a per-call timeout, or
+            `AsyncExecutor` to await the coroutine methods concurrently.
+            Default is None (`SerialExecutor`): the calls are executed one by one, without a timeout.
+        strategy : {'dfs', 'bfs', 'best'}, optional
+            The order of exploring the objects:
+              * 'dfs' - depth-first, in the order of attribute names;
+              * 'bfs' - breadth-first;
+              * 'best' - best-first: attributes and methods with names that resemble the `key`
+                are explored first.
+            Default is 'dfs'.
+        max_nodes : int, optional
+            Stop the traversal once the graph has this many nodes.
+            Default is None (no limit).
+        max_time : float, optional
+            Stop the traversal after this many seconds.
+            Default is None (no limit).
+        max_calls : int, optional
+            The max number of methods to execute. Once exceeded, the traversal
+            continues over attributes only.
+            Default is None (no limit).
+        memory_bounded : bool, optional
+            Release the method results as soon as their subtrees are explored.
+            The nodes are identified by synthetic ids instead of `id(obj)`, and the node
+            titles are rendered eagerly. The memory usage is bounded by the objects on
+            the current path ('dfs') or the frontier ('bfs', 'best') instead of all
+            the objects ever reached.
+            Default is False (keep all method results alive until the traversal is over).
+        profiler : Profiler, optional
+            Records the per-call execution time and result size, also stored as
+            the `duration` and `size` edge attributes, and the phase timings.
+            Default is None (no profiling).
+        trace : TraceWriter, optional
+            Writes the visit, call and error events as JSON lines.
+            Default is None (no tracing).
+        sampler : ContainerSampler, optional
+            Chooses the elements of lists, tuples, sets and dicts to inspect.
+            Default is None (the first element of a sequence and all dict entries).
+        backend : {'networkx', 'compact'}, optional
+            The graph storage:
+              * 'networkx' - `DiGraphAcyclic`, a `nx.DiGraph`;
+              * 'compact' - `CompactDiGraph`, which stores the graph in arrays and
+                takes several times less memory. The stripped graph is a `nx.DiGraph`
+                either way; call `graph.to_networkx()` to convert the full graph.
+            Default is 'networkx'.
+        session : InspectionSession, optional
+            Shares the inspected classes with other builders: the recorded method results
+            of the classes, inspected by them, are replayed instead of executing the methods.
+            The attributes of each object are inspected anyway.
+            Default is None (each builder executes all the methods itself).
+        static : {'signature', 'prune'}, optional
+            Inspect the method signatures, return annotations and docstrings before
+            executing the methods:
+              * 'signature' - do not execute the methods with required parameters; such
+                calls are added as `TypeError` nodes, as if they had been executed.
+                With the 'best' strategy, the methods that are predicted to return a class
+                that matches the `key` are explored first;
+              * 'prune' - also do not execute the methods that are predicted to return
+                a builtin or a foreign-module object (a leaf), which cannot match the
+                `key`. Such calls are not added in the graph.
+            The number of avoided calls is stored in `n_calls_avoided`.
+            Default is None (all methods are executed).
+        incremental : bool, optional
+            Keep the method results and the fingerprints of the inspected objects, so
+            that the next traversal of the same object, passed this builder as `previous`,
+            reuses them. Requires the 'networkx' `backend`.
+            Default is False.
+        previous : GraphBuilder, optional
+            An incremental builder, which has traversed the same object before. The methods
+            of the objects, which attributes have not been reassigned since then (see
+            `pinspect.diff.fingerprint()`), are not executed again: their previous results
+            are reused, and only their subtrees are traversed. The method results are
+            assumed to depend only on the attributes of their objects. Call `diff()` to
+            get the changes. Implies `incremental`.
+            Default is None (all methods are executed).
 
         Raises
         ------
         ValueError
-            If the `key` is a part of `ignore_key`.
+            If any of the keys is a part of `ignore_key`, or the `strategy`, the `backend`
+            or the `static` mode is unknown, or if `incremental` is combined with `memory_bounded`
+            or with the 'compact' `backend`.
         """
-        if key == '':
-            key = REGEX_NEVER_MATCH
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Invalid strategy='{strategy}'. Choose one of {STRATEGIES}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend='{backend}'. Choose one of {BACKENDS}")
+        if static is not None and static not in STATIC_MODES:
+            raise ValueError(f"Invalid static='{static}'. Choose one of {STATIC_MODES}")
+        incremental = incremental or previous is not None
+        if incremental and memory_bounded:
+            raise ValueError("An incremental traversal keeps the method results; it cannot be memory-bounded")
+        if incremental and backend != 'networkx':
+            # the nodes of the traversals are matched by `id(obj)`
+            raise ValueError("An incremental traversal requires backend='networkx'")
+        if isinstance(key, str):
+            key = [key]
+        self.keys = list(key)
+        self.key_tokens = re.findall(r"[a-z0-9_]+", ' '.join(self.keys).lower())
         self.obj = obj
         self.obj_saved = []  # prevent being collected by GC
-        self.key = re.compile(key, flags=re.IGNORECASE)
-        self.graph = DiGraphAcyclic()
+        # the patterns of each key and of any key
+        self.key_patterns = {key: re.compile(key or REGEX_NEVER_MATCH, flags=re.IGNORECASE) for key in self.keys}
+        key_any = '|'.join(f"(?:{key})" for key in self.keys if key) or REGEX_NEVER_MATCH
+        self.key = re.compile(key_any, flags=re.IGNORECASE)
+        self.memory_bounded = memory_bounded
+        if backend == 'compact':
+            from pinspect.compact import CompactDiGraph
+            self.graph = CompactDiGraph(synthetic_ids=memory_bounded)
+        else:
+            self.graph = DiGraphAcyclic(synthetic_ids=memory_bounded)
         self.module = get_module_root(obj)
         if not isinstance(ignore_key, str):
             ignore_key = '|'.join(ignore_key)
         ignore_key = f"{NON_EXECUTABLE}|{ignore_key}".rstrip('|')
-        if re.search(ignore_key, key):
-            raise ValueError(f"The key='{key}' cannot be a part of ignore_key='{ignore_key}'")
+        for key in self.keys:
+            if re.search(ignore_key, key):
+                raise ValueError(f"The key='{key}' cannot be a part of ignore_key='{ignore_key}'")
         self.ignore_attribute = IgnoreFunc(key=ignore_key, obj_class=ignore_class)
         self.tried_functions = set()
         self.tried_classes = set()
+        # the node and the level of the instance, which attributes have been inspected, of each class
+        self.inspected_classes = {}
+        # the nodes, which children have been cut by `max_depth`, tracked for the `session`
+        self.truncated_nodes = set()
+        self.session = session
+        # the `RecordedObject` stand-in of each replayed node of the `session`
+        self._replayed_objects = {}
+        self.attribute_plans = {}
         self.max_depth = max_depth
+        if executor is None:
+            executor = SerialExecutor()
+        self.executor = executor
+        self.strategy = strategy
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_calls = max_calls
+        self.n_calls = 0
+        self.static = static
+        self.n_calls_avoided = 0
+        self.incremental = incremental
+        self.previous = previous
+        # the object and its fingerprint of each inspected node; the result of each method call,
+        # (parent node, method name) -> (result, whether it has been raised)
+        self.states = {}
+        self.call_results = {}
+        self.n_calls_reused = 0
+        self.stop_reason = None
+        self.profiler = profiler
+        self.trace = trace
+        if sampler is None:
+            sampler = ContainerSampler()
+        self.sampler = sampler
+        self._start_time = None
+        # the first edge to each node: node -> (parent node, edge label)
+        self._parents = {}
+        self._match_queue = None
+        self._match_methods = True
+        self._matches_seen = set()
 
         self.graph.add_node(obj, level=0)
+        self._root_node = self.graph.node_id(obj)
+
+    def traverse(self, obj):
+        """
+        Traverses the attributes and method results of the `obj` and builds the graph.
+
+        The traversal is iterative and stops early, setting `stop_reason`, if one of
+        the `max_nodes` or `max_time` budgets is exhausted.
+
+        Parameters
+        ----------
+        obj : object
+            An object to traverse; usually, the object passed in the constructor.
+        """
+        with self.phase('traverse'):
+            for _ in self._iter_steps(obj):
+                pass
+
+    def iter_matches(self, with_methods=True):
+        """
+        Traverses the object, passed in the constructor, and yields the matches
+        as soon as they are found.
+
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+
+        Yields
+        ------
+        str
+            A path to the match in the `to_string()` format, starting from the first
+            path, by which the object has been reached.
+            Unlike `to_string()`, nodes that match the `key` are reported even if
+            their descendants match as well.
+        """
+        self._match_queue = collections.deque()
+        self._match_methods = with_methods
+        # the executors may suppress the standard output while the traversal is running
+        stdout = sys.stdout
+        for _ in self._iter_steps(self.obj):
+            while len(self._match_queue) > 0:
+                match = self._match_queue.popleft()
+                with contextlib.redirect_stdout(stdout):
+                    yield match
+        self._match_queue = None
+
+    def path_string(self, node, parent_edge=None):
+        """
+        Parameters
+        ----------
+        node : int or str
+            Node id.
+        parent_edge : tuple, optional
+            A pair of the parent node and the edge label to reach the `node` from.
+            Default is None (the edge, by which the node has been reached first).
+
+        Returns
+        -------
+        str
+            The path to the `node` in the `to_string()` format.
+        """
+        target_label = self.graph.nodes[node]['label']
+        if parent_edge is None:
+            parent_edge = self._parents.get(node)
+        labels = []
+        while parent_edge is not None:
+            parent, label = parent_edge
+            labels.append(label)
+            parent_edge = self._parents.get(parent)
+        labels.append(self.obj.__class__.__name__)
+        return f"{'.'.join(reversed(labels))} -> '{target_label}'"
+
+    def parent_edge(self, node):
+        """
+        Parameters
+        ----------
+        node : int or str
+            Node id.
+
+        Returns
+        -------
+        tuple or None
+            The parent node and the edge label, by which the `node` has been reached first,
+            or None for the root.
+        """
+        return self._parents.get(node)
+
+    def first_paths(self):
+        """
+        Returns
+        -------
+        dict
+            The first path to each node, by which it has been reached, in the `to_string()`
+            format without the target, e.g. ``'MagicWorld.wizards[0].name'``.
+        """
+        paths = {self._root_node: self.obj.__class__.__name__}
+        for node in self.graph.nodes:
+            chain = []
+            while node not in paths:
+                parent_edge = self._parents.get(node)
+                if parent_edge is None:
+                    # not reached from the root, e.g. a loaded graph
+                    break
+                chain.append((node, parent_edge[1]))
+                node = parent_edge[0]
+            path = paths.get(node)
+            if path is None:
+                continue
+            for node, label in reversed(chain):
+                path = f"{path}.{label}"
+                paths[node] = path
+        return paths
+
+    def diff(self):
+        """
+        Returns
+        -------
+        GraphDiff
+            The changes since the `previous` traversal.
+
+        Raises
+        ------
+        ValueError
+            If the builder has been created without `previous`.
+        """
+        if self.previous is None:
+            raise ValueError("The builder has no previous traversal to compare with")
+        return GraphDiff(self.previous, self)
+
+    def _iter_steps(self, obj):
+        self._start_time = time.monotonic()
+        with self.executor:
+            _, children = self._visit(obj, parent_edge=None, level=0)
+            if children is not None:
+                if self.strategy == 'dfs':
+                    yield from self._traverse_depth_first(children)
+                else:
+                    yield from self._traverse_prioritized(children)
+        if self.stop_reason is not None:
+            logger.info("The traversal has been stopped early: %s budget is exhausted", self.stop_reason)
+            if self.trace is not None:
+                self.trace.emit('stop', reason=self.stop_reason)
+        if self.static is not None:
+            logger.info("Static analysis has avoided %d method calls", self.n_calls_avoided)
+        if self.incremental:
+            # the state after the methods have been executed, to compare with in the next traversal
+            self.states = {node: (obj, fingerprint(obj)) for node, (obj, _) in self.states.items()}
+        if self.previous is not None:
+            logger.info("Reused %d method results of the previous traversal", self.n_calls_reused)
+        if self.session is not None:
+            self.session.record(self)
+
+    def _traverse_depth_first(self, children):
+        # the nodes on the stack are released, once their children are explored
+        stack = [(None, children)]
+        while len(stack) > 0 and not self._budget_exhausted():
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                self._release(node)
+                continue
+            node, children = self._resolve(child)
+            if children is not None:
+                stack.append((node, children))
+            else:
+                self._release(node)
+            yield
+
+    def _traverse_prioritized(self, children):
+        frontier = []
+        counter = itertools.count()
+        # the number of pending children per parent node; a node is released, once it has none
+        pending = collections.Counter()
+        while not self._budget_exhausted():
+            for child in children:
+                if self.memory_bounded:
+                    pending[self.graph.node_id(child.parent)] += 1
+                heapq.heappush(frontier, (self._priority(child), next(counter), child))
+            if len(frontier) == 0:
+                break
+            child = heapq.heappop(frontier)[-1]
+            node, children = self._resolve(child)
+            children = () if children is None else list(children)
+            if self.memory_bounded:
+                parent_node = self.graph.node_id(child.parent)
+                for grandchild in children:
+                    pending[self.graph.node_id(grandchild.parent)] += 1
+                if pending[node] == 0:
+                    self._release(node)
+                pending[parent_node] -= 1
+                if pending[parent_node] == 0:
+                    self._release(parent_node)
+                for grandchild in children:
+                    pending[self.graph.node_id(grandchild.parent)] -= 1
+            yield
 
-    def traverse(self, obj, parent_edge=None, level=0):
+    def _release(self, node):
+        """
+        Releases the object of the `node`, which subtree has been explored, in the memory-bounded mode.
+        """
+        if self.memory_bounded and node is not None and node != self._root_node:
+            self.graph.release(node)
+
+    def phase(self, name):
+        """
+        Parameters
+        ----------
+        name : str
+            A phase name.
+
+        Returns
+        -------
+        context manager
+            Accumulates the time of the `with` block in the `name` phase of the `profiler`, if set.
+        """
+        if self.profiler is None:
+            return NO_PHASE
+        return self.profiler.phase(name)
+
+    def _add_edge(self, parent, obj, edge_name, **edge_attr):
+        """
+        Adds an edge from the `parent` to the `obj` in the graph.
+
+        Returns
+        -------
+        bool
+            False, if the edge closes a cycle, and True otherwise.
+        """
+        parent_node = self.graph.node_id(parent)
+        node = self.graph.node_id(obj)
+        is_new = node not in self.graph
+        with self.phase('graph'):
+            if not self.graph.add_edge(parent_node, obj, label=edge_name, **edge_attr):
+                return False
+        if is_new:
+            self._parents[node] = (parent_node, edge_name)
+            if self.trace is not None:
+                self.trace.emit('visit', level=self.graph.nodes[node]['level'], node=node,
+                                label=self.graph.nodes[node]['label'], edge=edge_name)
+        if self._match_queue is not None and not (isinstance(obj, (set, list, tuple)) and len(obj) > 0):
+            # non-empty sequences are replaced by their elements in `_visit()`
+            if self.key.search(self.graph.nodes[node]['label']) or \
+                    (self._match_methods and self.key.search(edge_name)):
+                match = self.path_string(node, parent_edge=(parent_node, edge_name))
+                if match not in self._matches_seen:
+                    self._matches_seen.add(match)
+                    self._match_queue.append(match)
+        return True
+
+    def _budget_exhausted(self):
+        if self.stop_reason is None:
+            if self.max_nodes is not None and len(self.graph) >= self.max_nodes:
+                self.stop_reason = 'max_nodes'
+            elif self.max_time is not None and time.monotonic() - self._start_time >= self.max_time:
+                self.stop_reason = 'max_time'
+        return self.stop_reason is not None
+
+    def _priority(self, child):
+        """
+        Parameters
+        ----------
+        child : PendingChild
+            A child to explore.
+
+        Returns
+        -------
+        tuple
+            The priority of the `child`; the lower, the earlier the child is explored.
+        """
+        if self.strategy == 'bfs':
+            return 0
+        if self.key.search(child.edge_name):
+            similarity = 1.
+        else:
+            name = child.edge_name.strip("()[]'").lower()
+            similarity = max((difflib.SequenceMatcher(None, name, token).ratio() for token in self.key_tokens),
+                             default=0.)
+            if self.static is not None and child.future is not None and child.future is not AVOIDED_CALL:
+                plan = self.attribute_plan(child.parent.__class__)
+                attr_name = child.edge_name[:-2]
+                if plan.is_method(child.parent, attr_name):
+                    obj_class = plan.static_info(attr_name).return_class
+                    if obj_class is not None:
+                        if self.key.search(obj_class.__name__):
+                            similarity = 1.
+                        elif self._is_leaf_class(obj_class):
+                            similarity -= 1.
+        return -similarity, child.level
+
+    def _is_leaf_class(self, obj_class):
+        """
+        Returns
+        -------
+        bool
+            Whether the instances of the `obj_class` are never expanded: builtin types
+            and the classes of other modules, except containers.
+        """
+        if issubclass(obj_class, (bool, int, str, float, type)):
+            return True
+        if issubclass(obj_class, (dict, set, list, tuple, collections.abc.AsyncIterable)):
+            # async generators are sampled in lists by `AsyncExecutor`
+            return False
+        return obj_class.__module__.split('.')[0] != self.module
+
+    def static_settings(self):
+        """
+        Returns
+        -------
+        tuple or None
+            The `static` mode and, if the mode depends on the `key`, the key pattern.
+        """
+        if self.static is None:
+            return None
+        if self.static == 'prune':
+            return self.static, self.key.pattern
+        return self.static,
+
+    def _avoided_call(self, obj, plan, attr_name):
+        """
+        Decides whether to execute the `obj` method, using its static information.
+
+        Returns
+        -------
+        str or None
+            The reason to avoid the call: 'signature', if the method has required
+            parameters, or 'prune', if its result is predicted to be a leaf, which
+            does not match the `key`. None, if the method should be executed.
+        """
+        if not plan.is_method(obj, attr_name):
+            return None
+        info = plan.static_info(attr_name)
+        if info.required:
+            return 'signature'
+        if self.static == 'prune' and info.return_class is not None and self._is_leaf_class(info.return_class) \
+                and not self.key.search(f"{attr_name}()") and not self.key.search(info.return_class.__name__):
+            return 'prune'
+        return None
+
+    def _resolve(self, child):
+        """
+        Evaluates the `child` and visits it.
+
+        Parameters
+        ----------
+        child : PendingChild
+            A child to explore.
+
+        Returns
+        -------
+        node : int or str or None
+            The node of the `child`, if it has been added by this call. Otherwise, None.
+        children : iterator or None
+            The children of the `child`, if it's expanded.
+        """
+        if child.future is None:
+            return self._visit(child.value, parent_edge=(child.parent, child.edge_name), level=child.level)
+        if child.future is AVOIDED_CALL:
+            node = self.graph.node_id(child.value)
+            self._add_edge(child.parent, child.value, edge_name=child.edge_name)
+            return node, None
+        if child.future is REUSED_CALL:
+            res, raised = child.value
+            self._save_result(child, res, raised=raised)
+            if raised:
+                node = self.graph.node_id(res)
+                self._add_edge(child.parent, res, edge_name=child.edge_name)
+                return node, None
+            self.obj_saved.append(res)
+            return self._visit(res, parent_edge=(child.parent, child.edge_name), level=child.level)
+        if child.future is REPLAYED_CALL:
+            # the edges to the result are attached to the parent, as the elements of a sequence are
+            return None, self._replayed_children(child.parent, child.value, level=child.level - 1)
+        start = time.perf_counter()
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%sExecuting %s.%s", '  ' * child.level, child.parent.__class__.__name__,
+                             child.edge_name)
+            res = self.executor.result(child.future)
+        except Exception as err:
+            edge_attr = self._record_call(child, start=start, error=err)
+            # create a new exception to make sure the id is unique
+            err = err.__class__(str(err))
+            self._save_result(child, err, raised=True)
+            node = self.graph.node_id(err)
+            self._add_edge(child.parent, err, edge_name=child.edge_name, **edge_attr)
+            return node, None
+        edge_attr = self._record_call(child, start=start, result=(res,))
+        if inspect.iscoroutine(res):
+            # never awaited by a synchronous executor; see `AsyncExecutor`
+            res.close()
+        self._save_result(child, res)
+        if not self.memory_bounded:
+            self.obj_saved.append(res)
+        return self._visit(res, parent_edge=(child.parent, child.edge_name), level=child.level, **edge_attr)
+
+    def _save_result(self, child, result, raised=False):
+        """
+        Keeps the `result` of the `child` method call for the next traversal, if incremental.
+        """
+        if self.incremental:
+            self.call_results[(self.graph.node_id(child.parent), child.edge_name[:-2])] = (result, raised)
+
+    def _record_call(self, child, start, result=None, error=None):
+        """
+        Records the call of the `child` method in the `profiler` and the `trace`, if set.
+
+        Parameters
+        ----------
+        child : PendingChild
+            An executed method.
+        start : float
+            The `time.perf_counter()` before requesting the result.
+        result : tuple, optional
+            A one-element tuple of the call result, if the call succeeded.
+        error : Exception, optional
+            The exception, raised by the call.
+
+        Returns
+        -------
+        dict
+            The edge attributes: `duration` and `size`, if profiling.
+        """
+        if self.profiler is None and self.trace is None:
+            return {}
+        duration = time.perf_counter() - start
+        method = f"{child.parent.__class__.__name__}.{child.edge_name}"
+        if self.trace is not None:
+            if error is None:
+                self.trace.emit('call', method=method, duration=duration)
+            else:
+                self.trace.emit('error', method=method, duration=duration, error=error.__class__.__name__,
+                                message=str(error))
+        if self.profiler is None:
+            return {}
+        size = None
+        if result is not None:
+            try:
+                size = sys.getsizeof(result[0])
+            except TypeError:
+                pass
+        self.profiler.record_call(method, duration=duration, size=size)
+        return dict(duration=duration, size=size)
+
+    def _visit(self, obj, parent_edge, level, **edge_attr):
+        """
+        Adds the `obj` in the graph and lists its children to explore.
+
+        Parameters
+        ----------
+        obj : object
+            An object to visit.
+        parent_edge : tuple or None
+            A pair of the parent object and the edge label from the parent to the `obj`.
+        level : int
+            The depth of the `obj`.
+        **edge_attr
+            Other attributes of the edge from the parent.
+
+        Returns
+        -------
+        node : int or str or None
+            The node of the `obj`, if it has been added by this call. Otherwise, None.
+        children : iterator or None
+            The children of the `obj` as `PendingChild` tuples, if it's expanded.
+        """
         if level >= self.max_depth:
-            return
+            if self.session is not None and parent_edge is not None:
+                self.truncated_nodes.add(self.graph.node_id(parent_edge[0]))
+            return None, None
 
+        node = None
         if parent_edge is not None:
             parent, edge_name = parent_edge
-            if not self.graph.add_edge(id(parent), obj, label=edge_name):
+            node = self.graph.node_id(obj)
+            if node in self.graph:
+                # visited before
+                node = None
+            if not self._add_edge(parent, obj, edge_name=edge_name, **edge_attr):
                 # makes a cycle
-                return
+                return None, None
             if isinstance(obj, (bool, int, str, float, type)):
                 # ignore builtin types
-                return
+                return node, None
 
         if isinstance(obj, dict):
-            for key, value in obj.items():
-                self.traverse(value, parent_edge=(obj, f"['{key}']"), level=level + 1)
-            return
+            return node, (PendingChild(level + 1, obj, f"['{key}']", value, None)
+                          for key, value in self.sampler.sample(obj))
 
         if isinstance(obj, (set, list, tuple)):
-            if len(obj) > 0:
-                element = next(iter(obj))
-                if parent_edge is not None:
-                    parent, edge_name = parent_edge
-                    self.graph.remove_node(id(obj))
-                    self.traverse(element, parent_edge=(parent, f"{edge_name}[0]"), level=level + 1)
-                else:
-                    self.traverse(element, parent_edge=(obj, "[0]"), level=level + 1)
-            return
+            if len(obj) == 0:
+                return node, None
+            elements = self.sampler.sample(obj)
+            if parent_edge is not None:
+                # the elements are attached to the parent directly
+                parent, edge_name = parent_edge
+                container = self.graph.node_id(obj)
+                self.graph.remove_node(container)
+                self._parents.pop(container, None)
+                return None, iter([PendingChild(level + 1, parent, f"{edge_name}[{index}]", element, None)
+                                   for index, element in elements])
+            return node, iter([PendingChild(level + 1, obj, f"[{index}]", element, None)
+                               for index, element in elements])
+
+        if isinstance(obj, RecordedObject):
+            return node, self._replay(obj, node=node, level=level)
 
         if get_module_root(obj) != self.module:
             # we're interested only in functions of the given module
-            return
+            return node, None
+
+        if level + 1 >= self.max_depth:
+            # the children would be discarded anyway
+            if self.session is not None:
+                self.truncated_nodes.add(self.graph.node_id(obj))
+            return node, None
 
         if obj.__class__ in self.tried_classes:
-            return
+            return node, None
         self.tried_classes.add(obj.__class__)
+        obj_node = self.graph.node_id(obj)
+        self.inspected_classes[obj.__class__] = (obj_node, level)
+        reused_results = None
+        if self.incremental:
+            state = fingerprint(obj)
+            self.states[obj_node] = (obj, state)
+            if self.previous is not None:
+                previous_state = self.previous.states.get(obj_node)
+                if previous_state is not None and previous_state[0] is obj and previous_state[1] == state:
+                    reused_results = self.previous.call_results
+        replayed_results = None
+        if self.session is not None:
+            replayed_results = self.session.recorded(self, obj.__class__, level=level)
 
-        logging.debug(f"{'  ' * level}Inspecting {obj.__class__.__name__} (level={level}): {obj}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%sInspecting %s (level=%d): %s", '  ' * level, obj.__class__.__name__, level,
+                         short_title(obj))
 
-        for attr_name in tqdm(dir(obj), desc=f"Inspecting '{obj.__class__.__name__}'",
-                              disable=level > 0):
-            if attr_name.startswith('__'):
-                continue
-            if self.ignore_attribute(obj, attr_name):
+        plan = self.attribute_plan(obj.__class__)
+        names = tqdm(plan.names(obj), desc=f"Inspecting '{obj.__class__.__name__}'", disable=level > 0)
+        children = (PendingChild(level + 1, obj, f"{attr_name}()" if future is not None else attr_name, attr, future)
+                    for attr_name, attr, future in self._iter_attributes(obj, plan=plan, names=names,
+                                                                         reused_results=reused_results,
+                                                                         replayed_results=replayed_results))
+        if self.executor.prefetch:
+            # submit all calls at once
+            children = iter(list(children))
+        return node, children
+
+    def _replay(self, obj, node, level):
+        """
+        Expands the `RecordedObject` stand-in `obj` with its recorded edges, as the object
+        it stands for would be expanded: an instance of a tried class is not expanded again.
+
+        Parameters
+        ----------
+        obj : RecordedObject
+            A stand-in, replayed by the `session`.
+        node : int or None
+            The node of the `obj`, if it has been added by this visit. Otherwise, None.
+        level : int
+            The depth of the `obj`.
+
+        Returns
+        -------
+        iterator or None
+            The children of the `obj`, if it's expanded.
+        """
+        recorded = obj.recorded
+        if node is None or recorded is None or len(recorded.edges) == 0:
+            return None
+        if level + 1 >= self.max_depth:
+            self.truncated_nodes.add(node)
+            return None
+        if recorded.obj_class is not None:
+            if recorded.obj_class in self.tried_classes:
+                return None
+            self.tried_classes.add(recorded.obj_class)
+        methods = {edge_name.partition('()')[0] for edge_name, _ in recorded.edges
+                   if '()' in edge_name and not edge_name.startswith('[')}
+        self.session.n_replayed_calls += len(methods)
+        return self._replayed_children(obj, recorded.edges, level=level)
+
+    def _replayed_children(self, parent, edges, level):
+        """
+        Parameters
+        ----------
+        parent : object
+            The object, which recorded edges are replayed.
+        edges : tuple
+            The recorded edges of the `parent` as (edge label, `RecordedNode`) pairs.
+        level : int
+            The depth of the `parent`.
+
+        Returns
+        -------
+        iterator
+            The `RecordedObject` stand-ins of the edge targets as `PendingChild` tuples.
+            A recorded node, reached by several edges, has a single stand-in.
+        """
+        for edge_name, recorded in edges:
+            obj = self._replayed_objects.get(id(recorded))
+            if obj is None:
+                obj = RecordedObject(recorded.label, color=recorded.color, recorded=recorded)
+                self._replayed_objects[id(recorded)] = obj
+            element = _ELEMENT_SUFFIX.search(edge_name)
+            depth = 1 if element is None else 1 + element.group().count('[')
+            yield PendingChild(level + depth, parent, edge_name, obj, None)
+
+    def _iter_attributes(self, obj, plan, names, reused_results=None, replayed_results=None):
+        """
+        Accesses the `obj` attributes and submits the calls of its methods.
+
+        Parameters
+        ----------
+        obj : object
+            An object to inspect.
+        plan : AttributePlan
+            The attribute plan of the `obj` class.
+        names : iterable
+            Attribute names to access.
+        reused_results : dict, optional
+            The method results of the previous traversal to reuse, if the `obj` has not changed.
+        replayed_results : dict, optional
+            The method results of the `obj` class, recorded by the `session`, to replay.
+
+        Yields
+        ------
+        attr_name : str
+            Attribute name.
+        attr : object
+            Attribute value.
+        future : object or None
+            The handle of the call, submitted to the executor, if the `attr` is
+            a not yet tried method. Otherwise, None.
+            Methods are skipped once the `max_calls` budget is exhausted.
+            If the call is avoided by the static analysis, the `future` is `AVOIDED_CALL`
+            and the `attr` is the `TypeError` the call would raise. If the result is
+            reused, the `future` is `REUSED_CALL` and the `attr` is the reused result. If the
+            result is replayed, the `future` is `REPLAYED_CALL` and the `attr` is the recorded
+            edges to the result.
+        """
+        obj_node = self.graph.node_id(obj)
+        for attr_name in names:
+            full_name = plan.full_name(attr_name)
+            if full_name in self.tried_functions and plan.is_method(obj, attr_name):
                 continue
             try:
                 attr = getattr(obj, attr_name)
             except ValueError:
                 continue
-            full_name = f"{obj.__class__.__name__}.{attr_name}"
             if callable(attr) and full_name not in self.tried_functions:
+                if reused_results is not None:
+                    result = reused_results.get((obj_node, attr_name))
+                    if result is not None:
+                        self.tried_functions.add(full_name)
+                        self.n_calls_reused += 1
+                        yield attr_name, result, REUSED_CALL
+                        continue
+                if self.static is not None:
+                    reason = self._avoided_call(obj, plan, attr_name)
+                    if reason is not None:
+                        self.tried_functions.add(full_name)
+                        self.n_calls_avoided += 1
+                        if self.trace is not None:
+                            self.trace.emit('avoided', method=f"{full_name}()", reason=reason)
+                        if reason == 'signature':
+                            required = ', '.join(f"'{name}'" for name in plan.static_info(attr_name).required)
+                            error = TypeError(f"{attr_name}() missing required arguments: {required}")
+                            yield attr_name, error, AVOIDED_CALL
+                        continue
+                if replayed_results is not None:
+                    edges = replayed_results.get(attr_name)
+                    if edges is not None:
+                        self.tried_functions.add(full_name)
+                        self.session.n_replayed_calls += 1
+                        yield attr_name, edges, REPLAYED_CALL
+                        continue
+                if self.max_calls is not None and self.n_calls >= self.max_calls:
+                    continue
                 self.tried_functions.add(full_name)
-                try:
-                    logging.debug(f"{'  ' * (level + 1)}Executing {obj.__class__.__name__}.{attr_name}()")
-                    with contextlib.redirect_stdout(None):
-                        res = attr()
-                except Exception as err:
-                    # create a new exception to make sure the id is unique
-                    err = err.__class__(str(err))
-                    self.graph.add_edge(id(obj), err, label=f"{attr_name}()")
-                else:
-                    self.obj_saved.append(res)
-                    self.traverse(res, parent_edge=(obj, f"{attr_name}()"), level=level + 1)
+                self.n_calls += 1
+                yield attr_name, attr, self.executor.submit(attr)
             elif not inspect.ismethod(attr):
-                self.traverse(attr, parent_edge=(obj, attr_name), level=level + 1)
-
-    def strip(self, with_methods=True):
-        graph = self.graph.reverse(copy=False)
-        graph_stripped = nx.DiGraph()
-        for node_from in nx.topological_sort(graph):
-            if self.key.search(graph.nodes[node_from].get('label', '')):
-                graph.nodes[node_from]['color'] = 'green'
-                include_parents = True
+                yield attr_name, attr, None
+
+    def attribute_plan(self, obj_class):
+        """
+        Parameters
+        ----------
+        obj_class : type
+            An object class.
+
+        Returns
+        -------
+        AttributePlan
+            The attributes of `obj_class` instances to inspect, cached per class.
+        """
+        plan = self.attribute_plans.get(obj_class)
+        if plan is None:
+            if self.session is not None:
+                plan = self.session.attribute_plan(self, obj_class)
             else:
-                include_parents = graph.nodes[node_from].get('include', False)
-            for node_to, edge_attr in graph.adj[node_from].items():
-                method_hit = with_methods and self.key.search(edge_attr['label'])
-                if include_parents or method_hit:
-                    graph.nodes[node_to]['include'] = True
-                    graph_stripped.add_node(node_to, **graph.nodes[node_to])
-                    graph_stripped.add_node(node_from, **graph.nodes[node_from])
-                    graph_stripped.add_edge(node_to, node_from, **edge_attr)
-        graph_stripped.nodes[id(self.obj)]['color'] = 'blue'
-        return graph_stripped
-
-
-def find(obj, key, ignore_key='', ignore_class=(), verbose=True, visualize=True):
+                plan = AttributePlan(obj_class, ignore_attribute=self.ignore_attribute)
+            self.attribute_plans[obj_class] = plan
+        return plan
+
+    def matched(self, with_methods=True, key=None):
+        """
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+        key : str, optional
+            One of the `keys` to match.
+            Default is None (any of the keys).
+
+        Returns
+        -------
+        nodes : list
+            The nodes, which labels match the `key`.
+        edges : list
+            The edges `(u, v)`, which labels match the `key`.
+        """
+        pattern = self.key if key is None else self.key_patterns[key]
+        # the labels repeat a lot: each distinct label is searched once
+        is_match = {}
+
+        def search(label):
+            match = is_match.get(label)
+            if match is None:
+                match = is_match[label] = pattern.search(label) is not None
+            return match
+
+        nodes = [node for node, label in self.graph.nodes.data('label') if search(label)]
+        edges = []
+        if with_methods:
+            edges = [(u, v) for u, v, label in self.graph.edges.data('label') if search(label)]
+        return nodes, edges
+
+    def matched_keys(self, with_methods=True):
+        """
+        Matches all the `keys` in a single pass over the graph.
+
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+
+        Returns
+        -------
+        nodes : dict
+            The nodes, which labels match a key, of each key.
+        edges : dict
+            The edges `(u, v)`, which labels match a key, of each key.
+        """
+        # the keys, matched by each distinct label
+        label_keys = {}
+
+        def search(label):
+            keys = label_keys.get(label)
+            if keys is None:
+                keys = label_keys[label] = [key for key, pattern in self.key_patterns.items()
+                                            if pattern.search(label)]
+            return keys
+
+        nodes = {key: [] for key in self.key_patterns}
+        edges = {key: [] for key in self.key_patterns}
+        for node, label in self.graph.nodes.data('label'):
+            for key in search(label):
+                nodes[key].append(node)
+        if with_methods:
+            for u, v, label in self.graph.edges.data('label'):
+                for key in search(label):
+                    edges[key].append((u, v))
+        return nodes, edges
+
+    def strip(self, with_methods=True, view=False):
+        """
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+        view : bool, optional
+            Return a read-only view of the graph instead of a copy. See `match_subgraph()`.
+            Default is False.
+
+        Returns
+        -------
+        graph : nx.DiGraph
+            The graph, stripped to the paths from the root to the nodes and edges
+            that match the `key`.
+        """
+        nodes, edges = self.matched(with_methods=with_methods)
+        return match_subgraph(self.graph, nodes=nodes, edges=edges, root=self._root_node, view=view)
+
+    def strip_keys(self, with_methods=True):
+        """
+        Strips the graph for each of the `keys` in a single pass.
+
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+
+        Returns
+        -------
+        dict
+            The stripped `nx.DiGraph` of each key. See `strip()`.
+        """
+        nodes, edges = self.matched_keys(with_methods=with_methods)
+        return match_subgraphs(self.graph, nodes=nodes, edges=edges, root=self._root_node)
+
+    def match_paths(self, with_methods=True):
+        """
+        Parameters
+        ----------
+        with_methods : bool, optional
+            Match the method and attribute names as well, not only the object class names.
+            Default is True.
+
+        Returns
+        -------
+        generator
+            The paths to the matches as tuples, without building the stripped graph.
+            See `match_paths()`.
+        """
+        nodes, edges = self.matched(with_methods=with_methods)
+        return match_paths(self.graph, nodes=nodes, edges=edges, root=self._root_node)
+
+
+def find(obj, key, ignore_key='', ignore_class=(), verbose=True, visualize=True, executor=None, cache=None,
+         max_paths=None, **kwargs):
     """
     Traverse the object `obj` and find methods and attributes that match the `key`.
 
@@ -241,8 +1595,8 @@ def find(obj, key, ignore_key='', ignore_class=(), verbose=True, visualize=True)
     ----------
     obj : object
         An object to inspect for `key`.
-    key : str
-        A key to look for.
+    key : str or list of str
+        A key to look for, or several keys to look for in a single traversal.
     ignore_key : str or list, optional
         A string or a list of strings to ignore `obj` attributes and methods from being accessed and executed.
         Apart from user-provided strings, all methods that contain one of the following key-words will be ignored:
@@ -256,30 +1610,132 @@ def find(obj, key, ignore_key='', ignore_class=(), verbose=True, visualize=True)
         Default is True.
     visualize : bool, optional
         If set to True, renders a graph in a web browser, using `pyvis` package.
+    executor : SerialExecutor, optional
+        Executes the methods of inspected objects. Pass `PoolExecutor` to run the calls
+        concurrently with a per-call timeout, or `AsyncExecutor` to await the coroutine methods.
+        Default is None (the calls are executed one by one, without a timeout).
+    cache : GraphCache, optional
+        If set, the unstripped graph is loaded from this cache, if present, or stored in it
+        after the traversal.
+        Default is None (no caching).
+    max_paths : int, optional
+        The max number of printed matches. If set, the shortest paths are printed first.
+        Default is None (all matches). In either case, the matches below an object,
+        reached by several paths, are printed only once.
+    **kwargs
+        Other `GraphBuilder` parameters: `max_depth`, `strategy`, the budgets
+        `max_nodes`, `max_time` and `max_calls`, `memory_bounded`, `profiler`, `trace`, `sampler`,
+        `backend`, `session` and `static`.
+        With a `profiler`, the `find()` phases are timed as well. With `static`, the number
+        of avoided method calls is printed, if `verbose`.
 
     Returns
     -------
-    graph : nx.DiGraph
+    graph : nx.DiGraph or dict
         Stripped graph with edges and nodes that match the `key`.
+        If several keys are given, a dict of the stripped graph of each key.
 
     Raises
     ------
     ValueError
-        If the `key` is a part of `ignore_key`.
+        If the `key` or any of the keys is a part of `ignore_key`.
     """
-    builder = GraphBuilder(obj, key=key, ignore_key=ignore_key, ignore_class=ignore_class)
-    builder.traverse(obj)
-    builder.obj_saved.clear()
-    graph = builder.strip(with_methods=True)
-    logging.info(f"Stripped graph length: {len(builder.graph)} -> {len(graph)}")
-    if verbose:
-        if len(graph) == 0:
-            print("No match")
+    builder = GraphBuilder(obj, key=key, ignore_key=ignore_key, ignore_class=ignore_class, executor=executor,
+                           **kwargs)
+    loaded = False
+    if cache is not None:
+        with builder.phase('cache'):
+            loaded = cache.load(builder)
+    if not loaded:
+        builder.traverse(obj)
+        if cache is not None:
+            with builder.phase('cache'):
+                cache.store(builder)
+        if verbose and builder.static is not None:
+            print(f"Static analysis has avoided {builder.n_calls_avoided} method calls")
+    with builder.phase('strip'):
+        if isinstance(key, str):
+            graphs = {key: builder.strip(with_methods=True)}
         else:
-            matches = to_string(graph, source=id(obj), prefix=obj.__class__.__name__)
-            print('\n'.join(matches))
-    # to_pyvis(builder.graph, layout=False).show('full.html')
-    if visualize and len(graph) > 0:
-        network_pyvis = to_pyvis(graph)
-        network_pyvis.show(name=f"{obj.__class__.__name__}.html")
-    return graph
+            graphs = builder.strip_keys(with_methods=True)
+    builder.obj_saved.clear()
+    builder.graph.release_objects()
+    for key_i, graph in graphs.items():
+        logger.info("Stripped graph length of key='%s': %d -> %d", key_i, len(builder.graph), len(graph))
+        if verbose:
+            if len(graphs) > 1:
+                print(f"Key '{key_i}':")
+            if len(graph) == 0:
+                print("No match")
+            else:
+                with builder.phase('to_string'):
+                    matches = to_string(graph, source=builder.graph.node_id(obj), prefix=obj.__class__.__name__,
+                                        shortest_first=max_paths is not None, dedup_suffixes=True)
+                    for n_printed, match in enumerate(matches):
+                        if n_printed == max_paths:
+                            print("... (more matches are not shown)")
+                            break
+                        print(match)
+        # to_pyvis(builder.graph, layout=False).show('full.html')
+        if visualize and len(graph) > 0:
+            with builder.phase('to_pyvis'):
+                network_pyvis = to_pyvis(graph)
+            name = obj.__class__.__name__
+            if len(graphs) > 1:
+                key_name = re.sub(r"[^\w.-]+", '_', key_i)
+                name = f"{name}.{key_name}"
+            network_pyvis.show(name=f"{name}.html")
+    if isinstance(key, str):
+        return graphs[key]
+    return graphs
+
+
+def iter_find(obj, key, ignore_key='', ignore_class=(), max_matches=None, with_methods=True, executor=None, **kwargs):
+    """
+    Traverse the object `obj` and yield methods and attributes that match the `key` as soon as they are found.
+
+    Parameters
+    ----------
+    obj : object
+        An object to inspect for `key`.
+    key : str
+        A key to look for.
+    ignore_key : str or list, optional
+        A string or a list of strings to ignore `obj` attributes and methods from being accessed and executed.
+        See `find()`.
+    ignore_class : list, optional
+        A list of class types to ignore.
+    max_matches : int, optional
+        Stop the traversal after this many matches.
+        Default is None (traverse the whole object).
+    with_methods : bool, optional
+        Match the method and attribute names as well, not only the object class names.
+        Default is True.
+    executor : SerialExecutor, optional
+        Executes the methods of inspected objects. See `find()`.
+    **kwargs
+        Other `GraphBuilder` parameters.
+
+    Yields
+    ------
+    str
+        A path to the match in the `to_string()` format.
+
+    Raises
+    ------
+    ValueError
+        If the `key` is a part of `ignore_key`.
+    """
+    builder = GraphBuilder(obj, key=key, ignore_key=ignore_key, ignore_class=ignore_class, executor=executor,
+                           **kwargs)
+    matches = builder.iter_matches(with_methods=with_methods)
+    try:
+        for match_id, match in enumerate(matches, start=1):
+            yield match
+            if max_matches is not None and match_id >= max_matches:
+                break
+    finally:
+        # stops the traversal
+        matches.close()
+        builder.obj_saved.clear()
+        builder.graph.release_objects()
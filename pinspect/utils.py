@@ -1,20 +1,59 @@
+import builtins
+import collections
+import functools
 import inspect
 import logging
 import re
+import reprlib
+import sys
+import typing
 
 import networkx as nx
-from pyvis.network import Network
 
 try:
     from StringIO import StringIO
 except ImportError:
     from io import StringIO
 
+logger = logging.getLogger(__name__)
+
 # does not match to any symbol
 REGEX_NEVER_MATCH = '(?!x)x'
 
 NON_EXECUTABLE = "save|write|remove|delete|duplicate"
 
+# the max length of node titles, shown on hover
+TITLE_MAX_LENGTH = 200
+
+# the max number of nodes, shown by `to_pyvis()` with the physics simulation on by default
+PHYSICS_MAX_NODES = 1000
+
+# the return type in the 'Returns' section of a numpy docstring or in the ':rtype:' field
+DOCSTRING_RETURNS = re.compile(r"^[ \t]*Returns\n[ \t]*-+\n[ \t]*(?:\w+[ \t]*:[ \t]*)?([\w.]+)[ \t]*$"
+                               r"|:rtype:[ \t]*([\w.]+)[ \t]*$", flags=re.MULTILINE)
+
+# the static information about a method: the names of its required parameters and the predicted result class
+StaticInfo = collections.namedtuple('StaticInfo', ['required', 'return_class'])
+
+
+class _TitleRepr(reprlib.Repr):
+    """
+    `reprlib.Repr`, which does not render large byte arrays in full.
+    """
+
+    def repr_bytes(self, x, level):
+        if len(x) <= self.maxother:
+            return repr(x)
+        return f"{repr(x[:self.maxother])}..."
+
+    repr_bytearray = repr_bytes
+
+
+_title_repr = _TitleRepr()
+_title_repr.maxlevel = 1
+_title_repr.maxstring = TITLE_MAX_LENGTH
+_title_repr.maxother = TITLE_MAX_LENGTH
+
 
 def getmembers(obj_class):
     """
@@ -33,10 +72,114 @@ def getmembers(obj_class):
     return member_names
 
 
+@functools.lru_cache(maxsize=None)
+def numpy_members(np):
+    """
+    Parameters
+    ----------
+    np : module
+        The imported `numpy` module.
+
+    Returns
+    -------
+    frozenset
+        The names of `np.ndarray` members and `numpy` functions, computed once per process.
+    """
+    return frozenset(getmembers(np.ndarray) | getmembers(np))
+
+
+def short_title(obj, max_length=TITLE_MAX_LENGTH):
+    """
+    Parameters
+    ----------
+    obj : object
+        An object to describe.
+    max_length : int, optional
+        The max length of the title.
+
+    Returns
+    -------
+    title : str
+        A one-line representation of the `obj`, capped at `max_length` symbols.
+        Containers are shown only by their first elements.
+    """
+    title = _title_repr.repr(obj).splitlines()
+    title_short = title[0]
+    if len(title) > 1:
+        title_short = f"{title_short} ..., {title[-1]}"
+    title_short = title_short.strip('<>')
+    if len(title_short) > max_length:
+        title_short = f"{title_short[:max_length - 3]}..."
+    return title_short
+
+
+class RecordedObject:
+    """
+    A stand-in for an object, recorded by an earlier inspection in an `InspectionSession`.
+    The `recorded` node, if set, holds the recorded edges to replay below the stand-in.
+    """
+
+    __slots__ = ('label', 'color', 'recorded')
+
+    def __init__(self, label, color=None, recorded=None):
+        self.label = label
+        self.color = color
+        self.recorded = recorded
+
+    def __repr__(self):
+        return f"{self.label} (recorded)"
+
+
+def node_label(obj):
+    """
+    Parameters
+    ----------
+    obj : object
+        An object.
+
+    Returns
+    -------
+    label : str
+        The label of the `obj` node: the class name and, for containers, the size.
+    color : str or None
+        The color of the `obj` node: red for exceptions.
+    """
+    if isinstance(obj, RecordedObject):
+        return obj.label, obj.color
+    label = obj.__class__.__name__
+    if isinstance(obj, (set, list, tuple, dict)):
+        label = f"{label} of size {len(obj)}"
+    color = 'red' if isinstance(obj, Exception) else None
+    return label, color
+
+
 def get_module_root(obj):
     return obj.__class__.__module__.split('.')[0]
 
 
+def get_module_version(module_root):
+    """
+    Parameters
+    ----------
+    module_root : str
+        A top-level module name, as returned by `get_module_root()`.
+
+    Returns
+    -------
+    str or None
+        The version of the module, if known.
+    """
+    version = getattr(sys.modules.get(module_root), '__version__', None)
+    if version is None:
+        try:
+            from importlib.metadata import version as package_version
+            version = package_version(module_root)
+        except Exception:
+            # Python < 3.8 or not an installed package
+            pass
+    return version
+
+
 class IgnoreFunc:
     def __init__(self, key, obj_class=()):
         """
@@ -52,18 +195,46 @@ class IgnoreFunc:
             Apart from user-provided class types, all numpy functions will not be executed.
         """
         self.ignore = re.compile(key, flags=re.IGNORECASE)
-        self.ignored_functions = dict()
-        try:
-            import numpy as np
-            self.ignored_functions[np.ndarray] = getmembers(np.ndarray)
-            self.ignored_functions[np.ndarray].update(getmembers(np))
-        except ImportError:
-            pass
         if not isinstance(obj_class, (list, tuple, set)):
             obj_class = [obj_class]
+        self.obj_class = tuple(obj_class)
+        self.ignored_functions = dict()
         for class_type in obj_class:
             self.ignored_functions[class_type] = getmembers(class_type)
 
+        self._ignored_by_type = {}
+        self._numpy_added = False
+
+    def ignored_members(self, obj_type):
+        """
+        Parameters
+        ----------
+        obj_type : type
+            An object class.
+
+        Returns
+        -------
+        frozenset
+            The member names of the ignored classes that `obj_type` inherits from.
+        """
+        members = self._ignored_by_type.get(obj_type)
+        if members is None:
+            self._add_numpy()
+            members = set()
+            for ignored_class, ignored_functions in self.ignored_functions.items():
+                if issubclass(obj_type, ignored_class):
+                    members.update(ignored_functions)
+            members = frozenset(members)
+            self._ignored_by_type[obj_type] = members
+        return members
+
+    def _add_numpy(self):
+        # numpy objects can be met only once numpy is imported; there is no need to import it here
+        np = sys.modules.get('numpy')
+        if np is not None and not self._numpy_added:
+            self.ignored_functions[np.ndarray] = numpy_members(np)
+            self._numpy_added = True
+
     def __call__(self, obj, attribute_name):
         """
         Check the `obj` for the attribute name `func_name`.
@@ -79,49 +250,297 @@ class IgnoreFunc:
         bool
             Whether this attribute should be ignored or not.
         """
-        for ignored_class, ignored_functions in self.ignored_functions.items():
-            if isinstance(obj, ignored_class) and attribute_name in ignored_functions:
-                return True
+        if attribute_name in self.ignored_members(type(obj)):
+            return True
         return self.ignore.search(attribute_name)
 
 
-def to_pyvis(graph, layout=True):
+def required_parameters(func):
+    """
+    Parameters
+    ----------
+    func : function
+        A class function; its first parameter is `self`.
+
+    Returns
+    -------
+    list or None
+        The names of the parameters without default values, except `self`, or None,
+        if the signature is unknown.
+    """
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+    parameters = list(signature.parameters.values())[1:]
+    return [param.name for param in parameters
+            if param.default is param.empty and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)]
+
+
+def _resolve_type_name(func, type_name):
+    if type_name == 'None':
+        return type(None)
+    # the origin of a generic alias, e.g. 'list[int]'
+    type_name = type_name.partition('[')[0]
+    name, *attributes = type_name.split('.')
+    obj = getattr(func, '__globals__', {}).get(name, getattr(builtins, name, None))
+    for attr_name in attributes:
+        obj = getattr(obj, attr_name, None)
+    if isinstance(obj, type):
+        return obj
+    return None
+
+
+def return_class(func):
+    """
+    Predicts the class of the `func` result from its return annotation or,
+    if not annotated, from its docstring.
+
+    Parameters
+    ----------
+    func : function
+        A function.
+
+    Returns
+    -------
+    type or None
+        The class of the result, if it is a single class. None, if it cannot be
+        predicted, e.g. a union of several classes.
+    """
+    try:
+        annotation = inspect.signature(func).return_annotation
+    except (TypeError, ValueError):
+        return None
+    if annotation is inspect.Signature.empty:
+        match = DOCSTRING_RETURNS.search(inspect.getdoc(func) or '')
+        if match is None:
+            return None
+        annotation = match.group(1) or match.group(2)
+    if annotation is None:
+        return type(None)
+    if isinstance(annotation, str):
+        return _resolve_type_name(func, annotation.strip())
+    if isinstance(annotation, type):
+        return annotation
+    # generic aliases, e.g. list[int]
+    if hasattr(typing, 'get_origin'):
+        origin = typing.get_origin(annotation)
+    else:
+        # Python < 3.8; the builtin class of typing.List[int] is in `__extra__` in Python 3.6
+        origin = getattr(annotation, '__extra__', None) or getattr(annotation, '__origin__', None)
+    if isinstance(origin, type):
+        return origin
+    return None
+
+
+class AttributePlan:
+    def __init__(self, obj_class, ignore_attribute):
+        """
+        Attribute names of the `obj_class` instances to inspect, precomputed once per class.
+
+        Parameters
+        ----------
+        obj_class : type
+            An object class.
+        ignore_attribute : IgnoreFunc
+            Ignores attributes from being accessed and executed.
+        """
+        self.obj_class = obj_class
+        self.ignored = ignore_attribute.ignored_members(obj_class)
+        self.ignore = ignore_attribute.ignore
+        self.custom_dir = getattr(obj_class, '__dir__', object.__dir__) is not object.__dir__
+        self._is_inspected = {}
+        self.class_names = [attr_name for attr_name in dir(obj_class) if self.is_inspected(attr_name)]
+        self._class_names_set = set(self.class_names)
+
+        # class functions; accessed from an instance, they turn into bound methods
+        self.methods = set()
+        for attr_name in self.class_names:
+            try:
+                attr = inspect.getattr_static(obj_class, attr_name)
+            except AttributeError:
+                continue
+            if inspect.isfunction(attr):
+                self.methods.add(attr_name)
+        self.full_names = {}
+        self._static_info = {}
+
+    def is_inspected(self, attr_name):
+        """
+        Parameters
+        ----------
+        attr_name : str
+            Attribute name.
+
+        Returns
+        -------
+        bool
+            Whether the attribute should be accessed or executed.
+        """
+        inspected = self._is_inspected.get(attr_name)
+        if inspected is None:
+            inspected = not (attr_name.startswith('__') or attr_name in self.ignored or
+                             self.ignore.search(attr_name))
+            self._is_inspected[attr_name] = inspected
+        return inspected
+
+    def names(self, obj):
+        """
+        Parameters
+        ----------
+        obj : object
+            An instance of the class.
+
+        Returns
+        -------
+        list
+            Sorted attribute names of the `obj` to inspect, as `dir(obj)` without
+            the dunder and ignored names.
+        """
+        if self.custom_dir:
+            return [attr_name for attr_name in dir(obj) if self.is_inspected(attr_name)]
+        instance_names = [attr_name for attr_name in getattr(obj, '__dict__', ())
+                          if attr_name not in self._class_names_set and self.is_inspected(attr_name)]
+        if len(instance_names) == 0:
+            return self.class_names
+        return sorted(self.class_names + instance_names)
+
+    def is_method(self, obj, attr_name):
+        """
+        Returns
+        -------
+        bool
+            True, if the `obj.attr_name` is known to be a bound method without accessing it.
+        """
+        return attr_name in self.methods and attr_name not in getattr(obj, '__dict__', ())
+
+    def static_info(self, attr_name):
+        """
+        Parameters
+        ----------
+        attr_name : str
+            A method name, one of `methods`.
+
+        Returns
+        -------
+        StaticInfo
+            The required parameters of the method and the predicted class of its result,
+            found without calling it. See `required_parameters()` and `return_class()`.
+        """
+        info = self._static_info.get(attr_name)
+        if info is None:
+            func = inspect.getattr_static(self.obj_class, attr_name)
+            info = StaticInfo(required=required_parameters(func), return_class=return_class(func))
+            self._static_info[attr_name] = info
+        return info
+
+    def full_name(self, attr_name):
+        """
+        Returns
+        -------
+        str
+            Attribute name, prefixed with the class name.
+        """
+        full_name = self.full_names.get(attr_name)
+        if full_name is None:
+            full_name = f"{self.obj_class.__name__}.{attr_name}"
+            self.full_names[attr_name] = full_name
+        return full_name
+
+
+def to_pyvis(graph, layout=True, hot_duration=None, height="960px", width="1280px", physics=None):
     """
     This method takes an exisitng Networkx graph and translates
     it to a PyVis graph format that can be accepted by the VisJs
     API in the Jinja2 template.
 
+    Node titles of a `DiGraphAcyclic` graph are rendered lazily; call
+    `graph.render_titles()` beforehand to show them.
+
+    For graphs with many thousands of nodes, reduce the graph with
+    `pinspect.export.cluster()` or `pinspect.export.collapse_subtrees()` first,
+    or export it with one of the `pinspect.export` writers instead.
+
     Parameters
     ----------
     graph : nx.DiGraph
         NetworkX directed graph.
     layout : bool
         Use hierarchical layout if this is set.
+    hot_duration : float, optional
+        Highlight the edges of the method calls that took at least this many
+        seconds in orange. Requires the graph to be built with a `Profiler`.
+        Default is None (no highlighting).
+    height, width : str, optional
+        The size of the network canvas.
+    physics : bool, optional
+        Enable the physics simulation. Default is None: enabled only for graphs
+        with at most `PHYSICS_MAX_NODES` nodes.
 
     Returns
     -------
     net : Network
         PyVis Network
     """
-    def add_node(node_id):
-        attr = nodes[node_id]
-        net.add_node(node_id, label=attr['label'], level=attr['level'], color=attr.get('color', None),
-                     title=attr['title'])
-
-    edges = graph.edges.data()
-    nodes = graph.nodes
-    net = Network(height="960px", width="1280px", directed=True, layout=layout)
-    for v, u, edge_attr in edges:
-        add_node(v)
-        add_node(u)
-        net.add_edge(v, u, title=edge_attr['label'], color=edge_attr['color'])
+    # pyvis is slow to import
+    from pyvis.edge import Edge
+    from pyvis.network import Network
+    from pyvis.node import Node
+
+    net = Network(height=height, width=width, directed=True, layout=layout)
+    if physics is None:
+        physics = len(graph) <= PHYSICS_MAX_NODES
+    net.toggle_physics(physics)
+
+    # Network.add_node() and add_edge() look the nodes up in a list, which is quadratic in the graph size;
+    # the nodes and edges are appended in bulk instead, if the network stores them in `node_ids` and `node_map`
+    # as pyvis up to 0.3 does (see requirements.txt); otherwise, they are added one by one
+    bulk = isinstance(getattr(net, 'node_ids', None), list) and isinstance(getattr(net, 'node_map', None), dict)
+    font_color = getattr(net, 'font_color', False)
+    for node, attr in graph.nodes.items():
+        label = attr['label']
+        options = dict(color=attr.get('color', None), level=attr['level'], title=attr.get('title', label))
+        count = attr.get('count', 1)
+        if count > 1:
+            label = f"{label} x{count}"
+            options['value'] = count
+        if attr.get('diff') is not None:
+            label = f"{label} ({attr['diff']})"
+        if bulk:
+            # the same options as of Network.add_node()
+            options = Node(node, 'dot', label=label, font_color=font_color, **options).options
+            net.nodes.append(options)
+            net.node_ids.append(node)
+            net.node_map[node] = options
+        else:
+            net.add_node(node, label=label, **options)
+    for v, u, edge_attr in graph.edges.data():
+        title = edge_attr['label']
+        color = edge_attr['color']
+        duration = edge_attr.get('duration')
+        if duration is not None:
+            title = f"{title} ({duration:.3f} s)"
+            if hot_duration is not None and duration >= hot_duration:
+                color = 'orange'
+        count = edge_attr.get('count', 1)
+        if count > 1:
+            title = f"{title} x{count}"
+        if edge_attr.get('diff') is not None:
+            title = f"{title} ({edge_attr['diff']})"
+        if bulk:
+            net.edges.append(Edge(v, u, net.directed, title=title, color=color).options)
+        else:
+            net.add_edge(v, u, title=title, color=color)
     return net
 
 
-def to_string(graph, source, prefix=''):
+def to_string(graph, source, prefix='', max_paths=None, shortest_first=False, dedup_suffixes=False):
     """
     Traverse the graph and yield its string representation.
 
+    The paths are enumerated iteratively, one at a time, so that deep graphs
+    do not hit the recursion limit.
+
     Parameters
     ----------
     graph : nx.DiGraph
@@ -129,18 +548,59 @@ def to_string(graph, source, prefix=''):
     source : int
         Source node id.
     prefix : str
-        This prefix will be accumulated in a full call history during successive calls of `to_string()`.
+        The representation of the `source`, which starts each path.
+    max_paths : int, optional
+        The max number of paths to yield.
+        Default is None (all paths).
+    shortest_first : bool, optional
+        Yield the paths with fewer edges first instead of the depth-first order.
+        Default is False.
+    dedup_suffixes : bool, optional
+        Expand a node, shared by several paths, only once: the other paths to it
+        end with ``-> same as <the first path to the node>``. The number of
+        yielded paths is then at most the number of edges instead of being
+        exponential in the graph depth.
+        Default is False.
 
     Returns
     -------
     generator
         Generator of string traversal of the graph.
+
+    Notes
+    -----
+    The paths of a `GraphDiff` graph end with the status of the change, e.g.
+    ``-> 'Epoch' (added)``. The paths to the changed nodes with descendants
+    are yielded as well.
     """
-    if len(graph.adj[source]) == 0:
-        yield f"{prefix} -> '{graph.nodes[source]['label']}'"
-    else:
-        for adj, attr in graph.adj[source].items():
-            yield from to_string(graph, source=adj, prefix=f"{prefix}.{attr['label']}")
+    # the first path to each expanded node
+    expanded = {}
+    pending = collections.deque([(source, prefix, None)])
+    pop_next = pending.popleft if shortest_first else pending.pop
+    n_paths = 0
+    while len(pending) > 0 and n_paths != max_paths:
+        node, path, status = pop_next()
+        attr = graph.nodes[node]
+        status = attr.get('diff') or status
+        target = f"'{attr['label']}'" if status is None else f"'{attr['label']}' ({status})"
+        successors = graph.succ[node]
+        if len(successors) == 0:
+            yield f"{path} -> {target}"
+        elif node in expanded:
+            yield f"{path} -> same as {expanded[node]}"
+        else:
+            if dedup_suffixes:
+                expanded[node] = path
+            children = [(adj, f"{path}.{edge_attr['label']}", edge_attr.get('diff'))
+                        for adj, edge_attr in successors.items()]
+            if not shortest_first:
+                # reversed to yield the paths in the order of the edges
+                children.reverse()
+            pending.extend(children)
+            if status is None:
+                continue
+            yield f"{path} -> {target}"
+        n_paths += 1
 
 
 def check_edge(graph, edge_label):
@@ -161,5 +621,5 @@ def check_edge(graph, edge_label):
     edge_label = re.compile(edge_label)
     filtered = [triple for triple in graph.edges.data('label') if edge_label.search(triple[2])]
     for v, u, label in filtered:
-        logging.info(f"{graph.nodes[v]['label']}.{label} -> {graph.nodes[u]['label']}")
+        logger.info("%s.%s -> %s", graph.nodes[v]['label'], label, graph.nodes[u]['label'])
     return len(filtered)
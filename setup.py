@@ -11,6 +11,9 @@ setup(
     version="0.0.2",
     packages=find_packages(),
     install_requires=install_requires,
+    entry_points={
+        'console_scripts': ['pinspect=pinspect.cli:main'],
+    },
     author="Danylo Ulianych",
     author_email="d.ulianych@gmail.com",
     description="Pretty inspect object",